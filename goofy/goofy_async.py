@@ -0,0 +1,86 @@
+from collections.abc import Iterable
+from goofy.goofy_input import NUMBER_PATTERN
+from goofy.goofy_output import DEFAULT_BUFFER_SIZE, FlushPolicy, OutputSink
+import asyncio
+
+# The number of instructions executed before a session gives the other sessions on the event loop a turn.
+ASYNC_SLICE_LENGTH = 1000
+
+class AsyncInputSource:
+    """ Represents where SNOOP reads numbers from when running
+    asynchronously, without blocking the event loop.
+    """
+    # Whether a person is typing the input, in which case any output is sent before reading so prompts are seen.
+    interactive = False
+
+    async def read(self) -> int | None:
+        """ Reads the next number.
+
+        Raises:
+            EOFError: if there is no input left.
+
+        Returns:
+            int | None: the number, or None if the input was not a number.
+        """
+        raise NotImplementedError
+
+class AsyncStreamInput(AsyncInputSource):
+    """ Reads a number per line from an asyncio stream,
+    such as the reader of a socket connection.
+    """
+    interactive = True
+
+    def __init__(self, reader: asyncio.StreamReader):
+        self.reader = reader
+
+    async def read(self) -> int | None:
+        line = await self.reader.readline()
+
+        if not line:
+            raise EOFError("There is no input left")
+
+        user_input = line.decode(errors="replace").rstrip("\r\n")
+
+        if not NUMBER_PATTERN.fullmatch(user_input):
+            return None
+
+        return int(user_input)
+
+class AsyncOutputSink(OutputSink):
+    """ Responsible for writing the output of YELL to an
+    asyncio stream, such as the writer of a socket connection.
+    Writing never blocks, the output is queued on the stream's
+    transport and drained when the session next waits.
+    """
+    def __init__(self, writer: asyncio.StreamWriter, buffer_size: int = DEFAULT_BUFFER_SIZE, flush_policy: FlushPolicy = FlushPolicy.EVERY_N_BYTES):
+        super().__init__(writer, buffer_size, flush_policy)
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        # Copied, as the transport may hold on to what it's given after the buffer is cleared.
+        self.stream.write(bytes(self._buffer))
+
+        self._buffer.clear()
+
+    async def drain(self):
+        """ Waits until the output written so far has been sent,
+        if the stream's transport has too much queued.
+        """
+        self.flush()
+
+        await self.stream.drain()
+
+class AsyncIterableInput(AsyncInputSource):
+    """ Reads numbers which have already been parsed,
+    from any iterable of ints such as a list.
+    """
+    def __init__(self, numbers: Iterable[int]):
+        self._numbers = iter(numbers)
+
+    async def read(self) -> int | None:
+        for number in self._numbers:
+            return number
+
+        raise EOFError("There is no input left")
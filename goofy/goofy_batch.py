@@ -0,0 +1,275 @@
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from goofy.goofy_budget import Budget
+from goofy.goofy_compiler import Program
+from goofy.goofy_input import IterableInput
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_output import FlushPolicy, OutputSink
+import argparse
+import glob
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+FILE_EXTENSION_NAME = ".goofy"
+
+# The programs shared with a worker process when it starts, so each task only has to say which one to run.
+_programs: list[Program] = []
+
+_budget: Budget | None = None
+
+class ErrorCollector(logging.Handler):
+    """ Collects the error messages logged while a program is
+    compiled or run, so they can be reported with its result.
+    """
+    def __init__(self):
+        super().__init__(logging.ERROR)
+
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord):
+        self.messages.append(record.getMessage())
+
+    def collect(self) -> list[str]:
+        """ Gets the messages collected so far and starts collecting again.
+
+        Returns:
+            list[str]: the collected messages.
+        """
+        messages, self.messages = self.messages, []
+
+        return messages
+
+_errors = ErrorCollector()
+
+def find_files(paths: list[str], manifest: str | None = None) -> list[str]:
+    """ Finds the goofy lang files to run.
+
+    Args:
+        paths (list[str]): goofy lang files, directories to search for them in or glob patterns. Ex: scripts/**/*.goofy
+        manifest (str | None): a file listing a goofy lang file per line, if any. Blank lines and lines starting with # are skipped.
+
+    Returns:
+        list[str]: the goofy lang files, in the order they were given.
+    """
+    if manifest is not None:
+        with open(manifest, "r", encoding="UTF-8") as manifest_file:
+            paths = paths + [line.strip() for line in manifest_file if line.strip() and not line.startswith("#")]
+
+    files = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(glob.escape(path), "**", f"*{FILE_EXTENSION_NAME}"), recursive=True)))
+
+        elif glob.has_magic(path):
+            files.extend(sorted(glob.glob(path, recursive=True)))
+
+        else:
+            files.append(path)
+
+    return files
+
+def compile_files(files: list[str]) -> tuple[list[Program], list[int | list[str]]]:
+    """ Compiles goofy lang files into programs. Files with the
+    same source share a program, which is only compiled once.
+
+    Args:
+        files (list[str]): the goofy lang files to compile.
+
+    Returns:
+        tuple[list[Program], list[int | list[str]]]: the compiled programs, and for each file either the index
+                                                      of its program or the errors compiling it.
+    """
+    programs: list[Program] = []
+
+    program_indexes: dict[bytes, int] = {}
+
+    compiled: list[int | list[str]] = []
+
+    for file in files:
+        try:
+            with open(file, "rb") as source_file:
+                source = source_file.read()
+
+        except OSError as error:
+            compiled.append([f"The file could not be read: {error}"])
+
+            continue
+
+        key = hashlib.sha256(source).digest()
+
+        if key not in program_indexes:
+            interpreter = GoofyInterpreter(source.decode("UTF-8", errors="replace").splitlines())
+
+            if not interpreter.compile():
+                compiled.append(_errors.collect())
+
+                continue
+
+            program_indexes[key] = len(programs)
+
+            programs.append(interpreter.program)
+
+        compiled.append(program_indexes[key])
+
+    return programs, compiled
+
+def start_worker(programs: list[Program], budget: Budget | None):
+    """ Starts a worker process, keeping the programs it runs.
+
+    Args:
+        programs (list[Program]): the compiled programs.
+        budget (Budget | None): the limits on running each program, if any.
+    """
+    global _programs, _budget
+
+    _programs = programs
+
+    _budget = budget
+
+    # Errors are reported in each result rather than logged, so they aren't mixed up between workers.
+    logger = logging.getLogger("goofy")
+
+    logger.handlers = [_errors]
+
+    logger.propagate = False
+
+def run_program(task: tuple[str, int]) -> dict:
+    """ Runs a compiled program in a worker process. Anything YELLed is
+    kept for the result, and SNOOP has no input to read.
+
+    Args:
+        task (tuple[str, int]): the goofy lang file and the index of its program.
+
+    Returns:
+        dict: the result of running the program.
+    """
+    file, program_index = task
+
+    stream = io.BytesIO()
+
+    interpreter = GoofyInterpreter.from_program(_programs[program_index], OutputSink(stream, flush_policy=FlushPolicy.ON_EXIT), IterableInput(()))
+
+    _errors.collect()
+
+    started = time.perf_counter()
+
+    success = interpreter.run(budget=_budget)
+
+    seconds = time.perf_counter() - started
+
+    return {
+        "file": file,
+        "success": success,
+        "stack": interpreter.stack,
+        "output": stream.getvalue().decode("UTF-8", errors="replace"),
+        "errors": _errors.collect(),
+        "seconds": seconds,
+    }
+
+def run_batch(files: list[str], workers: int | None = None, chunksize: int = 16, budget: Budget | None = None) -> Iterator[dict]:
+    """ Runs goofy lang files across a pool of worker processes.
+
+    Args:
+        files (list[str]): the goofy lang files to run.
+        workers (int | None): the number of worker processes, the number of CPUs if None.
+        chunksize (int): the number of files sent to a worker at a time.
+        budget (Budget | None): the limits on running each program, if any.
+
+    Yields:
+        dict: the result of each file, in the order they were given. See run_program.
+    """
+    logger = logging.getLogger("goofy")
+
+    # Compiling errors are reported in the results too, the same as errors when running.
+    handlers, propagate = logger.handlers, logger.propagate
+
+    logger.handlers, logger.propagate = [_errors], False
+
+    try:
+        programs, compiled = compile_files(files)
+
+    finally:
+        logger.handlers, logger.propagate = handlers, propagate
+
+    tasks = [(file, program_index) for file, program_index in zip(files, compiled) if isinstance(program_index, int)]
+
+    with ProcessPoolExecutor(workers, initializer=start_worker, initargs=(programs, budget)) as executor:
+        results = executor.map(run_program, tasks, chunksize=chunksize)
+
+        for file, program_index in zip(files, compiled):
+            if isinstance(program_index, int):
+                yield next(results)
+
+            else:
+                yield {"file": file, "success": False, "stack": [], "output": "", "errors": program_index, "seconds": 0.0}
+
+def parse_arguments(arguments: list[str]) -> argparse.Namespace:
+    """ Parses the command line arguments for goofy batch
+
+    Args:
+        arguments (list[str]): the command line arguments, without the program name and batch.
+
+    Returns:
+        argparse.Namespace: the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="goofy batch", description="Runs many goofy lang files across worker processes.")
+
+    parser.add_argument("paths", nargs="*", help="goofy lang files, directories to search for them in or glob patterns")
+
+    parser.add_argument("--manifest", metavar="FILE", help="a file listing a goofy lang file per line")
+
+    parser.add_argument("--workers", type=int, metavar="N", help="the number of worker processes, the number of CPUs by default")
+
+    parser.add_argument("--chunksize", type=int, default=16, metavar="N", help="the number of files sent to a worker at a time")
+
+    parser.add_argument("--report", default="-", metavar="FILE", help="the file to write a JSON line per result to, stdout by default")
+
+    parser.add_argument("--max-instructions", type=int, metavar="N", help="stop each program once it has executed more than N instructions")
+
+    parser.add_argument("--max-seconds", type=float, metavar="SECONDS", help="stop each program once it has run for more than SECONDS")
+
+    parser.add_argument("--max-stack", type=int, metavar="N", help="stop each program once its stack holds more than N values")
+
+    return parser.parse_args(arguments)
+
+def main(arguments: list[str]):
+    arguments = parse_arguments(arguments)
+
+    files = find_files(arguments.paths, arguments.manifest)
+
+    if not files:
+        LOGGER.info("No goofy lang files were found to run")
+
+        return
+
+    limits = (arguments.max_instructions, arguments.max_seconds, arguments.max_stack)
+
+    budget = Budget(*limits) if any(limit is not None for limit in limits) else None
+
+    succeeded = 0
+
+    started = time.perf_counter()
+
+    report = sys.stdout if arguments.report == "-" else open(arguments.report, "w", encoding="UTF-8")
+
+    try:
+        for result in run_batch(files, arguments.workers, arguments.chunksize, budget):
+            succeeded += result["success"]
+
+            report.write(json.dumps(result) + "\n")
+
+    finally:
+        if report is not sys.stdout:
+            report.close()
+
+    seconds = time.perf_counter() - started
+
+    LOGGER.info("Ran %d files in %.3fs, %.1f files per second. %d succeeded and %d failed", len(files), seconds, len(files) / seconds, succeeded, len(files) - succeeded)
@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from enum import Enum
+from goofy.goofy_compiler import Instruction, Opcode
+import logging
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from goofy.goofy_interpreter import GoofyInterpreter, Handler
+
+LOGGER = logging.getLogger(__name__)
+
+class BudgetKind(Enum):
+    """ Represents the limits a budget
+    can place on executing a program.
+    """
+    INSTRUCTIONS = "instructions"
+
+    WALL_TIME = "wall time"
+
+    STACK_LENGTH = "stack length"
+
+@dataclass(frozen=True, slots=True)
+class Budget:
+    """ Represents the limits on executing a program, so a
+    program which never ends can't run forever. A limit of None
+    means there is no limit. The limits are only checked when a
+    BOUNCE jumps backwards, since a program can only run forever
+    by looping, so they can be exceeded by up to one pass of a loop.
+    """
+    max_instructions: int | None = None
+
+    max_seconds: float | None = None
+
+    max_stack_length: int | None = None
+
+class BudgetTracker:
+    """ Responsible for tracking a single execution against a
+    budget. It wraps the BOUNCE and FREEZE handlers, so none of the
+    other instructions pay anything for the budget.
+    """
+    def __init__(self, budget: Budget):
+        self.budget = budget
+
+        # The number of instructions executed, which is only up to date at a backward jump or once execution ends.
+        self.instructions = 0
+
+        # The budget which stopped execution, if any.
+        self.exceeded: BudgetKind | None = None
+
+        # The index execution continued from after the last taken jump, so instructions are counted a run at a time.
+        self._run_start = 0
+
+        self._started = time.monotonic()
+
+    def wrap(self, handlers: list["Handler"], index: int) -> list["Handler"]:
+        """ Creates a copy of a dispatch table which tracks execution.
+
+        Args:
+            handlers (list[Handler]): the dispatch table to copy.
+            index (int): the index execution starts from.
+
+        Returns:
+            list[Handler]: the copied dispatch table, with the BOUNCE and FREEZE handlers wrapped.
+        """
+        self._run_start = index
+
+        self._started = time.monotonic()
+
+        bounce = handlers[Opcode.BOUNCE]
+
+        freeze = handlers[Opcode.FREEZE]
+
+        def tracked_bounce(interpreter: "GoofyInterpreter", instruction: Instruction) -> bool:
+            position = interpreter._index
+
+            if not bounce(interpreter, instruction):
+                return False
+
+            target = interpreter._index
+
+            if target == position:
+                return True
+
+            self.instructions += position - self._run_start
+
+            self._run_start = target
+
+            return target > position or self.check(interpreter)
+
+        def tracked_freeze(interpreter: "GoofyInterpreter", instruction: Instruction) -> bool:
+            self.instructions += interpreter._index - self._run_start
+
+            success = freeze(interpreter, instruction)
+
+            self._run_start = interpreter._index
+
+            return success
+
+        tracked = list(handlers)
+
+        tracked[Opcode.BOUNCE] = tracked_bounce
+
+        tracked[Opcode.FREEZE] = tracked_freeze
+
+        return tracked
+
+    def check(self, interpreter: "GoofyInterpreter") -> bool:
+        """ Checks whether execution is still within the budget.
+
+        Args:
+            interpreter (GoofyInterpreter): the interpreter executing the program.
+
+        Returns:
+            bool: whether execution is within the budget, false once any limit has been exceeded.
+        """
+        budget = self.budget
+
+        if budget.max_instructions is not None and self.instructions > budget.max_instructions:
+            return self.exceed(BudgetKind.INSTRUCTIONS, f"{self.instructions} instructions were executed, over the limit of {budget.max_instructions}")
+
+        if budget.max_stack_length is not None and len(interpreter._stack) > budget.max_stack_length:
+            return self.exceed(BudgetKind.STACK_LENGTH, f"the stack grew to {len(interpreter._stack)} values, over the limit of {budget.max_stack_length}")
+
+        if budget.max_seconds is not None and time.monotonic() - self._started > budget.max_seconds:
+            return self.exceed(BudgetKind.WALL_TIME, f"it ran for over the limit of {budget.max_seconds} seconds")
+
+        return True
+
+    def exceed(self, kind: BudgetKind, reason: str) -> bool:
+        """ Records that a budget was exceeded.
+
+        Args:
+            kind (BudgetKind): the budget which was exceeded.
+            reason (str): how it was exceeded, for the error message.
+
+        Returns:
+            bool: false, to stop execution.
+        """
+        self.exceeded = kind
+
+        LOGGER.error("The program was stopped because %s. Is there a BOUNCE which never stops jumping?", reason)
+
+        return False
+
+    def finish(self, index: int):
+        """ Counts the instructions executed since the last taken jump,
+        once execution has ended.
+
+        Args:
+            index (int): the index execution ended at.
+        """
+        self.instructions += index - self._run_start
+
+        self._run_start = index
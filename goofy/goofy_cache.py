@@ -0,0 +1,164 @@
+from goofy.goofy_compiler import COMPILER_VERSION, Instruction, OPCODES_BY_NAME, Program
+from goofy.goofy_tokenizer import CONDITIONALS
+import hashlib
+import logging
+import marshal
+import mmap
+import os
+import shutil
+import sys
+import typing
+
+if typing.TYPE_CHECKING:
+    from goofy.goofy_interpreter import GoofyInterpreter
+
+LOGGER = logging.getLogger(__name__)
+
+# The name of the directory compiled programs are cached in, next to the goofy lang file they were compiled from.
+CACHE_DIRECTORY_NAME = "__goofycache__"
+
+CACHE_EXTENSION_NAME = ".goofyc"
+
+# Starts every cache file, so anything else in the cache directory is never mistaken for a compiled program.
+MAGIC = b"GOOFYC\r\n"
+
+# Maps each comparison function back to the conditional it was bound from, since functions can't be marshalled.
+CONDITIONAL_SYMBOLS = {function: symbol for symbol, function in CONDITIONALS.items()}
+
+class GoofyCache:
+    """ Responsible for caching compiled goofy lang files
+    on disk, similar to __pycache__. A cached program is keyed
+    by the hash of the source, the compiler version and the
+    opcodes it was compiled with, so it's never stale.
+    """
+    def __init__(self, opcodes: dict[str, int] = OPCODES_BY_NAME):
+        # Programs compiled with registered opcodes are cached separately from those without.
+        self.opcodes = opcodes
+
+    def get_cache_path(self, file: str) -> str:
+        """ Gets the path a goofy lang file's compiled program is cached at.
+
+        Args:
+            file (str): the path of the goofy lang file.
+
+        Returns:
+            str: the path of the cache file.
+        """
+        directory, name = os.path.split(os.path.abspath(file))
+
+        return os.path.join(directory, CACHE_DIRECTORY_NAME, os.path.splitext(name)[0] + CACHE_EXTENSION_NAME)
+
+    def get_key(self, file: str) -> bytes:
+        """ Derives the key a goofy lang file's compiled program is cached under.
+
+        Args:
+            file (str): the path of the goofy lang file.
+
+        Returns:
+            bytes: the key, which changes if the source, compiler version, python version or opcodes change.
+        """
+        with open(file, "rb") as source:
+            digest = hashlib.file_digest(source, "sha256")
+
+        digest.update(f"{COMPILER_VERSION}:{sys.implementation.cache_tag}:{sorted(self.opcodes.items())}".encode())
+
+        return digest.digest()
+
+    def load(self, file: str, key: bytes) -> list[Instruction] | None:
+        """ Loads the compiled program cached for a goofy lang file.
+        The cache file is memory mapped, so the instructions are
+        read straight from the page cache.
+
+        Args:
+            file (str): the path of the goofy lang file.
+            key (bytes): the key the program must be cached under, see get_key.
+
+        Returns:
+            list[Instruction] | None: the cached instructions, or None if nothing is cached under the key.
+        """
+        cache_path = self.get_cache_path(file)
+
+        try:
+            with open(cache_path, "rb") as cache_file, mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                header_length = len(MAGIC) + len(key)
+
+                if mapped[:header_length] != MAGIC + key:
+                    return None
+
+                with memoryview(mapped)[header_length:] as payload:
+                    rows = marshal.loads(payload)
+
+        except (OSError, ValueError, EOFError, TypeError) as error:
+            # A missing, empty or corrupt cache file is just a miss.
+            LOGGER.debug("Could not load cached program %s: %s", cache_path, error)
+
+            return None
+
+        return [Instruction(opcode, operand, target, CONDITIONALS[symbol] if symbol else None, token_index)
+                for opcode, operand, target, symbol, token_index in rows]
+
+    def store(self, file: str, key: bytes, instructions: list[Instruction]):
+        """ Caches the compiled program for a goofy lang file.
+        Failing to write the cache isn't an error, the program
+        is just compiled again next time.
+
+        Args:
+            file (str): the path of the goofy lang file.
+            key (bytes): the key to cache the program under, see get_key.
+            instructions (list[Instruction]): the compiled instructions.
+        """
+        cache_path = self.get_cache_path(file)
+
+        rows = [(int(instruction.opcode), instruction.operand, instruction.target,
+                 CONDITIONAL_SYMBOLS.get(instruction.conditional), instruction.token_index) for instruction in instructions]
+
+        # Written to a temporary file first so a concurrent run never maps a half written cache file.
+        temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+            with open(temporary_path, "wb") as cache_file:
+                cache_file.write(MAGIC + key + marshal.dumps(rows))
+
+            os.replace(temporary_path, cache_path)
+
+        except OSError as error:
+            LOGGER.warning("Could not cache the compiled program at %s: %s", cache_path, error)
+
+    def compile(self, interpreter: "GoofyInterpreter", file: str) -> bool:
+        """ Compiles a goofy lang file with the interpreter, unless
+        its compiled program is cached, in which case the file is
+        never tokenized. Successfully compiled programs are cached.
+
+        Args:
+            interpreter (GoofyInterpreter): the interpreter created with the goofy lang file's lines.
+            file (str): the path of the goofy lang file.
+
+        Returns:
+            bool: whether compiling was successful or not.
+        """
+        key = self.get_key(file)
+
+        instructions = self.load(file, key)
+
+        if instructions is not None:
+            interpreter.load(Program(instructions))
+
+            return True
+
+        if not interpreter.compile():
+            return False
+
+        self.store(file, key, interpreter.instructions)
+
+        return True
+
+    def clear(self, file: str):
+        """ Removes the cache directory next to a goofy lang file,
+        including the compiled programs of any other files in it.
+
+        Args:
+            file (str): the path of the goofy lang file.
+        """
+        shutil.rmtree(os.path.dirname(self.get_cache_path(file)), ignore_errors=True)
@@ -0,0 +1,280 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from enum import Enum
+from goofy.goofy_budget import Budget
+from goofy.goofy_compiler import Instruction, OPCODES_BY_NAME, Opcode, Program, disassemble
+from goofy.goofy_interpreter import GoofyInterpreter, Handler
+
+class EdgeKind(Enum):
+    """ Represents how execution gets from one block to another.
+    """
+    # The BOUNCE ending the block jumped.
+    TAKEN = 1
+
+    # The block ended without jumping, so execution carries on with the next block.
+    FALL_THROUGH = 2
+
+@dataclass(frozen=True, slots=True)
+class Edge:
+    """ Represents a way execution can get from one block to another.
+    """
+    source: int
+
+    # The index of the block execution gets to, which is the number of blocks when it gets to the end of the program.
+    destination: int
+
+    kind: EdgeKind
+
+@dataclass(slots=True)
+class BasicBlock:
+    """ Represents a run of instructions which is always executed from
+    the first to the last, as nothing jumps into the middle of it and
+    only the last instruction can jump out of it.
+    """
+    # The index of the block in the graph.
+    index: int
+
+    # The index of the first instruction of the block, and one past the index of its last.
+    start: int
+
+    end: int
+
+    # The names of the labels which start at the block.
+    labels: list[str] = field(default_factory=list)
+
+    # The edges to the blocks execution can get to once the block has been executed.
+    edges: list[Edge] = field(default_factory=list)
+
+class ControlFlowGraph:
+    """ Responsible for splitting compiled instructions into basic
+    blocks, with an edge for each way execution can get from one block
+    to another. A block starts at every label, and ends after every
+    BOUNCE, FREEZE and registered opcode, as a registered opcode can
+    move the index too.
+    """
+    def __init__(self, instructions: list[Instruction], labels: Mapping[str, int] | None = None):
+        self.instructions = instructions
+
+        self.labels = dict(labels or {})
+
+        self.blocks: list[BasicBlock] = []
+
+        # Maps the index of the first instruction of each block to the block.
+        self.blocks_by_start: dict[int, BasicBlock] = {}
+
+        self.build()
+
+    @classmethod
+    def from_program(cls, program: Program) -> "ControlFlowGraph":
+        """ Builds the graph of a compiled program.
+
+        Args:
+            program (Program): the compiled program.
+
+        Returns:
+            ControlFlowGraph: the graph.
+        """
+        return cls(list(program.instructions), program.labels)
+
+    @property
+    def exit(self) -> int:
+        """ Gets the block index edges to the end of the program have as their destination.
+
+        Returns:
+            int: the number of blocks.
+        """
+        return len(self.blocks)
+
+    def build(self):
+        """ Splits the instructions into blocks and adds the edges between them.
+        """
+        instructions = self.instructions
+
+        starts = {0} | {index for index in self.labels.values() if index < len(instructions)}
+
+        for index, instruction in enumerate(instructions):
+            if instruction.opcode == Opcode.BOUNCE:
+                starts.add(instruction.target)
+
+            if instruction.opcode in (Opcode.BOUNCE, Opcode.FREEZE) or instruction.opcode >= len(Opcode):
+                starts.add(index + 1)
+
+        starts = sorted(start for start in starts if start < len(instructions))
+
+        for position, start in enumerate(starts):
+            end = starts[position + 1] if position + 1 < len(starts) else len(instructions)
+
+            block = BasicBlock(position, start, end)
+
+            self.blocks.append(block)
+
+            self.blocks_by_start[start] = block
+
+        for name, index in self.labels.items():
+            if index in self.blocks_by_start:
+                self.blocks_by_start[index].labels.append(name)
+
+        for block in self.blocks:
+            last = instructions[block.end - 1]
+
+            if last.opcode == Opcode.BOUNCE:
+                block.edges.append(Edge(block.index, self.get_block_index(last.target), EdgeKind.TAKEN))
+
+            # FREEZE stops the program, and a FAULT stops it with an error.
+            if not any(instructions[index].opcode in (Opcode.FREEZE, Opcode.FAULT) for index in range(block.start, block.end)):
+                block.edges.append(Edge(block.index, self.get_block_index(block.end), EdgeKind.FALL_THROUGH))
+
+    def get_block_index(self, start: int) -> int:
+        """ Gets the index of the block starting at an instruction.
+
+        Args:
+            start (int): the index of the instruction, which must start a block or be the end of the program.
+
+        Returns:
+            int: the index of the block, or exit for the end of the program.
+        """
+        block = self.blocks_by_start.get(start)
+
+        return block.index if block is not None else self.exit
+
+    def get_predecessors(self, index: int) -> list[int]:
+        """ Gets the blocks which have an edge to a block.
+
+        Args:
+            index (int): the index of the block, or exit.
+
+        Returns:
+            list[int]: the indexes of the blocks.
+        """
+        return [block.index for block in self.blocks if any(edge.destination == index for edge in block.edges)]
+
+    def get_reachable_blocks(self) -> set[int]:
+        """ Gets the blocks execution can get to from the start of
+        the program, so any other block is dead and can be removed.
+
+        Returns:
+            set[int]: the indexes of the reachable blocks.
+        """
+        if not self.blocks:
+            return set()
+
+        reachable = {0}
+
+        pending = [0]
+
+        while pending:
+            for edge in self.blocks[pending.pop()].edges:
+                if edge.destination != self.exit and edge.destination not in reachable:
+                    reachable.add(edge.destination)
+
+                    pending.append(edge.destination)
+
+        return reachable
+
+    def to_dot(self, opcodes: dict[str, int] = OPCODES_BY_NAME) -> str:
+        """ Formats the graph in the DOT language, for graphviz.
+
+        Args:
+            opcodes (dict[str, int]): the opcodes the instructions were compiled with, used to name registered opcodes.
+
+        Returns:
+            str: the graph. Each block is a node listing its labels and instructions, and the end of the program is a node named exit.
+        """
+        lines = disassemble(self.instructions, opcodes).splitlines()
+
+        dot = ["digraph goofy {", "    node [shape=box, fontname=\"monospace\"];"]
+
+        for block in self.blocks:
+            text = [f"{name}:" for name in block.labels] + lines[block.start:block.end]
+
+            label = "".join(line.replace("\\", "\\\\").replace("\"", "\\\"") + "\\l" for line in text)
+
+            dot.append(f"    b{block.index} [label=\"{label}\"];")
+
+        dot.append("    exit [shape=doublecircle];")
+
+        for block in self.blocks:
+            for edge in block.edges:
+                destination = "exit" if edge.destination == self.exit else f"b{edge.destination}"
+
+                style = "solid" if edge.kind == EdgeKind.TAKEN else "dashed"
+
+                dot.append(f"    b{edge.source} -> {destination} [label=\"{edge.kind.name.lower().replace('_', ' ')}\", style={style}];")
+
+        dot.append("}")
+
+        return "\n".join(dot)
+
+class BlockInterpreter(GoofyInterpreter):
+    """ An interpreter which executes a whole basic block per dispatch.
+    The handler of each instruction in a block is looked up once, when
+    the graph is built, and the index is only updated once per block,
+    rather than once per instruction. Executing with a budget is left
+    to the interpreter, as the budget tracks each instruction.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.graph: ControlFlowGraph | None = None
+
+        # Maps the index of the first instruction of each block to the index of its end, and the position, handler and
+        # instruction of each of its instructions.
+        self._blocks: dict[int, tuple[int, list[tuple[int, Handler, Instruction]]]] = {}
+
+    def build_graph(self, instructions: list[Instruction]):
+        """ Builds the graph of the instructions and looks up the handlers of each block.
+
+        Args:
+            instructions (list[Instruction]): the compiled instructions.
+        """
+        self.graph = ControlFlowGraph(instructions, self.labels)
+
+        handlers = self.handlers
+
+        self._blocks = {block.start: (block.end, [(position, handlers[instructions[position].opcode], instructions[position])
+                                                  for position in range(block.start, block.end)])
+                        for block in self.graph.blocks}
+
+    def execute(self, instructions: list[Instruction], budget: Budget | None = None) -> bool:
+        if budget is not None:
+            return super().execute(instructions, budget)
+
+        if self.graph is None or self.graph.instructions is not instructions:
+            self.build_graph(instructions)
+
+        self.instructions = instructions
+
+        instruction_count = len(instructions)
+
+        blocks = self._blocks
+
+        try:
+            while self._index < instruction_count:
+                block = blocks.get(self._index)
+
+                # A registered opcode can move the index into the middle of a block, which is executed a single instruction at a time.
+                if block is None:
+                    instruction = instructions[self._index]
+
+                    self._index += 1
+
+                    if not self.handlers[instruction.opcode](self, instruction):
+                        return False
+
+                    continue
+
+                end, steps = block
+
+                # Only the last instruction of a block can jump, and it sees the index as if each instruction had moved it on.
+                self._index = end
+
+                for position, handler, instruction in steps:
+                    if not handler(self, instruction):
+                        self._index = position + 1
+
+                        return False
+
+            return True
+
+        finally:
+            self.output.flush()
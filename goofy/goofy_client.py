@@ -0,0 +1,67 @@
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+
+# The socket the daemon listens on by default, private to the user.
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), f"goofy-{os.getuid()}.sock")
+
+# Only the standard library is imported, so running a program with a daemon doesn't pay for importing the interpreter.
+
+def send_request(request: dict, path: str = DEFAULT_SOCKET_PATH) -> dict:
+    """ Sends a request to a running goofy serve daemon and waits
+    for the response.
+
+    Args:
+        request (dict): the request, see GoofyDaemon.
+        path (str): the socket the daemon is listening on.
+
+    Returns:
+        dict: the response, see GoofyDaemon.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+
+        connection.sendall(json.dumps(request).encode() + b"\n")
+
+        with connection.makefile("rb") as response:
+            return json.loads(response.readline())
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="goofy client", description="Runs a goofy lang file with a running goofy serve daemon.")
+
+    parser.add_argument("file", help="the goofy lang file to run")
+
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="the socket the daemon is listening on")
+
+    parser.add_argument("--input", type=int, nargs="*", default=[], metavar="NUMBER", help="the numbers for SNOOP to read")
+
+    arguments = parser.parse_args(sys.argv[1:] if arguments is None else arguments)
+
+    try:
+        # The daemon may have been started somewhere else, so the path has to be absolute.
+        response = send_request({"path": os.path.abspath(arguments.file), "input": arguments.input}, arguments.socket)
+
+    except OSError as error:
+        print(f"Could not connect to the goofy daemon at {arguments.socket}. Is goofy serve running? {error}", file=sys.stderr)
+
+        return 2
+
+    except ValueError as error:
+        print(f"The goofy daemon at {arguments.socket} did not send back a response: {error}", file=sys.stderr)
+
+        return 2
+
+    sys.stdout.write(response["output"])
+
+    for error in response["errors"]:
+        print(error, file=sys.stderr)
+
+    print(response["stack"])
+
+    return 0 if response["success"] else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,355 @@
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, replace
+from enum import IntEnum
+from itertools import islice
+from types import MappingProxyType
+from goofy.goofy_tokenizer import TokenType, Token, CONDITIONALS
+import logging
+
+LOGGER = logging.getLogger(__name__)
+
+class Opcode(IntEnum):
+    """ Represents the integer codes that compiled
+    instructions are dispatched on.
+    """
+    # Goofy's equivalent of PUSH, pushes a int onto the stack.
+    SHOVE = 0
+
+    # Goofy's equivalent of PRINT, prints a string to stdout.
+    YELL = 1
+
+    # Goofy's equivalent of READ, reads a number from stdin and pushes onto the stack
+    SNOOP = 2
+
+    # Goofy's equivalent of SUB, pops two values off the stack and subtracts them, then pushes the result.
+    YEET = 3
+
+    # Goofy's equivalent of ADD, pops two values off the stack and adds them, then pushes the result.
+    GLUE = 4
+
+    # Goofy's equivalent of MUL, pops two values off the stack and multiplies them, then pushes the result.
+    MOOSH = 5
+
+    # Goofy's equivalent of DIV, pops two values off the stack and divides them, then pushes the result.
+    SNIP = 6
+
+    # Goofy's equivalent of JUMP, will jump based on a condition.
+    BOUNCE = 7
+
+    # Goofy's equivalent of HALT, stops the execution at this point.
+    FREEZE = 8
+
+    # Not a goofy opcode. Stands in for a token which could not be compiled, so the error is only reported if it's reached.
+    FAULT = 9
+
+# The version of the compiled instruction format. Bump it whenever compiling the same tokens could give different instructions.
+COMPILER_VERSION = 2
+
+# Maps the opcode names which can appear in a goofy lang file to their compiled code.
+OPCODES_BY_NAME = {opcode.name: opcode for opcode in Opcode if opcode != Opcode.FAULT}
+
+@dataclass(frozen=True, slots=True)
+class Instruction:
+    """ Represents a single compiled instruction. Everything
+    that can be decided from the tokens alone has already been
+    decided, so executing it needs no further token inspection.
+    """
+    # The compiled code of the opcode, see Opcode.
+    opcode: int
+
+    # The parsed int for SHOVE, BOUNCE and the immediate form of the arithmetic opcodes, the stripped line to print encoded
+    # as UTF-8 for YELL and the error message for FAULT. None when there is no operand, such as the stack form of GLUE.
+    operand: int | bytes | str | None = None
+
+    # The index of the instruction BOUNCE jumps to when its condition is met. Holds the label name until labels are resolved.
+    target: int | str = 0
+
+    # The comparison BOUNCE performs between the stack top and the operand, bound from CONDITIONALS.
+    conditional: Callable[[int, int], bool] | None = None
+
+    # The index of the token the instruction was compiled from.
+    token_index: int = 0
+
+@dataclass(frozen=True, slots=True)
+class Program:
+    """ Represents a compiled goofy lang program. It's immutable,
+    so the same program can be shared by any number of interpreters
+    and run any number of times without being compiled again.
+    """
+    # The compiled instructions, with every operand validated and every BOUNCE target resolved.
+    instructions: tuple[Instruction, ...]
+
+    # Maps each label name to the index of the instruction it starts at. Empty for a program loaded from the cache.
+    labels: Mapping[str, int] = MappingProxyType({})
+
+    # The number of tokens the program was compiled from.
+    token_count: int = 0
+
+    def __post_init__(self):
+        object.__setattr__(self, "instructions", tuple(self.instructions))
+
+        object.__setattr__(self, "labels", MappingProxyType(dict(self.labels)))
+
+    def __reduce__(self):
+        # A mapping proxy can't be pickled, so the labels are sent as a dict and wrapped again when unpickled.
+        return (Program, (self.instructions, dict(self.labels), self.token_count))
+
+class GoofyCompiler:
+    """ Responsible for compiling the tokens of a
+    goofy lang file into a list of instructions which
+    the interpreter can execute without re-inspecting tokens.
+    """
+    def __init__(self, tokens: Iterable[Token], opcodes: dict[str, int] = OPCODES_BY_NAME):
+        # Any iterable of tokens, including the tokenizer's iter_tokens, which is consumed lazily when compiling.
+        self.tokens = tokens
+
+        # Includes any opcodes registered with the interpreter on top of the built in ones.
+        self.opcodes = opcodes
+
+        self.instructions: list[Instruction] = []
+
+        # Maps each label name to the index of the instruction following its label start token.
+        self.labels: dict[str, int] = {}
+
+        self.token_count = 0
+
+        # The labels started more than once and the label definitions, kept with their token for error reporting.
+        self._duplicate_labels: list[tuple[int, Token]] = []
+
+        self._label_definitions: list[tuple[int, Token]] = []
+
+        # The current token followed by the tokens to the right of it which an opcode can use.
+        self._window: deque[Token] = deque()
+
+    def compile(self) -> list[Instruction]:
+        """ Compiles the tokens into a list of instructions. Only opcode and unknown
+        tokens produce an instruction, the tokens to the right of an opcode are folded
+        into its operands. Tokens which would fail to interpret are compiled into a FAULT
+        so the error is still reported at the point it's reached. The tokens are only
+        looked at a few at a time, so they never need to be held in memory together.
+        BOUNCE targets are resolved afterwards by resolve_labels.
+
+        Returns:
+            list[Instruction]: the list of compiled instructions.
+        """
+        tokens = iter(self.tokens)
+
+        # BOUNCE is the opcode which looks furthest to the right, using three tokens.
+        self._window.extend(islice(tokens, 4))
+
+        while self._window:
+            index = self.token_count
+
+            token = self._window[0]
+
+            if token.type == TokenType.OPCODE:
+                self.instructions.append(self.compile_opcode(index, token))
+
+            elif token.type == TokenType.UNKNOWN:
+                self.instructions.append(self.fault(index, f"Token {index + 1}:{token.value} is an unknown token type. Please review the provided source"))
+
+            elif token.type == TokenType.LABEL_START:
+                self.compile_label_start(index, token)
+
+            elif token.type == TokenType.LABEL_DEFINITION:
+                self._label_definitions.append((index, token))
+
+            self._window.popleft()
+
+            self._window.extend(islice(tokens, 1))
+
+            self.token_count += 1
+
+        return self.instructions
+
+    def resolve_labels(self) -> bool:
+        """ Resolves the target of every compiled BOUNCE from its
+        label name to the index of the instruction it jumps to.
+
+        Returns:
+            bool: whether the labels were resolved successfully. Resolving is unsuccessful if a label is started
+                  more than once or a label definition refers to a label which is never started.
+        """
+        success = True
+
+        for index, token in self._duplicate_labels:
+            LOGGER.error("Token %d:%s starts the label %s, which was already started. Labels must be unique", index + 1, token.value, token.value.strip(":"))
+
+            return not success
+
+        for index, token in self._label_definitions:
+            if token.value.strip("#") not in self.labels:
+                LOGGER.error("There was no label start found for label definition token %d:%s. Did you forget it?", index + 1, token.value)
+
+                return not success
+
+        for position, instruction in enumerate(self.instructions):
+            if instruction.opcode == Opcode.BOUNCE:
+                self.instructions[position] = replace(instruction, target=self.labels[instruction.target])
+
+        return success
+
+    def peek(self, offset: int) -> Token | None:
+        """ Gets a token to the right of the token being compiled.
+
+        Args:
+            offset (int): how far to the right of the token being compiled the token is.
+
+        Returns:
+            Token | None: the token, or None if the tokens end before it.
+        """
+        return self._window[offset] if len(self._window) > offset else None
+
+    def compile_label_start(self, index: int, token: Token):
+        """ Records the instruction a label start token
+        resolves to, which is the next one to be compiled.
+
+        Args:
+            index (int): the index of the label start token.
+            token (Token): the label start token.
+        """
+        label_name = token.value.strip(":")
+
+        if label_name in self.labels:
+            self._duplicate_labels.append((index, token))
+
+            return
+
+        self.labels[label_name] = len(self.instructions)
+
+    def fault(self, index: int, message: str) -> Instruction:
+        """ Creates a FAULT instruction, which reports the message
+        when it's reached.
+
+        Args:
+            index (int): the index of the token the fault was compiled from.
+            message (str): the error message to report.
+
+        Returns:
+            Instruction: the FAULT instruction.
+        """
+        return Instruction(Opcode.FAULT, operand=message, token_index=index)
+
+    def compile_opcode(self, index: int, token: Token) -> Instruction:
+        """ Compiles an opcode token and the tokens to the right
+        of it that it uses into an instruction.
+
+        Args:
+            index (int): the index of the opcode token.
+            token (Token): the opcode token.
+
+        Returns:
+            Instruction: the compiled instruction.
+        """
+        opcode = self.opcodes.get(token.value)
+
+        if opcode is None:
+            return self.fault(index, f"Token {index + 1}:{token.value} contains an unsupported opcode")
+
+        next_token = self.peek(1)
+
+        match opcode:
+            case Opcode.SHOVE:
+                if next_token is None:
+                    return self.fault(index, "There was no token to the right of SHOVE. Please make sure you remember to add a number")
+
+                if not next_token.type == TokenType.INT_LITERAL:
+                    return self.fault(index, f"Token {index + 1}:{next_token.value} is not an integer. SHOVE must be supplied an integer. Ex: SHOVE 3")
+
+                return Instruction(opcode, operand=int(next_token.value), token_index=index)
+
+            case Opcode.YELL:
+                if next_token is None:
+                    return self.fault(index, "There was no token to the right of YELL. Please make sure you remember to add a value")
+
+                # Stripped and encoded once here, so YELL only has to write it.
+                return Instruction(opcode, operand=(next_token.value.strip("\"") + "\n").encode(), token_index=index)
+
+            case Opcode.BOUNCE:
+                return self.compile_bounce(index)
+
+            case Opcode.SNOOP | Opcode.FREEZE:
+                return Instruction(opcode, token_index=index)
+
+        # The arithmetic opcodes and any registered opcodes take an optional int to the right. Ex: GLUE 1
+        if next_token is not None and next_token.type == TokenType.INT_LITERAL:
+            return Instruction(opcode, operand=int(next_token.value), token_index=index)
+
+        return Instruction(opcode, token_index=index)
+
+    def compile_bounce(self, index: int) -> Instruction:
+        """ Compiles a BOUNCE opcode token and its conditional,
+        comparison and label definition tokens into an instruction.
+        Ex: BOUNCE > 0 #LOOP
+
+        Args:
+            index (int): the index of the BOUNCE token.
+
+        Returns:
+            Instruction: the compiled instruction. The target is the name of the label,
+                         which resolve_labels turns into an instruction index.
+        """
+        conditional_token = self.peek(1)
+
+        comparison_token = self.peek(2)
+
+        label_definition_token = self.peek(3)
+
+        if label_definition_token is None:
+            return self.fault(index, "There was a missing token to the right of BOUNCE. Please review your code")
+
+        if not conditional_token.type == TokenType.CONDITIONAL:
+            return self.fault(index, "There as no conditional token provided to the right of BOUNCE. Ex: BOUNCE > 0 #L1")
+
+        if not comparison_token.type == TokenType.INT_LITERAL:
+            return self.fault(index, "The comparison token provided for BOUNCE was not an integer. Ex: BOUNCE > 0 #L1")
+
+        if not label_definition_token.type == TokenType.LABEL_DEFINITION:
+            return self.fault(index, "The label definition token provided for BOUNCE was not correct. Must contain a '#' before label name. Ex: BOUNCE > 0 #L1")
+
+        return Instruction(Opcode.BOUNCE,
+                           operand=int(comparison_token.value),
+                           target=label_definition_token.value.strip("#"),
+                           conditional=CONDITIONALS[conditional_token.value],
+                           token_index=index)
+
+def disassemble(instructions: list[Instruction], opcodes: dict[str, int] = OPCODES_BY_NAME) -> str:
+    """ Formats compiled instructions as text, one instruction
+    per line. Ex: 3: BOUNCE > 0 -> 1 (token 7)
+
+    Args:
+        instructions (list[Instruction]): the instructions to format.
+        opcodes (dict[str, int]): the opcodes the instructions were compiled with, used to name registered opcodes.
+
+    Returns:
+        str: the formatted instructions.
+    """
+    names = {code: name for name, code in opcodes.items()} | {Opcode.FAULT: Opcode.FAULT.name}
+
+    conditional_symbols = {function: symbol for symbol, function in CONDITIONALS.items()}
+
+    lines = []
+
+    for index, instruction in enumerate(instructions):
+        parts = [f"{index}:", names.get(instruction.opcode, str(instruction.opcode))]
+
+        if instruction.opcode == Opcode.BOUNCE:
+            parts.append(f"{conditional_symbols[instruction.conditional]} {instruction.operand} -> {instruction.target}")
+
+        elif instruction.opcode == Opcode.YELL:
+            text = instruction.operand.decode().removesuffix("\n")
+
+            parts.append(f"\"{text}\"")
+
+        elif instruction.opcode == Opcode.FAULT:
+            parts.append(f"\"{instruction.operand}\"")
+
+        elif instruction.operand is not None:
+            parts.append(str(instruction.operand))
+
+        parts.append(f"(token {instruction.token_index + 1})")
+
+        lines.append(" ".join(parts))
+
+    return "\n".join(lines)
@@ -0,0 +1,257 @@
+from collections import OrderedDict
+from contextvars import ContextVar
+from goofy.goofy_async import AsyncIterableInput
+from goofy.goofy_budget import Budget
+from goofy.goofy_client import DEFAULT_SOCKET_PATH
+from goofy.goofy_compiler import Program
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_output import FlushPolicy, OutputSink
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+
+LOGGER = logging.getLogger(__name__)
+
+# The number of compiled programs kept in memory by default, the least recently run are dropped first.
+DEFAULT_MAX_PROGRAMS = 1024
+
+# The longest request line the daemon accepts, which includes the source when it's sent rather than a path.
+MAX_REQUEST_SIZE = 64 * 1024 * 1024
+
+# The errors logged by the request being handled, if any. Each connection runs in its own task, so they're never mixed up.
+_request_errors: ContextVar[list[str] | None] = ContextVar("_request_errors", default=None)
+
+class RequestErrorCollector(logging.Handler):
+    """ Collects the error messages logged while handling
+    a request, so they can be sent back with its result.
+    """
+    def __init__(self):
+        super().__init__(logging.ERROR)
+
+    def emit(self, record: logging.LogRecord):
+        errors = _request_errors.get()
+
+        if errors is not None:
+            errors.append(record.getMessage())
+
+class GoofyDaemon:
+    """ Responsible for serving goofy lang programs over a Unix domain
+    socket, so running a program doesn't pay for starting python.
+    Compiled programs are kept in memory and many programs are run
+    at once on a single event loop.
+
+    Each request and response is a line of JSON. A request has either
+    the path of a goofy lang file or its source, and optionally a list
+    of numbers for SNOOP to read. Ex: {"path": "/scripts/a.goofy", "input": [3]}
+    The response has the final stack, success, output and any errors.
+    """
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH, budget: Budget | None = None, max_programs: int = DEFAULT_MAX_PROGRAMS):
+        self.path = path
+
+        # The limits on running each program, if any.
+        self.budget = budget
+
+        self.max_programs = max_programs
+
+        # Maps the hash of each source to its compiled program, with the most recently run last.
+        self.programs: OrderedDict[bytes, Program] = OrderedDict()
+
+        self.server: asyncio.Server | None = None
+
+        self._error_collector = RequestErrorCollector()
+
+    async def start(self):
+        """ Starts listening on the socket, replacing a stale socket
+        file left behind by a daemon which didn't stop cleanly.
+        """
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        self.server = await asyncio.start_unix_server(self.handle_connection, self.path, limit=MAX_REQUEST_SIZE)
+
+        os.chmod(self.path, 0o600)
+
+        logging.getLogger("goofy").addHandler(self._error_collector)
+
+    async def stop(self):
+        """ Stops listening and removes the socket file.
+        """
+        self.server.close()
+
+        await self.server.wait_closed()
+
+        logging.getLogger("goofy").removeHandler(self._error_collector)
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def serve_forever(self):
+        """ Starts the daemon and handles requests until it's cancelled.
+        """
+        await self.start()
+
+        LOGGER.info("Listening on %s", self.path)
+
+        try:
+            await self.server.serve_forever()
+
+        finally:
+            await self.stop()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """ Handles each request sent over a connection until the client closes it.
+
+        Args:
+            reader (asyncio.StreamReader): the connection's reader.
+            writer (asyncio.StreamWriter): the connection's writer.
+        """
+        try:
+            while line := await reader.readline():
+                response = await self.handle_request(line)
+
+                writer.write(json.dumps(response).encode() + b"\n")
+
+                await writer.drain()
+
+        except (ConnectionError, ValueError) as error:
+            LOGGER.warning("A connection was dropped: %s", error)
+
+        finally:
+            writer.close()
+
+    async def handle_request(self, line: bytes) -> dict:
+        """ Compiles, unless it's already compiled, and runs the program
+        a request is for.
+
+        Args:
+            line (bytes): the JSON request.
+
+        Returns:
+            dict: the response.
+        """
+        errors: list[str] = []
+
+        _request_errors.set(errors)
+
+        response = {"success": False, "stack": [], "output": "", "errors": errors}
+
+        try:
+            request = json.loads(line)
+
+            program = self.get_program(request)
+
+            numbers = request.get("input", [])
+
+            # Anything but ints would end up on the stack, where the opcodes can't handle it.
+            if not isinstance(numbers, list) or any(type(number) is not int for number in numbers):
+                raise ValueError("the input must be a list of integers")
+
+        except (ValueError, TypeError, OSError) as error:
+            errors.append(f"The request could not be handled: {error}")
+
+            return response
+
+        if program is None:
+            return response
+
+        stream = io.BytesIO()
+
+        interpreter = GoofyInterpreter.from_program(program)
+
+        # Whatever goes wrong running one program, the client still gets a response and the daemon carries on.
+        try:
+            response["success"] = await interpreter.run_async(input_source=AsyncIterableInput(numbers),
+                                                              output=OutputSink(stream, flush_policy=FlushPolicy.ON_EXIT),
+                                                              budget=self.budget)
+
+        except Exception as error:
+            LOGGER.exception("Running a request failed")
+
+            errors.append(f"The program could not be run: {error}")
+
+        response["stack"] = interpreter.stack
+
+        response["output"] = stream.getvalue().decode("UTF-8", errors="replace")
+
+        return response
+
+    def get_program(self, request: dict) -> Program | None:
+        """ Gets the compiled program a request is for, compiling
+        it if it isn't already in memory.
+
+        Args:
+            request (dict): the request, with either a path or a source.
+
+        Raises:
+            ValueError: if the request has neither a path nor a source, or either isn't a string.
+            OSError: if the file at the path can't be read.
+
+        Returns:
+            Program | None: the compiled program, or None if it could not be compiled.
+        """
+        if "source" in request:
+            if not isinstance(request["source"], str):
+                raise ValueError("the source must be a string")
+
+            source = request["source"].encode("UTF-8")
+
+        elif "path" in request:
+            if not isinstance(request["path"], str):
+                raise ValueError("the path must be a string")
+
+            with open(request["path"], "rb") as source_file:
+                source = source_file.read()
+
+        else:
+            raise ValueError("there was no path or source to run")
+
+        # Keyed by the source rather than the path, so an edited file is always compiled again.
+        key = hashlib.sha256(source).digest()
+
+        program = self.programs.get(key)
+
+        if program is not None:
+            self.programs.move_to_end(key)
+
+            return program
+
+        interpreter = GoofyInterpreter(source.decode("UTF-8", errors="replace").splitlines())
+
+        if not interpreter.compile():
+            return None
+
+        self.programs[key] = interpreter.program
+
+        if len(self.programs) > self.max_programs:
+            self.programs.popitem(last=False)
+
+        return interpreter.program
+
+def serve_main(arguments: list[str]):
+    parser = argparse.ArgumentParser(prog="goofy serve", description="Serves goofy lang programs over a Unix domain socket.")
+
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="the socket to listen on")
+
+    parser.add_argument("--max-programs", type=int, default=DEFAULT_MAX_PROGRAMS, metavar="N", help="the number of compiled programs to keep in memory")
+
+    parser.add_argument("--max-instructions", type=int, metavar="N", help="stop each program once it has executed more than N instructions")
+
+    parser.add_argument("--max-seconds", type=float, metavar="SECONDS", help="stop each program once it has run for more than SECONDS")
+
+    parser.add_argument("--max-stack", type=int, metavar="N", help="stop each program once its stack holds more than N values")
+
+    arguments = parser.parse_args(arguments)
+
+    limits = (arguments.max_instructions, arguments.max_seconds, arguments.max_stack)
+
+    budget = Budget(*limits) if any(limit is not None for limit in limits) else None
+
+    try:
+        asyncio.run(GoofyDaemon(arguments.socket, budget, arguments.max_programs).serve_forever())
+
+    except KeyboardInterrupt:
+        pass
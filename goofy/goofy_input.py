@@ -0,0 +1,153 @@
+from collections.abc import Iterable
+from typing import BinaryIO
+import mmap
+import re
+
+# The number of bytes read and parsed at a time by a StreamInput.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Matches a number which SNOOP accepts. Ex: 3 | -3
+NUMBER_PATTERN = re.compile(r"-?[0-9]+")
+
+# Matches the parts of a chunk of input joined by spaces, when every part is a number SNOOP accepts.
+NUMBERS_PATTERN = re.compile(rb"(?:-?[0-9]+ )*-?[0-9]+")
+
+class InputSource:
+    """ Represents where SNOOP reads numbers from.
+    """
+    # Whether a person is typing the input, in which case any output is flushed before reading so prompts are seen.
+    interactive = False
+
+    def read(self) -> int | None:
+        """ Reads the next number.
+
+        Raises:
+            EOFError: if there is no input left.
+
+        Returns:
+            int | None: the number, or None if the input was not a number.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """ Releases anything held to read the input.
+        """
+
+class ConsoleInput(InputSource):
+    """ Reads numbers typed into stdin one line at
+    a time, with the built in input.
+    """
+    interactive = True
+
+    def read(self) -> int | None:
+        user_input = input()
+
+        if not NUMBER_PATTERN.fullmatch(user_input):
+            return None
+
+        return int(user_input)
+
+class IterableInput(InputSource):
+    """ Reads numbers which have already been parsed,
+    from any iterable of ints such as a list or array.
+    """
+    def __init__(self, numbers: Iterable[int]):
+        self._numbers = iter(numbers)
+
+    def read(self) -> int | None:
+        for number in self._numbers:
+            return number
+
+        raise EOFError("There is no input left")
+
+class StreamInput(InputSource):
+    """ Reads whitespace separated numbers from a binary
+    stream. The stream is read a chunk at a time and every
+    number in the chunk is parsed together.
+    """
+    def __init__(self, stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.stream = stream
+
+        self.chunk_size = chunk_size
+
+        # The numbers parsed from the current chunk, with None in place of anything which wasn't a number.
+        self._numbers: list[int | None] = []
+
+        self._position = 0
+
+        # The end of the last chunk, which may be the start of a number continued in the next chunk.
+        self._remainder = b""
+
+    def read(self) -> int | None:
+        if self._position == len(self._numbers) and not self.read_chunk():
+            raise EOFError("There is no input left")
+
+        number = self._numbers[self._position]
+
+        self._position += 1
+
+        return number
+
+    def read_chunk(self) -> bool:
+        """ Reads the next chunk of the stream and parses the
+        numbers in it.
+
+        Returns:
+            bool: whether any numbers were read, false once the stream has ended.
+        """
+        while True:
+            data = self.stream.read(self.chunk_size)
+
+            chunk = self._remainder + data
+
+            parts = chunk.split()
+
+            # Unless the stream has ended, the last part may be a number cut off by the chunk, so it's kept for the next one.
+            self._remainder = parts.pop() if data and parts and not chunk[-1:].isspace() else b""
+
+            if parts or not data:
+                break
+
+        self._numbers = self.parse(parts)
+
+        self._position = 0
+
+        return len(self._numbers) > 0
+
+    def parse(self, parts: list[bytes]) -> list[int | None]:
+        """ Parses the parts of a chunk into numbers.
+
+        Args:
+            parts (list[bytes]): the whitespace separated parts of the chunk.
+
+        Returns:
+            list[int | None]: the parsed numbers, with None in place of each part which wasn't a number.
+        """
+        # Checking the whole chunk at once is much quicker than checking each part, and is almost always all it takes.
+        if NUMBERS_PATTERN.fullmatch(b" ".join(parts)):
+            return list(map(int, parts))
+
+        return [int(part) if NUMBER_PATTERN.fullmatch(part.decode(errors="replace")) else None for part in parts]
+
+class MappedFileInput(StreamInput):
+    """ Reads whitespace separated numbers from a file,
+    which is memory mapped rather than read into memory.
+    """
+    def __init__(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        with open(path, "rb") as file:
+            # An empty file can't be mapped, but it has no numbers to read anyway.
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if file.seek(0, 2) else None
+
+        super().__init__(mapped, chunk_size)
+
+    def read_chunk(self) -> bool:
+        if self.stream is None:
+            return False
+
+        return super().read_chunk()
+
+    def close(self):
+        """ Unmaps the file.
+        """
+        if self.stream is not None:
+            self.stream.close()
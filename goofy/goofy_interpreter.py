@@ -1,62 +1,247 @@
-from enum import Enum
-from goofy.goofy_tokenizer import GoofyTokenizer, TokenType, Token
+from collections.abc import Callable, Iterable, MutableSequence
+from itertools import repeat
+from goofy.goofy_tokenizer import GoofyTokenizer
+from goofy.goofy_async import ASYNC_SLICE_LENGTH, AsyncInputSource, AsyncOutputSink
+from goofy.goofy_budget import Budget, BudgetTracker
+from goofy.goofy_compiler import GoofyCompiler, Instruction, Opcode, OPCODES_BY_NAME, Program
+from goofy.goofy_input import InputSource, ConsoleInput
+from goofy.goofy_output import OutputSink
+from goofy.goofy_stack import BoundedStack, OverflowPolicy, StackFactory
+import asyncio
 import logging
+import operator
 
 LOGGER = logging.getLogger(__name__)
 
-class SupportedOpcodes(Enum):
-    """ Represents the opcodes which
-    are supported in goofy.
-    """
-    # Goofy's equivalent of PUSH, pushes a int onto the stack.
-    SHOVE = "SHOVE"
-    
-    # Goofy's equivalent of PRINT, prints a string to stdout. 
-    YELL = "YELL"
-    
-    # Goofy's equivalent of READ, reads a number from stdin and pushes onto the stack
-    SNOOP = "SNOOP"
-    
-    # Goofy's equivalent of SUB, pops two values off the stack and subtracts them, then pushes the result.
-    YEET = "YEET"
-    
-    # Goofy's equivalent of ADD, pops two values off the stack and adds them, then pushes the result.
-    GLUE = "GLUE"
+# The signature of an opcode handler. It's given the interpreter and the instruction, and returns whether it was successful.
+Handler = Callable[["GoofyInterpreter", Instruction], bool]
 
-    # Goofy's equivalent of MUL, pops two values off the stack and multiplies them, then pushes the result.
-    MOOSH = "MOOSH"
+def arithmetic_handler(name: str, operation: Callable[[int, int], int]) -> Handler:
+    """ Creates the handler for an arithmetic opcode. The handler
+    pops two values off the stack, applies the operation to them
+    and then pushes the result onto the stack. Alternatively,
+    an integer can be supplied after the opcode to apply the
+    operation to the stack top and that integer. Ex: GLUE 1
+
+    Args:
+        name (str): the name of the opcode, used in error messages.
+        operation (Callable[[int, int], int]): the operation to apply, given the first and second value.
+
+    Returns:
+        Handler: the handler for the opcode. It's unsuccessful if the stack does not contain at least two
+                 items, or at least one item when an integer is supplied.
+    """
+    def handler(interpreter: "GoofyInterpreter", instruction: Instruction) -> bool:
+        stack = interpreter._stack
+        
+        if instruction.operand is not None:
+            if not stack:
+                LOGGER.error("The stack does not contain a value to %s. Ex: SHOVE 3 %s 1", name, name)
+                
+                return False
+            
+            result = operation(stack.pop(), instruction.operand)
+            
+            try:
+                stack.append(result)
+                
+            except OverflowError:
+                return interpreter.push_overflowed(result)
+            
+            return True
+        
+        if len(stack) < 2:
+            LOGGER.error("The stack does not contain at least two values to %s. Ex: SHOVE 3 SHOVE 4 %s", name, name)
+            
+            return False
+        
+        # The first value is the one popped off the top of the stack.
+        result = operation(stack.pop(), stack.pop())
+        
+        try:
+            stack.append(result)
+            
+        except OverflowError:
+            return interpreter.push_overflowed(result)
+        
+        return True
     
-    # Goofy's equivalent of DIV, pops two values off the stack and divides them, then pushes the result.
-    SNIP = "SNIP"
+    handler.__name__ = f"interpret_{name.lower()}"
     
-    # Goofy's equivalent of JUMP, will jump based on a condition.
-    BOUNCE = "BOUNCE"
+    handler.__doc__ = f""" Responsible for interpreting the {name} opcode, see arithmetic_handler. """
     
-    # Goofy's equivalent of HALT, stops the execution at this point.
-    FREEZE = "FREEZE"
+    return handler
 
 class GoofyInterpreter:
     """ Responsible for doing the interpretation
     of a goofy lang file, determining which operations
     to perform.
     """
-    def __init__(self, file_lines: list[str]):
-        self._stack: list[int] = []
+    # Maps the opcode names which can be compiled to their code. Extended by register_opcode.
+    opcodes: dict[str, int] = dict(OPCODES_BY_NAME)
+    
+    # The dispatch table, which holds the handler of each opcode at the index of its code.
+    handlers: list[Handler] = []
+    
+    def __init__(self, file_lines: Iterable[str] = (), output: OutputSink | None = None, input_source: InputSource | None = None,
+                 stack_factory: StackFactory = list, overflow_policy: OverflowPolicy = OverflowPolicy.PROMOTE):
+        # Creates the stack for each run. A list of python ints by default, or a typed stack such as int64_stack or a BoundedStack.
+        self.stack_factory = stack_factory
+        
+        # What happens when a value doesn't fit on a typed stack.
+        self.overflow_policy = overflow_policy
+        
+        self._stack: MutableSequence[int] = stack_factory()
         
         self.tokenizer = GoofyTokenizer(file_lines)
         
+        # Where YELL writes to, buffered stdout by default.
+        self.output = output if output is not None else OutputSink()
+        
+        # Where SNOOP reads from, lines typed into stdin by default.
+        self.input_source = input_source if input_source is not None else ConsoleInput()
+        
+        # The compiled program, once the file is compiled. It can be run again and again without compiling the file again.
+        self.program: Program | None = None
+        
+        self.instructions: list[Instruction] = []
+        
+        # Maps each label name to the index of the instruction it starts at, known once the file is compiled.
+        self.labels: dict[str, int] = {}
+        
         self._index = 0
         
+        # Tracks the last execution with a budget, including which budget stopped it if any.
+        self.budget_tracker: BudgetTracker | None = None
+        
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        
+        # Subclasses get their own dispatch table so overridden handlers are dispatched to.
+        cls.build_dispatch_table()
+        
+    @classmethod
+    def build_dispatch_table(cls):
+        """ Builds the dispatch table from the interpret_ method
+        of each built in opcode, keeping any registered opcodes.
+        """
+        cls.handlers = [getattr(cls, f"interpret_{opcode.name.lower()}") for opcode in Opcode] + cls.handlers[len(Opcode):]
+        
+    @classmethod
+    def register_opcode(cls, name: str, handler: Handler) -> int:
+        """ Registers a new opcode which can be used in goofy lang files
+        interpreted by this class. If an integer is to the right of the
+        opcode it's compiled into the instruction's operand, otherwise
+        the operand is None. Ex: SWAP | PICK 2
+
+        Args:
+            name (str): the name of the opcode. Must be upper case to be tokenized as an opcode.
+            handler (Handler): the function called to interpret the opcode. Return False to stop interpreting.
+                               It should change interpreter.live_stack, which works with typed stacks too.
+
+        Raises:
+            ValueError: if the name isn't upper case or is already an opcode.
+
+        Returns:
+            int: the code the opcode is compiled to.
+        """
+        if not str.isupper(name):
+            raise ValueError(f"Opcode {name} must be upper case")
+        
+        if name in cls.opcodes:
+            raise ValueError(f"Opcode {name} is already registered")
+        
+        code = len(cls.handlers)
+        
+        # Copied rather than mutated so registering on a subclass leaves its parent untouched.
+        cls.opcodes = {**cls.opcodes, name: code}
+        
+        cls.handlers = [*cls.handlers, handler]
+        
+        return code
+        
+    @classmethod
+    def from_program(cls, program: Program, output: OutputSink | None = None, input_source: InputSource | None = None,
+                     stack_factory: StackFactory = list, overflow_policy: OverflowPolicy = OverflowPolicy.PROMOTE) -> "GoofyInterpreter":
+        """ Creates an interpreter which runs an already compiled program,
+        without a goofy lang file to tokenize.
+
+        Args:
+            program (Program): the compiled program.
+            output (OutputSink | None): where YELL writes to, buffered stdout by default.
+            input_source (InputSource | None): where SNOOP reads from, lines typed into stdin by default.
+            stack_factory (StackFactory): creates the stack for each run, see goofy_stack.
+            overflow_policy (OverflowPolicy): what happens when a value doesn't fit on a typed stack.
+
+        Returns:
+            GoofyInterpreter: the interpreter, ready to run the program.
+        """
+        interpreter = cls(output=output, input_source=input_source, stack_factory=stack_factory, overflow_policy=overflow_policy)
+        
+        interpreter.load(program)
+        
+        return interpreter
+        
     @property
     def stack(self) -> list[int]:
         """ Returns the current stack which
         contains the values added during interpretation.
+        A typed stack is copied into a list, so changing
+        it doesn't change the stack, see live_stack.
 
         Returns:
             list[int]: the current stack which contains 
             the values added during interpretation.
         """
-        return self._stack   
+        return self._stack if type(self._stack) is list else self._stack.tolist()
+    
+    @property
+    def live_stack(self) -> MutableSequence[int]:
+        """ Returns the stack itself, which is what handlers of
+        registered opcodes should change, as it's never a copy.
+
+        Returns:
+            MutableSequence[int]: the stack, made by the stack factory. Pushing
+            onto a typed stack raises OverflowError if the value doesn't fit.
+        """
+        return self._stack
+    
+    def push_overflowed(self, value: int) -> bool:
+        """ Pushes a value which didn't fit on a typed stack, either
+        because it doesn't fit in 64 bits or the stack is full. Called
+        by the handlers when pushing raises OverflowError.
+
+        Args:
+            value (int): the value which didn't fit.
+
+        Returns:
+            bool: whether the value was pushed. It's unsuccessful if the stack is full, or the overflow
+                  policy is to stop with an error.
+        """
+        success = True
+        
+        stack = self._stack
+        
+        if isinstance(stack, BoundedStack) and stack.is_full():
+            LOGGER.error("The stack is full, it can't hold more than %d values. Is there a loop which keeps SHOVEing?", stack.capacity)
+            
+            return not success
+        
+        if self.overflow_policy == OverflowPolicy.ERROR:
+            LOGGER.error("The value %d is too big for the typed stack, which holds 64 bit integers", value)
+            
+            return not success
+        
+        # The rest of the run carries on with python ints, which can hold any value.
+        if isinstance(stack, BoundedStack):
+            stack.promote()
+            
+        else:
+            self._stack = list(stack)
+            
+        self._stack.append(value)
+        
+        return success
     
     @property
     def index(self) -> int:
@@ -91,331 +276,449 @@ class GoofyInterpreter:
     def interpret(self) -> bool:
         """ Responsible for interpreting the goofy file
         lang that was provided when the interpreter object
-        was created. 
+        was created. The tokens are compiled into a program
+        the first time, which is then run from the start.
 
         Returns:
             bool: whether the interpreter was successful at parsing the tokens or not
         """
-        tokens = self.tokenizer.tokenize()
+        if self.program is None and not self.compile():
+            return False
+        
+        return self.run()
+    
+    def compile(self) -> bool:
+        """ Compiles the goofy lang file that was provided when
+        the interpreter object was created into a program,
+        which is kept so it can be run.
+
+        Returns:
+            bool: whether compiling was successful or not. Compiling is unsuccessful if there are no tokens
+                  or the labels could not be resolved.
+        """
+        compiling_success = True
+        
+        # The tokens are streamed from the tokenizer straight into the compiler, so only the instructions are kept.
+        compiler = GoofyCompiler(self.tokenizer.iter_tokens(), self.opcodes)
+        
+        self.instructions = compiler.compile()
         
-        interpreting_success = True
+        self.labels = compiler.labels
         
         # We should never hit this case since this is handled when the file is read, but just in case something weird happens I've left it here.
-        if len(tokens) == 0: 
+        if compiler.token_count == 0: 
             LOGGER.error("The token count is 0, which means the file provided was empty. Try another file")
             
-            return not interpreting_success
-        
-        while self.index < len(tokens):
-           token = tokens[self.index]
-          
-           if token.type == TokenType.OPCODE:
-               if not SupportedOpcodes.__contains__(token.value):
-                   LOGGER.error("Token %d:%s contains an unsupported opcode", self.index + 1, token.value)
-                   
-                   return not interpreting_success
-               
-               match token.value:
-                   case SupportedOpcodes.SHOVE.value:
-                       interpreting_success = self.interpret_shove(tokens)
-                       
-                   case SupportedOpcodes.YELL.value:
-                       interpreting_success = self.interpret_yell(tokens)
-                       
-                   case SupportedOpcodes.SNOOP.value:
-                        interpreting_success = self.interpret_snoop(tokens)
-                        
-                   case SupportedOpcodes.YEET.value:
-                        interpreting_success = self.interpret_yeet(tokens)
-                        
-                   case SupportedOpcodes.GLUE.value:
-                        interpreting_success = self.interpret_glue(tokens)
-                        
-                   case SupportedOpcodes.MOOSH.value:
-                        interpreting_success = self.interpret_moosh(tokens)
-                        
-                   case SupportedOpcodes.SNIP.value:
-                        interpreting_success = self.interpret_snip(tokens)
-                        
-                   case SupportedOpcodes.BOUNCE.value:
-                        interpreting_success = self.interpret_bounce(tokens)
-                        
-                   case SupportedOpcodes.FREEZE.value:
-                        return self.interpret_freeze()
-                    
-                   case _:
-                        interpreting_success = False
-
-               if not interpreting_success:
-                    return False
-                        
-           elif token.type == TokenType.UNKNOWN:
-               LOGGER.error("Token %d:%s is an unknown token type. Please review the provided source", self.index + 1, token.value)
-               
-               return not interpreting_success
-           
-           self.index += 1
-               
-        return interpreting_success    
-      
-    def interpret_shove(self, tokens: Token) -> bool:
-        """ Responsible for interpreting the SHOVE opcode.
-        This pushes an integer value onto the stack. 
+            return not compiling_success
+        
+        # Labels are resolved once up front, so duplicate or missing labels are reported before anything runs.
+        if not compiler.resolve_labels():
+            return not compiling_success
+        
+        self.program = Program(self.instructions, self.labels, compiler.token_count)
+        
+        return compiling_success
+    
+    def load(self, program: Program):
+        """ Loads an already compiled program to be run.
 
         Args:
-            tokens (Token): the current list of tokens to parse.
+            program (Program): the compiled program.
+        """
+        self.program = program
+        
+        self.instructions = list(program.instructions)
+        
+        self.labels = dict(program.labels)
+    
+    def reset(self, output: OutputSink | None = None, input_source: InputSource | None = None):
+        """ Resets the interpreter so the program can be run again
+        from the start, with an empty stack.
 
-        Returns:
-            bool: whether interpreting was successful or not. A SHOVE operation is unsuccessful if the next token is missing or
-                  not an integer.
+        Args:
+            output (OutputSink | None): where YELL writes to from now on, unchanged if None.
+            input_source (InputSource | None): where SNOOP reads from from now on, unchanged if None.
         """
-        success = True
+        self._stack = self.stack_factory()
         
-        if len(tokens) > self.index + 1:
-            next_token = tokens[self.index + 1]
-                        
-            if not next_token.type == TokenType.INT_LITERAL:
-               LOGGER.error("Token %d:%s is not an integer. SHOVE must be supplied an integer. Ex: SHOVE 3", self.index + 1, next_token.value)
-                            
-               return not success
-                 
-            self.stack.append(int(next_token.value))  
-                          
-        else:
-         LOGGER.error("There was no token to the right of SHOVE. Please make sure you remember to add a number")
-                            
-         return not success
+        self._index = 0
+        
+        self.budget_tracker = None
+        
+        if output is not None:
+            self.output = output
             
-        return success
+        if input_source is not None:
+            self.input_source = input_source
     
-    def interpret_yell(self, tokens: Token) -> bool:
-        """ Responsible for interpreting the YELL opcode.
-        This prints a the value to stdout. 
+    def run(self, program: Program | None = None, input_source: InputSource | None = None, budget: Budget | None = None) -> bool:
+        """ Runs a compiled program from the start, with an empty stack.
+        Running the same program again needs nothing compiled again.
 
         Args:
-            tokens (Token): the current list of tokens to parse.
+            program (Program | None): the program to run, the compiled goofy lang file if None.
+            input_source (InputSource | None): where SNOOP reads from for this run, unchanged if None.
+            budget (Budget | None): the limits on running the program, if any.
 
         Returns:
-            bool: whether interpreting was successful or not. A YELL operation is unsuccessful if the next token is missing or
-                  not an integer.
+            bool: whether running the program was successful or not
         """
-        success = True
-        
-        if len(tokens) > self.index + 1:
-            next_token = tokens[self.index + 1]
-                           
-            print(next_token.value.strip("\""))
-                    
-        else:
-            LOGGER.error("There was no token to the right of YELL. Please make sure you remember to add a value")
-                           
-            return not success
+        if program is not None:
+            self.load(program)
+            
+        self.reset(input_source=input_source)
         
-        return success
+        return self.execute(self.program.instructions, budget)
     
-    def interpret_snoop(self, tokens: Token) -> bool:
-        """ Responsible for interpreting the SNOOP opcode.
-        This reads an integer value from stdin and pushes it
-        onto the stack.
+    def execute(self, instructions: list[Instruction], budget: Budget | None = None) -> bool:
+        """ Executes a list of compiled instructions, starting from
+        the current index. Each instruction is dispatched with a
+        single lookup of its opcode in the dispatch table.
 
         Args:
-            tokens (Token): the current list of tokens to parse.
+            instructions (list[Instruction]): the compiled instructions to execute.
+            budget (Budget | None): the limits on executing the instructions, if any. The tracked
+                                    execution is kept in budget_tracker.
 
         Returns:
-            bool: whether interpreting was successful or not. A SNOOP operation is unsuccessful if the user input is 
-                  not an integer.
+            bool: whether executing the instructions was successful or not. Executing is unsuccessful if the budget is exceeded,
+                  in which case the stack and index are left as they were when it was stopped.
         """
-        success = True
+        self.instructions = instructions
         
-        user_input = input()
-                       
-        if not str.isnumeric(user_input.strip("-")):
-            LOGGER.error("The input entered was not a number, please supply a number")
-                           
-            return not success
-                       
-        self.stack.append(int(user_input))
+        handlers = self.handlers
         
-        return success
-    
-    def interpret_yeet(self, tokens: Token):
-        """ Responsible for interpreting the YEET opcode.
-        This pops two values off the stack, subtracts them and
-        then pushes the result onto the stack. Alternatively,
-        an integer can be supplied after the command to subtract
-        that value from the stack. Ex: YEET 1
+        # Only the budget's copy of the dispatch table does any tracking, so executing without one costs nothing extra.
+        if budget is not None:
+            self.budget_tracker = BudgetTracker(budget)
+            
+            handlers = self.budget_tracker.wrap(handlers, self._index)
+        
+        instruction_count = len(instructions)
+        
+        try:
+            while self._index < instruction_count:
+                instruction = instructions[self._index]
+                
+                self._index += 1
+                
+                if not handlers[instruction.opcode](self, instruction):
+                    return False
+                
+            return True
+        
+        finally:
+            # However execution ends, whatever was YELLed is written out.
+            self.output.flush()
+            
+            if budget is not None:
+                self.budget_tracker.finish(self._index)
+      
+    def run_steps(self, max_steps: int) -> bool | None:
+        """ Executes at most max_steps of the loaded instructions, starting
+        from the current index. The interpreter keeps its place, so calling
+        it again carries on where it stopped, letting many programs take
+        turns on the same thread. See GoofyScheduler.
 
         Args:
-            tokens (Token): the current list of tokens to parse.
+            max_steps (int): the most instructions to execute before stopping.
 
         Returns:
-            bool: whether interpreting was successful or not. A YEET operation is unsuccessful if the stack does
-                  not contain at least two items.
+            bool | None: whether executing the instructions was successful or not once they've finished,
+                         or None if they were stopped after max_steps and haven't finished yet.
         """
-        success = True
+        instructions = self.instructions
         
-        if len(tokens) > self.index + 1:
-            next_token = tokens[self.index + 1]
-            
-            if next_token.type == TokenType.INT_LITERAL:
-                first = self.stack.pop()
+        handlers = self.handlers
+        
+        instruction_count = len(instructions)
+        
+        try:
+            # Repeating None is the cheapest way to count the steps, it doesn't create an int for each one.
+            for _ in repeat(None, max_steps):
+                if self._index >= instruction_count:
+                    return True
                 
-                second = int(next_token.value)
+                instruction = instructions[self._index]
                 
-                result = first - second
+                self._index += 1
                 
-                self.stack.append(result)
+                if not handlers[instruction.opcode](self, instruction):
+                    return False
                 
-                return success
+            return True if self._index >= instruction_count else None
+        
+        finally:
+            # Written out at the end of every turn, so a program's output doesn't wait for the programs after it.
+            self.output.flush()
+    
+    async def run_async(self, program: Program | None = None, input_source: AsyncInputSource | None = None,
+                        output: OutputSink | None = None, budget: Budget | None = None) -> bool:
+        """ Runs a compiled program from the start, with an empty stack,
+        without blocking the event loop. SNOOP awaits the input source
+        and YELL writes to the output without waiting, so one event loop
+        can run many programs at once, such as sessions over sockets.
 
-        if len(self.stack) < 2:
-            LOGGER.error("The stack does not contain at least two values to YEET. Ex: SHOVE 3 SHOVE 4 YEET")
-                                
-            return not success
-                            
-        first = self.stack.pop()
-                            
-        second = self.stack.pop()
-                            
-        result = first - second
-                            
-        self.stack.append(result)
+        Args:
+            program (Program | None): the program to run, the compiled goofy lang file if None.
+            input_source (AsyncInputSource | None): where SNOOP reads from, if anywhere.
+            output (OutputSink | None): where YELL writes to from now on, such as an AsyncOutputSink. Unchanged if None.
+            budget (Budget | None): the limits on running the program, if any.
+
+        Returns:
+            bool: whether running the program was successful or not
+        """
+        if program is not None:
+            self.load(program)
+            
+        self.reset(output=output)
         
-        return success
+        return await self.execute_async(self.program.instructions, input_source, budget)
     
-    def interpret_glue(self, tokens: Token):
-        """ Responsible for interpreting the GLUE opcode.
-        This pops two values off the stack, adds them and
-        then pushes the result onto the stack. Alternatively,
-        an integer can be supplied after the command to subtract
-        that value from the stack. Ex: GLUE 1
+    async def execute_async(self, instructions: list[Instruction], input_source: AsyncInputSource | None = None, budget: Budget | None = None) -> bool:
+        """ Executes a list of compiled instructions, starting from the
+        current index, the same as execute except that SNOOP is awaited
+        and the other programs on the event loop get a turn every
+        ASYNC_SLICE_LENGTH instructions. execute itself is left untouched.
 
         Args:
-            tokens (Token): the current list of tokens to parse.
+            instructions (list[Instruction]): the compiled instructions to execute.
+            input_source (AsyncInputSource | None): where SNOOP reads from, if anywhere.
+            budget (Budget | None): the limits on executing the instructions, if any.
 
         Returns:
-            bool: whether interpreting was successful or not. A GLUE operation is unsuccessful if the stack does
-                  not contain at least two items.
+            bool: whether executing the instructions was successful or not
         """
-        success = True
+        self.instructions = instructions
+        
+        handlers = self.handlers
         
-        if len(tokens) > self.index + 1:
-            next_token = tokens[self.index + 1]
+        if budget is not None:
+            self.budget_tracker = BudgetTracker(budget)
             
-            if next_token.type == TokenType.INT_LITERAL:
-                first = self.stack.pop()
+            handlers = self.budget_tracker.wrap(handlers, self._index)
+        
+        instruction_count = len(instructions)
+        
+        steps = 0
+        
+        try:
+            while self._index < instruction_count:
+                instruction = instructions[self._index]
+                
+                self._index += 1
+                
+                if instruction.opcode == Opcode.SNOOP:
+                    success = await self.snoop_async(input_source)
+                    
+                else:
+                    success = handlers[instruction.opcode](self, instruction)
+                
+                if not success:
+                    return False
                 
-                second = int(next_token.value)
+                steps += 1
                 
-                result = first + second
+                if steps == ASYNC_SLICE_LENGTH:
+                    steps = 0
+                    
+                    await self.drain_output()
                 
-                self.stack.append(result)
+            await self.drain_output()
+            
+            return True
+        
+        finally:
+            self.output.flush()
+            
+            if budget is not None:
+                self.budget_tracker.finish(self._index)
                 
-                return success
+    async def drain_output(self):
+        """ Gives the other programs on the event loop a turn, waiting for
+        the output to be sent first if it's written to an asyncio stream.
+        """
+        if isinstance(self.output, AsyncOutputSink):
+            await self.output.drain()
+            
+        else:
+            await asyncio.sleep(0)
+            
+    async def snoop_async(self, input_source: AsyncInputSource | None) -> bool:
+        """ Responsible for interpreting the SNOOP opcode when running
+        asynchronously. This awaits an integer value from the input
+        source and pushes it onto the stack.
 
-        if len(self.stack) < 2:
-            LOGGER.error("The stack does not contain at least two values to GLUE. Ex: SHOVE 3 SHOVE 4 GLUE")
-                            
-            return not success
-                        
-        first = self.stack.pop()
-                        
-        second = self.stack.pop()
-                        
-        result = first + second
+        Args:
+            input_source (AsyncInputSource | None): where SNOOP reads from, if anywhere.
+
+        Returns:
+            bool: whether interpreting was successful or not. A SNOOP operation is unsuccessful if the user input is 
+                  not an integer, or there is no input left.
+        """
+        success = True
         
-        self.stack.append(result)
+        try:
+            if input_source is None:
+                raise EOFError("There is no input source")
+            
+            # Anything YELLed before asking for input, such as a prompt, has to be seen first.
+            if input_source.interactive:
+                await self.drain_output()
+            
+            number = await input_source.read()
+            
+        except EOFError:
+            LOGGER.error("There was no input left for SNOOP to read")
+            
+            return not success
+                       
+        if number is None:
+            LOGGER.error("The input entered was not a number, please supply a number")
+                           
+            return not success
+                       
+        try:
+            self._stack.append(number)
+            
+        except OverflowError:
+            return self.push_overflowed(number)
         
         return success
+      
+    def interpret_shove(self, instruction: Instruction) -> bool:
+        """ Responsible for interpreting the SHOVE opcode.
+        This pushes an integer value onto the stack. 
+
+        Args:
+            instruction (Instruction): the compiled SHOVE instruction.
+
+        Returns:
+            bool: whether interpreting was successful or not. A SHOVE operation is successful as the integer to push
+                  was validated when compiling, unless it doesn't fit on a typed stack, see push_overflowed.
+        """
+        try:
+            self._stack.append(instruction.operand)
+            
+        except OverflowError:
+            return self.push_overflowed(instruction.operand)
+        
+        return True
     
-    def interpret_moosh(self, tokens: Token):
-        """ Responsible for interpreting the MOOSH opcode.
-        This pops two values off the stack, multiplies them and
-        then pushes the result onto the stack. Alternatively,
-        an integer can be supplied after the command to subtract
-        that value from the stack. Ex: MOOSH 2
+    def interpret_yell(self, instruction: Instruction) -> bool:
+        """ Responsible for interpreting the YELL opcode.
+        This prints a the value to the output sink, which
+        is stdout unless another sink was provided.
+
+        Args:
+            instruction (Instruction): the compiled YELL instruction.
+
+        Returns:
+            bool: whether interpreting was successful or not. A YELL operation is always successful as the
+                  value to print was validated when compiling.
+        """
+        self.output.write(instruction.operand)
+        
+        return True
+    
+    def interpret_snoop(self, instruction: Instruction) -> bool:
+        """ Responsible for interpreting the SNOOP opcode.
+        This reads an integer value from the input source, stdin
+        by default, and pushes it onto the stack.
 
         Args:
-            tokens (Token): the current list of tokens to parse.
+            instruction (Instruction): the compiled SNOOP instruction.
 
         Returns:
-            bool: whether interpreting was successful or not. A MOOSH operation is unsuccessful if the stack does
-                  not contain at least two items.
+            bool: whether interpreting was successful or not. A SNOOP operation is unsuccessful if the user input is 
+                  not an integer, or there is no input left.
         """
         success = True
         
-        if len(tokens) > self.index + 1:
-            next_token = tokens[self.index + 1]
+        # Anything YELLed before asking for input, such as a prompt, has to be seen first.
+        if self.input_source.interactive:
+            self.output.flush()
+        
+        try:
+            number = self.input_source.read()
+            
+        except EOFError:
+            LOGGER.error("There was no input left for SNOOP to read")
             
-            if next_token.type == TokenType.INT_LITERAL:
-                first = self.stack.pop()
-                
-                second = int(next_token.value)
-                
-                result = first * second
-                
-                self.stack.append(result)
-                
-                return success
-
-        if len(self.stack) < 2:
-            LOGGER.error("The stack does not contain at least two values to MOOSH. Ex: SHOVE 3 SHOVE 4 MOOSH")
-                            
             return not success
-                        
-        first = self.stack.pop()
-                        
-        second = self.stack.pop()
-                        
-        result = first * second
-                        
-        self.stack.append(result)
+                       
+        if number is None:
+            LOGGER.error("The input entered was not a number, please supply a number")
+                           
+            return not success
+                       
+        try:
+            self._stack.append(number)
+            
+        except OverflowError:
+            return self.push_overflowed(number)
         
         return success
     
-    def interpret_snip(self, tokens: Token):
+    interpret_yeet = arithmetic_handler("YEET", operator.sub)
+    
+    interpret_glue = arithmetic_handler("GLUE", operator.add)
+    
+    interpret_moosh = arithmetic_handler("MOOSH", operator.mul)
+    
+    def interpret_snip(self, instruction: Instruction) -> bool:
         """ Responsible for interpreting the SNIP opcode.
-        This pops two values off the stack, multiplies them and
+        This pops two values off the stack, divides them and
         then pushes the result onto the stack. Alternatively,
-        an integer can be supplied after the command to subtract
-        that value from the stack. Ex: SNIP 10
+        an integer can be supplied after the command to divide
+        the stack by that value. Ex: SNIP 10
 
         Args:
-            tokens (Token): the current list of tokens to parse.
+            instruction (Instruction): the compiled SNIP instruction.
 
         Returns:
             bool: whether interpreting was successful or not. A SNIP operation is unsuccessful if the stack does
-                  not contain at least two items or there is an attempt to divide by zero.
+                  not contain at least two items, or at least one item when an integer is supplied, or there is
+                  an attempt to divide by zero.
         """
         success = True
         
-        if len(tokens) > self.index + 1:
-            next_token = tokens[self.index + 1]
-            
-            if next_token.type == TokenType.INT_LITERAL:
-                first = self.stack.pop()
-                
-                second = int(next_token.value)
-                
-                if second == 0:
-                 LOGGER.error("Attempt to divide by zero, please review your program flow.")
-                            
-                 return not success
+        stack = self._stack
+        
+        if instruction.operand is not None:
+            if not stack:
+                LOGGER.error("The stack does not contain a value to SNIP. Ex: SHOVE 3 SNIP 1")
                 
-                result = first / second
+                return not success
+            
+            first = stack.pop()
+            
+            second = instruction.operand
+            
+            if second == 0:
+                LOGGER.error("Attempt to divide by zero, please review your program flow.")
                 
-                self.stack.append(result)
+                return not success
+            
+            # Truncated towards zero like the stack form, so the stack only ever holds ints.
+            result = int(first / second)
+            
+            try:
+                stack.append(result)
                 
-                return success
+            except OverflowError:
+                return self.push_overflowed(result)
+            
+            return success
 
-        if len(self.stack) < 2:
+        if len(stack) < 2:
             LOGGER.error("The stack does not contain at least two values to SNIP. Ex: SHOVE 3 SHOVE 4 SNIP")
                             
             return not success
                         
-        first = self.stack.pop()
+        first = stack.pop()
                         
-        second = self.stack.pop()
+        second = stack.pop()
                         
         if second == 0:
            LOGGER.error("Attempt to divide by zero, please review your program flow.")
@@ -424,89 +727,64 @@ class GoofyInterpreter:
                         
         result = int(first / second)
                         
-        self.stack.append(result)
+        try:
+            stack.append(result)
+            
+        except OverflowError:
+            return self.push_overflowed(result)
         
         return success
         
-    def interpret_bounce(self, tokens: Token) -> bool:
+    def interpret_bounce(self, instruction: Instruction) -> bool:
         """ Responsible for interpreting the BOUNCE opcode.
         This is responsible for jumping to another location
         based on if a condition is met. Ex: BOUNCE > 0 #LOOP
 
         Args:
-            tokens (Token): the current list of tokens to parse.
+            instruction (Instruction): the compiled BOUNCE instruction.
 
         Returns:
-            bool: whether interpreting was successful or not. A BOUNCE operation is unsuccessful if any of the
-                  required tokens after BOUNCE are missing or if the stack is empty.
+            bool: whether interpreting was successful or not. A BOUNCE operation is unsuccessful if the stack is empty.
         """
-        success = True
-        
-        if len(tokens) > self.index + 3:
-          conditional_token = tokens[self.index + 1]
-          
-          comparison_token = tokens[self.index + 2]
-          
-          label_definition_token = tokens[self.index + 3]
-          
-          if not conditional_token.type == TokenType.CONDITIONAL:
-             LOGGER.error("There as no conditional token provided to the right of BOUNCE. Ex: BOUNCE > 0 #L1")
-             
-             return not success
-
-          if not comparison_token.type == TokenType.INT_LITERAL:
-             LOGGER.error("The comparison token provided for BOUNCE was not an integer. Ex: BOUNCE > 0 #L1")
-             
-             return not success
-
-          if not label_definition_token.type == TokenType.LABEL_DEFINITION:
-             LOGGER.error("The label definition token provided for BOUNCE was not correct. Must contain a '#' before label name. Ex: BOUNCE > 0 #L1")
-             
-             return not success
-
-          if self.is_stack_empty():
-             LOGGER.error("There is no value on the stack for bounce to compare to. Make sure you add a value to the stack. Ex: SHOVE 10 | SNOOP")
-             
-             return not success
-      
-          top = self.get_stack_top()
+        if not self._stack:
+            LOGGER.error("There is no value on the stack for bounce to compare to. Make sure you add a value to the stack. Ex: SHOVE 10 | SNOOP")
+            
+            return False
         
-          expression_result = eval(f"{top} {conditional_token.value} {comparison_token.value}")
+        # Fall through to the next instruction if it's false
+        if instruction.conditional(self._stack[-1], instruction.operand):
+            self._index = instruction.target
+            
+        return True
+       
+    def interpret_freeze(self, instruction: Instruction) -> bool:
+        """ Responsible for interpreting the FREEZE opcode.
+        This halts execution at the point it is called. 
 
-          if not expression_result:
-             # Skip the bounce statement if it's false
-             self.index += 3
-             
-             return success
+        Args:
+            instruction (Instruction): the compiled FREEZE instruction.
 
-          label_start_tokens = self.tokenizer.get_tokens_by_type(TokenType.LABEL_START)
+        Returns:
+            bool: returns true to indicate that halting was successful
+        """
+        self._index = len(self.instructions)
         
-          found_label_start = False
+        self.output.freeze()
         
-          for label_start_token in label_start_tokens:
-             if label_definition_token.value.strip("#") == label_start_token.value.strip(":"):
-                self.index = tokens.index(label_start_token)
-                
-                found_label_start = True
-                
-                break
-              
-          if found_label_start:
-             return success
-          else:
-             LOGGER.error("There was no label start found for label definition token: %s. Did you forget it?", label_definition_token.value)
-             
-             return not success     
-        else: 
-           LOGGER.error("There was a missing token to the right of BOUNCE. Please review your code")
-           
-           return not success
-       
-    def interpret_freeze(self) -> bool:
-        """ Responsible for interpreting the FREEZE opcode.
-        This halts execution at the point it is called. 
+        return True
+    
+    def interpret_fault(self, instruction: Instruction) -> bool:
+        """ Responsible for interpreting a FAULT, which stands
+        in for a token that could not be compiled.
+
+        Args:
+            instruction (Instruction): the compiled FAULT instruction.
 
         Returns:
-            bool: returns true to indicate that the program should halt 
+            bool: returns false, after reporting the error the fault carries.
         """
-        return True                                       
\ No newline at end of file
+        LOGGER.error(instruction.operand)
+        
+        return False
+    
+GoofyInterpreter.build_dispatch_table()
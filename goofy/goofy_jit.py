@@ -0,0 +1,320 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from goofy.goofy_budget import Budget
+from goofy.goofy_compiler import Instruction, Opcode
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_loops import CountedLoop, find_counted_loop
+from goofy.goofy_tokenizer import CONDITIONALS
+
+# The number of times a BOUNCE has to jump backwards before its loop is compiled.
+DEFAULT_THRESHOLD = 50
+
+# Maps each comparison function back to the conditional it was bound from, to write it into the compiled loop.
+CONDITIONAL_SYMBOLS = {function: symbol for symbol, function in CONDITIONALS.items()}
+
+# The python operator each arithmetic opcode is compiled to. SNIP is compiled separately as it can divide by zero.
+ARITHMETIC_OPERATORS = {
+    Opcode.YEET: "-",
+    Opcode.GLUE: "+",
+    Opcode.MOOSH: "*",
+}
+
+# A compiled loop. It's given the stack and the output's write, and returns the index to carry on interpreting from,
+# or None if the stack didn't hold enough values to enter it.
+CompiledLoop = Callable[[list[int], Callable[[bytes], None]], int | None]
+
+@dataclass(slots=True)
+class LoopCounters:
+    """ Represents how a loop ending in a backward BOUNCE was run.
+    """
+    # The index of the instruction the loop jumps back to.
+    target: int
+
+    # The number of times the BOUNCE jumped back while being interpreted.
+    jumps: int = 0
+
+    # Whether the loop was compiled, and the number of times the compiled loop was run.
+    compiled: bool = False
+
+    entries: int = 0
+
+    # The number of times the compiled loop finished, and the number of times a guard sent it back to the interpreter.
+    exits: int = 0
+
+    guard_exits: int = 0
+
+    # The number of times every pass of the loop was run at once, see CountedLoop.
+    counted: int = 0
+
+def generate_loop_source(instructions: list[Instruction], head: int, bounce_index: int) -> str | None:
+    """ Generates the source of a python function which runs a loop. The
+    values the loop works on are kept in local variables, only the values
+    it leaves behind or takes from further down are moved on and off the
+    stack. The BOUNCE comparison is written inline.
+
+    Args:
+        instructions (list[Instruction]): the instructions of the program.
+        head (int): the index of the first instruction of the loop, which the BOUNCE jumps to.
+        bounce_index (int): the index of the BOUNCE which ends the loop.
+
+    Returns:
+        str | None: the source of the function, called loop, or None if the loop can't be compiled. Only loops
+                    of SHOVE, YELL and the arithmetic opcodes can be, with no other jump out of it.
+    """
+    body = instructions[head:bounce_index]
+
+    bounce = instructions[bounce_index]
+
+    depth = lowest_depth = 0
+
+    for instruction in body:
+        if instruction.opcode == Opcode.SHOVE:
+            depth += 1
+
+        elif instruction.opcode in ARITHMETIC_OPERATORS or instruction.opcode == Opcode.SNIP:
+            # Dividing by an immediate zero always fails, which is left to the interpreter to report.
+            if instruction.opcode == Opcode.SNIP and instruction.operand == 0:
+                return None
+
+            depth -= 1 if instruction.operand is not None else 2
+
+            lowest_depth = min(lowest_depth, depth)
+
+            depth += 1
+
+        elif instruction.opcode != Opcode.YELL:
+            return None
+
+    # Enough values are taken off the stack for every instruction in the body, and for BOUNCE to compare the top of.
+    needed = max(-lowest_depth, 1 - depth, 0)
+
+    # The net number of values each pass leaves on the stack, which can be negative.
+    change = depth
+
+    names = [f"t{index}" for index in range(needed)]
+
+    lines = ["def loop(stack, write):", f"    if len(stack) < {needed}:", "        return None"]
+
+    if needed:
+        lines += [f"    {', '.join(names)}, = stack[-{needed}:]", f"    del stack[-{needed}:]"]
+
+    lines.append("    while True:")
+
+    values = list(names)
+
+    temporaries = 0
+
+    for offset, instruction in enumerate(body):
+        index = head + offset
+
+        if instruction.opcode == Opcode.SHOVE:
+            values.append(repr(instruction.operand))
+
+            continue
+
+        if instruction.opcode == Opcode.YELL:
+            lines.append(f"        write({instruction.operand!r})")
+
+            continue
+
+        # Guards need the stack exactly as the interpreter would have it before this instruction.
+        restore = f"stack.extend(({', '.join(values)},))" if values else "pass"
+
+        first = values.pop()
+
+        second = repr(instruction.operand) if instruction.operand is not None else values.pop()
+
+        result = f"v{temporaries}"
+
+        temporaries += 1
+
+        if instruction.opcode == Opcode.SNIP:
+            if instruction.operand is None:
+                lines += [f"        if {second} == 0:", f"            {restore}", f"            return -{index} - 1"]
+
+            lines.append(f"        {result} = int({first} / {second})")
+
+        else:
+            lines.append(f"        {result} = {first} {ARITHMETIC_OPERATORS[instruction.opcode]} {second}")
+
+        values.append(result)
+
+    restore = f"stack.extend(({', '.join(values)},))"
+
+    lines += [f"        if not {values[-1]} {CONDITIONAL_SYMBOLS[bounce.conditional]} {bounce.operand!r}:", f"            {restore}", f"            return {bounce_index + 1}"]
+
+    # The values below the ones carried into the next pass are left on the stack.
+    if change > 0:
+        lines.append(f"        stack.extend(({', '.join(values[:change])},))")
+
+        values = values[change:]
+
+    # Or the values the next pass needs are taken from further down the stack, if it has them.
+    elif change < 0:
+        taken = [f"s{index}" for index in range(-change)]
+
+        lines += [f"        if len(stack) < {-change}:", f"            {restore}", f"            return -{head} - 1",
+                  f"        {', '.join(taken)}, = stack[{change}:]", f"        del stack[{change}:]"]
+
+        values = taken + values
+
+    if values:
+        lines.append(f"        {', '.join(names)}, = {', '.join(values)},")
+
+    return "\n".join(lines) + "\n"
+
+def compile_loop(instructions: list[Instruction], head: int, bounce_index: int) -> CompiledLoop | None:
+    """ Compiles a loop into a python function, see generate_loop_source.
+
+    Args:
+        instructions (list[Instruction]): the instructions of the program.
+        head (int): the index of the first instruction of the loop.
+        bounce_index (int): the index of the BOUNCE which ends the loop.
+
+    Returns:
+        CompiledLoop | None: the function, or None if the loop can't be compiled. It returns the index to carry on
+                             from, which is negative and one less than minus the index when a guard failed.
+    """
+    source = generate_loop_source(instructions, head, bounce_index)
+
+    if source is None:
+        return None
+
+    namespace = {}
+
+    exec(compile(source, f"<goofy loop {head}-{bounce_index}>", "exec"), namespace)
+
+    return namespace["loop"]
+
+class TracingInterpreter(GoofyInterpreter):
+    """ An interpreter which compiles its hot loops. Each BOUNCE which
+    jumps backwards is counted, and once it has jumped threshold times
+    the loop it ends is compiled into a python function which runs it
+    until it's done. Whenever the compiled loop can't carry on exactly
+    as the interpreter would, such as dividing by zero, it puts the
+    stack back and the interpreter takes over. A loop which only counts
+    the stack top up or down, see CountedLoop, isn't run pass by pass
+    at all, its result is worked out straight away.
+
+    Loops are only compiled by execute, when the stack is a list and
+    there's no budget, as a compiled loop runs until it's done. Stepping,
+    async runs and the profiler are left to the interpreter.
+    """
+    def __init__(self, *args, threshold: int = DEFAULT_THRESHOLD, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.threshold = threshold
+
+        # Maps the index of each BOUNCE which has jumped backwards to how its loop was run.
+        self.loops: dict[int, LoopCounters] = {}
+
+        self._compiled_loops: dict[int, CompiledLoop | None] = {}
+
+        self._counted_loops: dict[int, CountedLoop | None] = {}
+
+        # Only turned on by execute, so loops run any other way, such as by the profiler, are left to the interpreter.
+        self._tracing = False
+
+    def execute(self, instructions: list[Instruction], budget: Budget | None = None) -> bool:
+        if instructions is not self.instructions:
+            self._compiled_loops = {}
+
+            self._counted_loops = {}
+
+            self.loops = {}
+
+        # A budget only checks the backward jumps it sees, so loops aren't compiled when there is one.
+        self._tracing = budget is None
+
+        try:
+            return super().execute(instructions, budget)
+
+        finally:
+            self._tracing = False
+
+    def interpret_bounce(self, instruction: Instruction) -> bool:
+        position = self._index - 1
+
+        if not super().interpret_bounce(instruction):
+            return False
+
+        # Only a BOUNCE which jumped backwards ends a loop.
+        if self._index > position or not self._tracing:
+            return True
+
+        counters = self.loops.get(position)
+
+        if counters is None:
+            counters = self.loops[position] = LoopCounters(self._index)
+
+        if position not in self._compiled_loops:
+            counters.jumps += 1
+
+            if counters.jumps < self.threshold:
+                return True
+
+            self._compiled_loops[position] = compile_loop(self.instructions, self._index, position)
+
+            self._counted_loops[position] = find_counted_loop(self.instructions, self._index, position)
+
+            counters.compiled = self._compiled_loops[position] is not None or self._counted_loops[position] is not None
+
+        if type(self._stack) is not list:
+            return True
+
+        counted_loop = self._counted_loops[position]
+
+        # A counted loop is run all at once, unless it would never end, which is left to the compiled loop.
+        if counted_loop is not None:
+            index = counted_loop.run(self._stack)
+
+            if index is not None:
+                counters.counted += 1
+
+                self._index = index
+
+                return True
+
+        loop = self._compiled_loops[position]
+
+        if loop is None:
+            return True
+
+        index = loop(self._stack, self.output.write)
+
+        if index is None:
+            return True
+
+        counters.entries += 1
+
+        if index < 0:
+            counters.guard_exits += 1
+
+            index = -index - 1
+
+        else:
+            counters.exits += 1
+
+        self._index = index
+
+        return True
+
+    def format_loops(self) -> str:
+        """ Formats how each loop was run as text.
+
+        Returns:
+            str: a line per loop. Ex: LOOP (3-5): 50 jumps, compiled, 1 entries, 1 exits, 0 guard exits, 0 counted
+        """
+        names = {index: name for name, index in self.labels.items()}
+
+        lines = []
+
+        for position, counters in self.loops.items():
+            name = names.get(counters.target, f"@{counters.target}")
+
+            compiled = "compiled" if counters.compiled else "not compiled"
+
+            lines.append(f"{name} ({counters.target}-{position}): {counters.jumps} jumps, {compiled}, {counters.entries} entries, "
+                         f"{counters.exits} exits, {counters.guard_exits} guard exits, {counters.counted} counted")
+
+        return "\n".join(lines)
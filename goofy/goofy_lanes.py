@@ -0,0 +1,402 @@
+from collections.abc import Sequence
+from goofy.goofy_batch import ErrorCollector
+from goofy.goofy_compiler import Opcode, Program
+from goofy.goofy_input import IterableInput
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_output import FlushPolicy, OutputSink
+import io
+import logging
+import operator
+
+# NumPy is optional, it's only needed to run programs across lanes.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The number of values each lane's stack can hold before it's grown.
+INITIAL_STACK_CAPACITY = 16
+
+INT64_MIN = -2 ** 63
+
+INT64_MAX = 2 ** 63 - 1
+
+# The biggest value every int up to which is exact as a float.
+FLOAT_EXACT_MAX = 2 ** 53
+
+# The built in opcodes which can be run across lanes, which is all of them.
+LANE_OPCODES = {opcode.value for opcode in Opcode}
+
+class GoofyLanes:
+    """ Responsible for running one compiled program over many
+    rows of input at once, a lane per row. Each lane has its own
+    stack, held as a row of a 2-D array, and its own index, so each
+    instruction is executed for every lane at that index with a
+    single array operation rather than once per row.
+
+    Lanes which BOUNCE differently go their own way. The lanes
+    at the lowest index always execute next, so lanes which went
+    different ways come back together once they reach the same
+    instruction. A lane whose input or value doesn't fit in 64 bits
+    is run from the start by the interpreter, so results are always
+    the same as running each row with GoofyInterpreter.
+    """
+    def __init__(self, program: Program, inputs: Sequence[Sequence[int]] | int):
+        """
+        Args:
+            program (Program): the compiled program, which can only use the built in opcodes.
+            inputs (Sequence[Sequence[int]] | int): the numbers SNOOP reads in each lane, a row per lane, or the
+                                                    number of lanes if the program doesn't SNOOP.
+
+        Raises:
+            ImportError: if NumPy isn't installed.
+            ValueError: if the program uses a registered opcode.
+        """
+        if numpy is None:
+            raise ImportError("NumPy is needed to run a program across lanes. Install it with pip install numpy")
+
+        unsupported = {instruction.opcode for instruction in program.instructions} - LANE_OPCODES
+
+        if unsupported:
+            raise ValueError(f"Registered opcodes {sorted(unsupported)} can't be run across lanes")
+
+        self.program = program
+
+        rows = [()] * inputs if isinstance(inputs, int) else inputs
+
+        lane_count = len(rows)
+
+        # The number of inputs in each row, as rows can be different lengths.
+        self.input_lengths = numpy.array([len(row) for row in rows], dtype=numpy.int64)
+
+        # The inputs of each row, padded to the length of the longest.
+        self.inputs = numpy.zeros((lane_count, self.input_lengths.max(initial=0)), dtype=numpy.int64)
+
+        # The rows with an input which doesn't fit in 64 bits, which are only run by the interpreter.
+        self._oversized_rows: dict[int, list[int]] = {}
+
+        for lane, row in enumerate(rows):
+            if any(not INT64_MIN <= number <= INT64_MAX for number in row):
+                self._oversized_rows[lane] = list(row)
+
+                continue
+
+            self.inputs[lane, :len(row)] = row
+
+        self.stacks = numpy.zeros((lane_count, INITIAL_STACK_CAPACITY), dtype=numpy.int64)
+
+        # The number of values on each lane's stack.
+        self.depths = numpy.zeros(lane_count, dtype=numpy.int64)
+
+        # The index of the next instruction of each lane.
+        self.indexes = numpy.zeros(lane_count, dtype=numpy.int64)
+
+        # The number of inputs each lane has SNOOPed.
+        self.snooped = numpy.zeros(lane_count, dtype=numpy.int64)
+
+        # Whether each lane is still running, and whether it was successful once it isn't.
+        self.running = numpy.ones(lane_count, dtype=bool)
+
+        self.success = numpy.ones(lane_count, dtype=bool)
+
+        # The error each unsuccessful lane stopped with.
+        self.errors: dict[int, str] = {}
+
+        # The lanes each YELL was executed in, in order, so each lane's output can be put together when it's asked for.
+        self._yells: list[tuple[bytes, numpy.ndarray]] = []
+
+        # The results of the lanes run again by the interpreter, which replace what the lanes hold.
+        self._fallbacks: dict[int, tuple[list[int], bytes]] = {}
+
+        # What each lane YELLed, put together the first time any lane's output is asked for.
+        self._outputs: list[bytes] | None = None
+
+        self._comparisons = {
+            operator.eq: numpy.equal,
+            operator.gt: numpy.greater,
+            operator.lt: numpy.less,
+            operator.ge: numpy.greater_equal,
+            operator.le: numpy.less_equal,
+            operator.ne: numpy.not_equal,
+        }
+
+    def run(self) -> "numpy.ndarray":
+        """ Runs the program in every lane until they've all finished.
+
+        Returns:
+            numpy.ndarray: whether each lane was successful.
+        """
+        instructions = self.program.instructions
+
+        instruction_count = len(instructions)
+
+        self._outputs = None
+
+        self.fall_back(numpy.array(list(self._oversized_rows), dtype=numpy.int64))
+
+        # Any SHOVE or comparison which doesn't fit in 64 bits means no lane can be run with arrays.
+        if any(isinstance(instruction.operand, int) and not INT64_MIN <= instruction.operand <= INT64_MAX for instruction in instructions):
+            self.fall_back(numpy.flatnonzero(self.running))
+
+        while True:
+            self.running &= self.indexes < instruction_count
+
+            if not self.running.any():
+                break
+
+            index = self.indexes[self.running].min()
+
+            lanes = numpy.flatnonzero(self.running & (self.indexes == index))
+
+            self.indexes[lanes] += 1
+
+            self.execute(instructions[index], lanes)
+
+        return self.success
+
+    def execute(self, instruction, lanes: "numpy.ndarray"):
+        """ Executes an instruction in some of the lanes.
+
+        Args:
+            instruction (Instruction): the instruction to execute.
+            lanes (numpy.ndarray): the lanes to execute it in, which are all at its index.
+        """
+        depths = self.depths[lanes]
+
+        match instruction.opcode:
+            case Opcode.SHOVE:
+                self.push(lanes, depths, numpy.full(len(lanes), instruction.operand, dtype=numpy.int64))
+
+            case Opcode.YELL:
+                self._yells.append((instruction.operand, lanes))
+
+            case Opcode.SNOOP:
+                exhausted = self.snooped[lanes] >= self.input_lengths[lanes]
+
+                self.fail(lanes[exhausted], "There was no input left for SNOOP to read")
+
+                lanes, depths = lanes[~exhausted], depths[~exhausted]
+
+                self.push(lanes, depths, self.inputs[lanes, self.snooped[lanes]])
+
+                self.snooped[lanes] += 1
+
+            case Opcode.YEET | Opcode.GLUE | Opcode.MOOSH | Opcode.SNIP:
+                self.execute_arithmetic(instruction, lanes, depths)
+
+            case Opcode.BOUNCE:
+                empty = depths == 0
+
+                self.fail(lanes[empty], "There is no value on the stack for bounce to compare to. Make sure you add a value to the stack. Ex: SHOVE 10 | SNOOP")
+
+                lanes, depths = lanes[~empty], depths[~empty]
+
+                jumping = self._comparisons[instruction.conditional](self.stacks[lanes, depths - 1], instruction.operand)
+
+                self.indexes[lanes[jumping]] = instruction.target
+
+            case Opcode.FREEZE:
+                self.indexes[lanes] = len(self.program.instructions)
+
+            case Opcode.FAULT:
+                self.fail(lanes, instruction.operand)
+
+    def execute_arithmetic(self, instruction, lanes: "numpy.ndarray", depths: "numpy.ndarray"):
+        """ Executes YEET, GLUE, MOOSH or SNIP in some of the lanes.
+
+        Args:
+            instruction (Instruction): the instruction to execute.
+            lanes (numpy.ndarray): the lanes to execute it in.
+            depths (numpy.ndarray): the number of values on each of the lanes' stacks.
+        """
+        name = Opcode(instruction.opcode).name
+
+        immediate = instruction.operand is not None
+
+        if immediate:
+            short = depths < 1
+
+            message = f"The stack does not contain a value to {name}. Ex: SHOVE 3 {name} 1"
+
+        else:
+            short = depths < 2
+
+            message = f"The stack does not contain at least two values to {name}. Ex: SHOVE 3 SHOVE 4 {name}"
+
+        self.fail(lanes[short], message)
+
+        lanes, depths = lanes[~short], depths[~short]
+
+        # The first value is the one on top of the stack.
+        first = self.stacks[lanes, depths - 1]
+
+        if immediate:
+            second = numpy.full(len(lanes), instruction.operand, dtype=numpy.int64)
+
+            depths = depths - 1
+
+        else:
+            second = self.stacks[lanes, depths - 2]
+
+            depths = depths - 2
+
+        # Both values have been popped, even if the operation goes on to fail.
+        self.depths[lanes] = depths
+
+        with numpy.errstate(over="ignore", invalid="ignore"):
+            match instruction.opcode:
+                case Opcode.YEET:
+                    result = first - second
+
+                    overflowed = ((first ^ second) & (first ^ result)) < 0
+
+                case Opcode.GLUE:
+                    result = first + second
+
+                    overflowed = ((first ^ result) & (second ^ result)) < 0
+
+                case Opcode.MOOSH:
+                    result = first * second
+
+                    # A product which wrapped around can't be divided back into the second value. Dividing -2 ** 63
+                    # by -1 wraps around too, so that case is checked on its own.
+                    divisor = numpy.where(first == 0, 1, first)
+
+                    overflowed = (first != 0) & ((result // divisor != second) | (result % divisor != 0) | ((first == -1) & (second == INT64_MIN)))
+
+                case _:
+                    zero = second == 0
+
+                    self.fail(lanes[zero], "Attempt to divide by zero, please review your program flow.")
+
+                    lanes, depths, first, second = lanes[~zero], depths[~zero], first[~zero], second[~zero]
+
+                    # Divided as floats and truncated, the same as int(first / second). Values up to 2 ** 53 are exact
+                    # as floats, so the division rounds the same way. Any bigger and the lane is run by the interpreter.
+                    overflowed = (numpy.abs(first) > FLOAT_EXACT_MAX) | (numpy.abs(second) > FLOAT_EXACT_MAX)
+
+                    result = numpy.trunc(first.astype(numpy.float64) / numpy.where(overflowed, 1, second)).astype(numpy.int64)
+
+        self.fall_back(lanes[overflowed])
+
+        keep = ~overflowed
+
+        self.push(lanes[keep], depths[keep], result[keep])
+
+    def push(self, lanes: "numpy.ndarray", depths: "numpy.ndarray", values: "numpy.ndarray"):
+        """ Pushes a value onto the stack of each of some lanes,
+        growing the stacks if any of them are full.
+
+        Args:
+            lanes (numpy.ndarray): the lanes to push onto.
+            depths (numpy.ndarray): the number of values on each of the lanes' stacks.
+            values (numpy.ndarray): the value to push in each lane.
+        """
+        if len(lanes) and depths.max() >= self.stacks.shape[1]:
+            self.stacks = numpy.concatenate([self.stacks, numpy.zeros_like(self.stacks)], axis=1)
+
+        self.stacks[lanes, depths] = values
+
+        self.depths[lanes] = depths + 1
+
+    def fail(self, lanes: "numpy.ndarray", message: str):
+        """ Stops some lanes, as unsuccessful.
+
+        Args:
+            lanes (numpy.ndarray): the lanes to stop.
+            message (str): the error they stopped with.
+        """
+        if not len(lanes):
+            return
+
+        self.running[lanes] = False
+
+        self.success[lanes] = False
+
+        self.errors.update(dict.fromkeys(lanes.tolist(), message))
+
+    def fall_back(self, lanes: "numpy.ndarray"):
+        """ Stops some lanes, running them again from the start with
+        the interpreter, as a value they hold doesn't fit in 64 bits.
+
+        Args:
+            lanes (numpy.ndarray): the lanes to run again.
+        """
+        if not len(lanes):
+            return
+
+        self.running[lanes] = False
+
+        collector = ErrorCollector()
+
+        logger = logging.getLogger("goofy")
+
+        handlers, propagate = logger.handlers, logger.propagate
+
+        logger.handlers, logger.propagate = [collector], False
+
+        try:
+            for lane in lanes.tolist():
+                stream = io.BytesIO()
+
+                row = self._oversized_rows.get(lane)
+
+                if row is None:
+                    row = self.inputs[lane, :self.input_lengths[lane]].tolist()
+
+                interpreter = GoofyInterpreter.from_program(self.program, OutputSink(stream, flush_policy=FlushPolicy.ON_EXIT), IterableInput(row))
+
+                self.success[lane] = interpreter.run()
+
+                self._fallbacks[lane] = (interpreter.stack, stream.getvalue())
+
+                for message in collector.collect():
+                    self.errors[lane] = message
+
+        finally:
+            logger.handlers, logger.propagate = handlers, propagate
+
+    def stack(self, lane: int) -> list[int]:
+        """ Gets the final stack of a lane.
+
+        Args:
+            lane (int): the lane.
+
+        Returns:
+            list[int]: the stack, bottom first.
+        """
+        if lane in self._fallbacks:
+            return self._fallbacks[lane][0]
+
+        return self.stacks[lane, :self.depths[lane]].tolist()
+
+    def get_stacks(self) -> list[list[int]]:
+        """ Gets the final stack of every lane.
+
+        Returns:
+            list[list[int]]: the stacks, a stack per lane.
+        """
+        return [self.stack(lane) for lane in range(len(self.depths))]
+
+    def output(self, lane: int) -> bytes:
+        """ Gets what a lane YELLed.
+
+        Args:
+            lane (int): the lane.
+
+        Returns:
+            bytes: the output, encoded as UTF-8.
+        """
+        if lane in self._fallbacks:
+            return self._fallbacks[lane][1]
+
+        if self._outputs is None:
+            outputs = [[] for _ in range(len(self.depths))]
+
+            for text, lanes in self._yells:
+                for yelling_lane in lanes.tolist():
+                    outputs[yelling_lane].append(text)
+
+            self._outputs = [b"".join(output) for output in outputs]
+
+        return self._outputs[lane]
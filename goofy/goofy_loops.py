@@ -0,0 +1,160 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from goofy.goofy_compiler import Instruction, Opcode
+import operator
+
+# The arithmetic opcodes a counted loop can be made of, and the operation each applies to the first and second value.
+AFFINE_OPERATIONS = {
+    Opcode.YEET: operator.sub,
+    Opcode.GLUE: operator.add,
+    Opcode.MOOSH: operator.mul,
+}
+
+@dataclass(frozen=True, slots=True)
+class CountedLoop:
+    """ Represents a loop which only ever changes the stack top,
+    by adding the same step to it on every pass, and ends with a
+    BOUNCE comparing it to a constant. Ex: L1: YEET 1 BOUNCE > 0 #L1
+    So many passes of it can be replaced by working out how many
+    passes it would take and adding the step that many times over.
+    """
+    # The index of the first instruction of the loop, which the BOUNCE jumps to.
+    head: int
+
+    # The index of the BOUNCE which ends the loop.
+    bounce_index: int
+
+    # The amount added to the stack top on every pass, which is never 0.
+    step: int
+
+    # The comparison the BOUNCE performs between the stack top and the limit, bound from CONDITIONALS.
+    conditional: Callable[[int, int], bool]
+
+    limit: int
+
+    def get_trip_count(self, start: int) -> int | None:
+        """ Works out how many passes the loop makes, starting from the
+        stack top at the head of the loop, once BOUNCE has jumped to it.
+
+        Args:
+            start (int): the stack top at the head of the loop.
+
+        Returns:
+            int | None: the number of passes, or None if the loop would never end.
+        """
+        step = self.step
+
+        limit = self.limit
+
+        # The loop ends on the first pass which leaves a stack top the conditional is false for.
+        match self.conditional:
+            case operator.gt if step < 0:
+                passes = -((start - limit) // step)
+
+            case operator.ge if step < 0:
+                passes = (start - limit) // -step + 1
+
+            case operator.lt if step > 0:
+                passes = -((start - limit) // step)
+
+            case operator.le if step > 0:
+                passes = (limit - start) // step + 1
+
+            case operator.ne if (limit - start) % step == 0:
+                passes = (limit - start) // step
+
+            case operator.eq:
+                passes = 1
+
+            case _:
+                return None
+
+        # The stack top at the head has already met the conditional, so there is always at least one pass.
+        if passes < 1:
+            passes = 1
+
+        # Checked once, rather than trusting the arithmetic above for every conditional and sign.
+        if self.conditional(start + passes * step, limit) or passes > 1 and not self.conditional(start + (passes - 1) * step, limit):
+            return None
+
+        return passes
+
+    def run(self, stack: list[int]) -> int | None:
+        """ Runs every pass of the loop at once, replacing the stack top
+        with the value the last pass leaves.
+
+        Args:
+            stack (list[int]): the stack, as it is at the head of the loop.
+
+        Returns:
+            int | None: the index of the instruction after the BOUNCE, or None if the loop can't be run at once,
+                        because the stack is empty or the loop would never end. The stack is untouched if so.
+        """
+        if not stack:
+            return None
+
+        passes = self.get_trip_count(stack[-1])
+
+        if passes is None:
+            return None
+
+        stack[-1] += passes * self.step
+
+        return self.bounce_index + 1
+
+def find_counted_loop(instructions: list[Instruction], head: int, bounce_index: int) -> CountedLoop | None:
+    """ Works out whether a loop is a counted loop. Each instruction in
+    the body is followed through as an affine function of the stack top,
+    so the body counts if a pass only ever adds a constant to it. Any
+    loop with an instruction which has side effects, such as YELL or
+    SNOOP, or which jumps, doesn't count.
+
+    Args:
+        instructions (list[Instruction]): the instructions of the program.
+        head (int): the index of the first instruction of the loop, which the BOUNCE jumps to.
+        bounce_index (int): the index of the BOUNCE which ends the loop.
+
+    Returns:
+        CountedLoop | None: the counted loop, or None if the loop isn't one.
+    """
+    bounce = instructions[bounce_index]
+
+    if bounce.opcode != Opcode.BOUNCE or bounce.target != head or head > bounce_index:
+        return None
+
+    # Each value is (scale, offset), the value being scale * x + offset, where x is the stack top at the head.
+    values = [(1, 0)]
+
+    for instruction in instructions[head:bounce_index]:
+        if instruction.opcode == Opcode.SHOVE:
+            values.append((0, instruction.operand))
+
+            continue
+
+        operation = AFFINE_OPERATIONS.get(instruction.opcode)
+
+        # The stack below the stack top isn't known, so a loop which reaches down into it doesn't count.
+        if operation is None or len(values) < (1 if instruction.operand is not None else 2):
+            return None
+
+        first = values.pop()
+
+        second = (0, instruction.operand) if instruction.operand is not None else values.pop()
+
+        if operation is operator.mul:
+            # Multiplying two values which both depend on the stack top isn't affine.
+            if first[0] and second[0]:
+                return None
+
+            constant, value = (first[1], second) if not first[0] else (second[1], first)
+
+            values.append((value[0] * constant, value[1] * constant))
+
+        else:
+            values.append((operation(first[0], second[0]), operation(first[1], second[1])))
+
+    # Anything other than a single stack top which has changed by a constant leaves more than the stack top behind.
+    if len(values) != 1 or values[0][0] != 1 or values[0][1] == 0:
+        return None
+
+    return CountedLoop(head, bounce_index, values[0][1], bounce.conditional, bounce.operand)
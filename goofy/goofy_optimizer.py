@@ -0,0 +1,175 @@
+from dataclasses import replace
+from goofy.goofy_compiler import Instruction, Opcode
+import operator
+
+# The operation each arithmetic opcode performs on its first and second value. SNIP is folded separately as it
+# can divide by zero.
+FOLDABLE_OPERATIONS = {
+    Opcode.YEET: operator.sub,
+    Opcode.GLUE: operator.add,
+    Opcode.MOOSH: operator.mul,
+}
+
+# The arithmetic opcodes whose operands can be swapped, so SHOVE n followed by the stack form can use the immediate form.
+COMMUTATIVE_OPCODES = {Opcode.GLUE, Opcode.MOOSH}
+
+# The codes of the built in opcodes, anything else was registered with the interpreter.
+OPCODE_CODES = {opcode.value for opcode in Opcode}
+
+# The instructions which execution never continues past.
+TERMINATING_OPCODES = {Opcode.FREEZE, Opcode.FAULT}
+
+class GoofyOptimizer:
+    """ Responsible for optimizing compiled instructions
+    with a peephole pass. Constant arithmetic is folded, SHOVE
+    followed by GLUE or MOOSH is fused into the immediate form
+    and unreachable instructions after FREEZE are dropped.
+
+    Optimizing assumes the program runs successfully. The result
+    is the same when it does, but when it fails the error reported
+    and the stack left behind can differ.
+    """
+    def __init__(self, instructions: list[Instruction]):
+        self.instructions = instructions
+
+        # A description of each change made, for dumping what the optimizer did.
+        self.changes: list[str] = []
+
+    def optimize(self) -> list[Instruction]:
+        """ Optimizes the instructions. Instructions are never merged
+        across a BOUNCE target, so every jump lands where it did before.
+
+        Returns:
+            list[Instruction]: the optimized instructions, with BOUNCE targets updated.
+        """
+        jump_targets = {instruction.target for instruction in self.instructions if instruction.opcode == Opcode.BOUNCE}
+
+        optimized: list[Instruction] = []
+
+        # Whether each optimized instruction is a BOUNCE target, so nothing before it can merge with it.
+        is_target: list[bool] = []
+
+        new_indexes: dict[int, int] = {}
+
+        reachable = True
+
+        for index, instruction in enumerate(self.instructions):
+            if index in jump_targets:
+                new_indexes[index] = len(optimized)
+
+                reachable = True
+
+            if not reachable:
+                self.changes.append(f"dropped unreachable {self.describe([instruction])}")
+
+                continue
+
+            optimized.append(instruction)
+
+            is_target.append(index in jump_targets)
+
+            # A merge can make the instruction before mergeable too, so keep going until nothing changes.
+            while len(optimized) > 1 and not is_target[-1] and self.merge_tail(optimized, is_target):
+                pass
+
+            reachable = instruction.opcode not in TERMINATING_OPCODES
+
+        new_indexes[len(self.instructions)] = len(optimized)
+
+        return [replace(instruction, target=new_indexes[instruction.target]) if instruction.opcode == Opcode.BOUNCE else instruction
+                for instruction in optimized]
+
+    def merge_tail(self, optimized: list[Instruction], is_target: list[bool]) -> bool:
+        """ Tries to merge the last optimized instruction into
+        the instructions before it.
+
+        Args:
+            optimized (list[Instruction]): the optimized instructions so far.
+            is_target (list[bool]): whether each optimized instruction is a BOUNCE target.
+
+        Returns:
+            bool: whether the instructions were merged.
+        """
+        last = optimized[-1]
+
+        previous = optimized[-2]
+
+        if previous.opcode != Opcode.SHOVE:
+            return False
+
+        # SHOVE a GLUE 1 -> SHOVE a + 1
+        if last.opcode in FOLDABLE_OPERATIONS and last.operand is not None:
+            return self.fold(optimized, is_target, 2, replace(previous, operand=FOLDABLE_OPERATIONS[last.opcode](previous.operand, last.operand)))
+
+        # Only the stack form of the arithmetic opcodes is left to merge.
+        if last.operand is not None or (last.opcode not in FOLDABLE_OPERATIONS and last.opcode != Opcode.SNIP):
+            return False
+
+        # SHOVE a SHOVE b GLUE -> SHOVE b + a, as the first value is the one on top of the stack.
+        if len(optimized) > 2 and not is_target[-2] and optimized[-3].opcode == Opcode.SHOVE:
+            first = previous.operand
+
+            second = optimized[-3].operand
+
+            if last.opcode in FOLDABLE_OPERATIONS:
+                return self.fold(optimized, is_target, 3, replace(optimized[-3], operand=FOLDABLE_OPERATIONS[last.opcode](first, second)))
+
+            if second != 0:
+                return self.fold(optimized, is_target, 3, replace(optimized[-3], operand=int(first / second)))
+
+        # SHOVE b GLUE -> GLUE b
+        if last.opcode in COMMUTATIVE_OPCODES:
+            return self.fold(optimized, is_target, 2, replace(last, operand=previous.operand, token_index=previous.token_index))
+
+        return False
+
+    def fold(self, optimized: list[Instruction], is_target: list[bool], count: int, instruction: Instruction) -> bool:
+        """ Replaces the last instructions with a single instruction.
+
+        Args:
+            optimized (list[Instruction]): the optimized instructions so far.
+            is_target (list[bool]): whether each optimized instruction is a BOUNCE target.
+            count (int): the number of instructions at the end to replace.
+            instruction (Instruction): the instruction to replace them with.
+
+        Returns:
+            bool: true, to indicate the instructions were merged.
+        """
+        self.changes.append(f"replaced {self.describe(optimized[-count:])} with {self.describe([instruction])}")
+
+        # The merged instruction takes the place of the first, so it's a target if the first was.
+        target = is_target[-count]
+
+        del optimized[-count:]
+
+        del is_target[-count:]
+
+        optimized.append(instruction)
+
+        is_target.append(target)
+
+        return True
+
+    def describe(self, instructions: list[Instruction]) -> str:
+        """ Describes instructions for the list of changes.
+
+        Args:
+            instructions (list[Instruction]): the instructions to describe.
+
+        Returns:
+            str: the description. Ex: SHOVE 3 SHOVE 4 GLUE (token 1)
+        """
+        parts = []
+
+        for instruction in instructions:
+            name = Opcode(instruction.opcode).name if instruction.opcode in OPCODE_CODES else str(instruction.opcode)
+
+            if instruction.opcode == Opcode.YELL:
+                text = instruction.operand.decode().removesuffix("\n")
+
+                parts.append(f"{name} \"{text}\"")
+
+            else:
+                parts.append(name if instruction.operand is None or instruction.opcode == Opcode.BOUNCE else f"{name} {instruction.operand}")
+
+        return f"{' '.join(parts)} (token {instructions[0].token_index + 1})"
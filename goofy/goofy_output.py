@@ -0,0 +1,103 @@
+from enum import Enum
+from typing import BinaryIO, TextIO
+import io
+import sys
+
+# The number of bytes buffered before they're written, when flushing every N bytes.
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+class FlushPolicy(Enum):
+    """ Enum that represents when an output sink writes
+    the output it has buffered. Whatever the policy, the
+    output is always written when execution ends.
+    """
+    # Writes the output of every YELL straight away, for interactive use.
+    EVERY_YELL = 1
+    
+    # Writes the output whenever at least buffer_size bytes are buffered.
+    EVERY_N_BYTES = 2
+    
+    # Writes the output when FREEZE is executed.
+    ON_FREEZE = 3
+    
+    # Only writes the output when execution ends.
+    ON_EXIT = 4
+
+class OutputSink:
+    """ Responsible for writing the output of YELL.
+    The output is buffered and written in batches according
+    to the flush policy, rather than once per YELL.
+    """
+    def __init__(self, stream: BinaryIO | TextIO | None = None, buffer_size: int = DEFAULT_BUFFER_SIZE, flush_policy: FlushPolicy = FlushPolicy.EVERY_N_BYTES):
+        # None writes to whatever sys.stdout is when the output is flushed.
+        self.stream = stream
+        
+        self.buffer_size = buffer_size
+        
+        self.flush_policy = flush_policy
+        
+        self._buffer = bytearray()
+        
+        # Picked once, so writing doesn't have to check the policy.
+        match flush_policy:
+            case FlushPolicy.EVERY_YELL:
+                self.write = self.write_and_flush
+                
+            case FlushPolicy.EVERY_N_BYTES:
+                self.write = self.write_and_flush_when_full
+                
+            case _:
+                self.write = self._buffer.extend
+                
+    def write_and_flush(self, data: bytes):
+        """ Writes data straight away.
+
+        Args:
+            data (bytes): the encoded data to write.
+        """
+        self._buffer += data
+        
+        self.flush()
+        
+    def write_and_flush_when_full(self, data: bytes):
+        """ Buffers data, writing the buffer once it holds
+        at least buffer_size bytes.
+
+        Args:
+            data (bytes): the encoded data to write.
+        """
+        self._buffer += data
+        
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+            
+    def freeze(self):
+        """ Called when FREEZE is executed, writing the buffer
+        if the flush policy is to flush on FREEZE.
+        """
+        if self.flush_policy == FlushPolicy.ON_FREEZE:
+            self.flush()
+            
+    def flush(self):
+        """ Writes everything that's buffered to the stream.
+        """
+        if not self._buffer:
+            return
+        
+        stream = self.stream if self.stream is not None else sys.stdout
+        
+        if not isinstance(stream, io.TextIOBase):
+            stream.write(self._buffer)
+            
+        # Text streams are written through their binary buffer when they have one, so the output isn't decoded again.
+        elif getattr(stream, "buffer", None) is not None:
+            stream.flush()
+            
+            stream.buffer.write(self._buffer)
+            
+        else:
+            stream.write(self._buffer.decode())
+            
+        stream.flush()
+        
+        self._buffer.clear()
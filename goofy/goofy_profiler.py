@@ -0,0 +1,179 @@
+from collections import Counter
+from goofy.goofy_compiler import Instruction, Opcode
+import json
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from goofy.goofy_interpreter import GoofyInterpreter
+
+# The number of hottest instructions included in a report by default.
+DEFAULT_HOTTEST_COUNT = 10
+
+class GoofyProfiler:
+    """ Responsible for profiling the execution of compiled
+    instructions. It executes them with its own instrumented
+    copy of the interpreter's loop, so the interpreter's loop
+    pays nothing for profiling when it's not being used.
+    """
+    def __init__(self, labels: dict[str, int] | None = None, hottest_count: int = DEFAULT_HOTTEST_COUNT):
+        # Maps each label name to the index of the instruction it starts at, used to name BOUNCE targets in the report.
+        self.labels = labels if labels is not None else {}
+
+        self.hottest_count = hottest_count
+
+        self.instructions: list[Instruction] = []
+
+        # The number of times each instruction was executed and the nanoseconds spent in it, by instruction index.
+        self.counts: list[int] = []
+
+        self.times: list[int] = []
+
+        # The number of times a BOUNCE jumped to each instruction index.
+        self.entries: Counter[int] = Counter()
+
+        self.elapsed = 0
+
+        self._opcode_names: dict[int, str] = {}
+
+    def execute(self, interpreter: "GoofyInterpreter", instructions: list[Instruction]) -> bool:
+        """ Executes a list of compiled instructions with the interpreter,
+        starting from its current index, and records the profile.
+        Executing is the same as GoofyInterpreter.execute in every other way.
+
+        Args:
+            interpreter (GoofyInterpreter): the interpreter to execute the instructions with.
+            instructions (list[Instruction]): the compiled instructions to execute.
+
+        Returns:
+            bool: whether executing the instructions was successful or not
+        """
+        interpreter.instructions = self.instructions = instructions
+
+        self._opcode_names = {code: name for name, code in interpreter.opcodes.items()} | {Opcode.FAULT: Opcode.FAULT.name}
+
+        handlers = interpreter.handlers
+
+        instruction_count = len(instructions)
+
+        counts = self.counts = [0] * instruction_count
+
+        times = self.times = [0] * instruction_count
+
+        entries = self.entries = Counter()
+
+        clock = time.perf_counter_ns
+
+        started = clock()
+
+        try:
+            while interpreter._index < instruction_count:
+                index = interpreter._index
+
+                instruction = instructions[index]
+
+                interpreter._index = index + 1
+
+                start = clock()
+
+                success = handlers[instruction.opcode](interpreter, instruction)
+
+                times[index] += clock() - start
+
+                counts[index] += 1
+
+                # Checked against the conditional, as a BOUNCE to the next instruction is taken without moving anywhere else.
+                if instruction.opcode == Opcode.BOUNCE and success and instruction.conditional(interpreter._stack[-1], instruction.operand):
+                    entries[instruction.target] += 1
+
+                if not success:
+                    return False
+
+            return True
+
+        finally:
+            self.elapsed = clock() - started
+
+            interpreter.output.flush()
+
+    def get_label_name(self, index: int) -> str:
+        """ Gets the name of the label a BOUNCE target starts.
+
+        Args:
+            index (int): the index of the instruction the BOUNCE jumped to.
+
+        Returns:
+            str: the label name, or the instruction index if the label names aren't known. Ex: LOOP | @3
+        """
+        names = [name for name, label_index in self.labels.items() if label_index == index]
+
+        return ", ".join(names) if names else f"@{index}"
+
+    def report(self) -> dict:
+        """ Summarises the profile of the last execution.
+
+        Returns:
+            dict: the profile, with the instruction count and seconds in total, by opcode name, the number of
+                  times each label was entered and the hottest instructions by time.
+        """
+        opcodes: dict[str, dict] = {}
+
+        for instruction, count, nanoseconds in zip(self.instructions, self.counts, self.times):
+            if count == 0:
+                continue
+
+            opcode = opcodes.setdefault(self._opcode_names.get(instruction.opcode, str(instruction.opcode)), {"count": 0, "seconds": 0})
+
+            opcode["count"] += count
+
+            opcode["seconds"] += nanoseconds / 1e9
+
+        hottest = sorted((index for index, count in enumerate(self.counts) if count), key=lambda index: self.times[index], reverse=True)
+
+        return {
+            "instructions": sum(self.counts),
+            "seconds": self.elapsed / 1e9,
+            "opcodes": dict(sorted(opcodes.items(), key=lambda item: item[1]["seconds"], reverse=True)),
+            "labels": {self.get_label_name(index): count for index, count in self.entries.most_common()},
+            "hottest": [{
+                "index": index,
+                "opcode": self._opcode_names.get(self.instructions[index].opcode, str(self.instructions[index].opcode)),
+                "token": self.instructions[index].token_index + 1,
+                "count": self.counts[index],
+                "seconds": self.times[index] / 1e9,
+            } for index in hottest[:self.hottest_count]],
+        }
+
+    def format_json(self) -> str:
+        """ Formats the profile of the last execution as JSON.
+
+        Returns:
+            str: the profile, see report.
+        """
+        return json.dumps(self.report(), indent=2)
+
+    def format_text(self) -> str:
+        """ Formats the profile of the last execution as text tables.
+
+        Returns:
+            str: the profile, see report.
+        """
+        report = self.report()
+
+        lines = [f"{report['instructions']} instructions executed in {report['seconds']:.6f}s", "", f"{'opcode':<12}{'count':>12}{'seconds':>12}"]
+
+        for name, opcode in report["opcodes"].items():
+            lines.append(f"{name:<12}{opcode['count']:>12}{opcode['seconds']:>12.6f}")
+
+        if report["labels"]:
+            lines += ["", f"{'label':<24}{'entries':>12}"]
+
+            for name, count in report["labels"].items():
+                lines.append(f"{name:<24}{count:>12}")
+
+        lines += ["", f"{'index':>8}  {'opcode':<12}{'token':>8}{'count':>12}{'seconds':>12}"]
+
+        for instruction in report["hottest"]:
+            lines.append(f"{instruction['index']:>8}  {instruction['opcode']:<12}{instruction['token']:>8}{instruction['count']:>12}{instruction['seconds']:>12.6f}")
+
+        return "\n".join(lines)
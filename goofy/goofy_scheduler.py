@@ -0,0 +1,117 @@
+from collections import deque
+from dataclasses import dataclass
+from goofy.goofy_compiler import Program
+from goofy.goofy_interpreter import GoofyInterpreter
+import time
+
+# The number of instructions a program with a weight of 1 executes in each turn.
+DEFAULT_SLICE_LENGTH = 1000
+
+@dataclass(slots=True)
+class ScheduledProgram:
+    """ Represents a program taking turns in a scheduler.
+    """
+    interpreter: GoofyInterpreter
+
+    # How many slices the program executes in each turn, so a weight of 2 gets twice the time of a weight of 1.
+    weight: int = 1
+
+    name: str = ""
+
+    # Whether the program was successful once it has finished, None until then.
+    result: bool | None = None
+
+    # The number of turns the program has taken.
+    turns: int = 0
+
+    # The seconds from the scheduler starting until the program finished.
+    latency: float = 0.0
+
+class GoofyScheduler:
+    """ Responsible for interleaving many programs on a single
+    thread. Programs take turns round robin, each executing
+    slice_length instructions for every unit of its weight,
+    so one long BOUNCE loop can't hold up the rest.
+    """
+    def __init__(self, slice_length: int = DEFAULT_SLICE_LENGTH):
+        self.slice_length = slice_length
+
+        self.programs: list[ScheduledProgram] = []
+
+        # The programs which haven't finished, in the order of their next turn.
+        self._queue: deque[ScheduledProgram] = deque()
+
+        # The number of turns taken and the seconds spent running them, across every program.
+        self.turns = 0
+
+        self.elapsed = 0.0
+
+    def add(self, interpreter: GoofyInterpreter | Program, weight: int = 1, name: str = "") -> ScheduledProgram:
+        """ Adds a program to take turns. An interpreter carries on from
+        wherever it is, a compiled program is run from the start.
+
+        Args:
+            interpreter (GoofyInterpreter | Program): the interpreter with the instructions loaded, or a compiled program.
+            weight (int): how many slices the program executes in each turn.
+            name (str): the name to identify the program by.
+
+        Raises:
+            ValueError: if the weight isn't at least 1.
+
+        Returns:
+            ScheduledProgram: the scheduled program, which holds its result once it has finished.
+        """
+        if weight < 1:
+            raise ValueError(f"The weight of {name or 'a program'} must be at least 1")
+
+        if isinstance(interpreter, Program):
+            interpreter = GoofyInterpreter.from_program(interpreter)
+
+        scheduled = ScheduledProgram(interpreter, weight, name)
+
+        self.programs.append(scheduled)
+
+        self._queue.append(scheduled)
+
+        return scheduled
+
+    def run(self, max_turns: int | None = None) -> bool:
+        """ Runs the programs, a turn at a time, until they've all finished.
+
+        Args:
+            max_turns (int | None): the most turns to take in total before returning, all of them if None.
+
+        Returns:
+            bool: whether every program has finished.
+        """
+        queue = self._queue
+
+        slice_length = self.slice_length
+
+        started = time.perf_counter()
+
+        turns = 0
+
+        while queue and turns != max_turns:
+            scheduled = queue.popleft()
+
+            result = scheduled.interpreter.run_steps(slice_length * scheduled.weight)
+
+            scheduled.turns += 1
+
+            turns += 1
+
+            if result is None:
+                queue.append(scheduled)
+
+                continue
+
+            scheduled.result = result
+
+            scheduled.latency = self.elapsed + time.perf_counter() - started
+
+        self.turns += turns
+
+        self.elapsed += time.perf_counter() - started
+
+        return not queue
@@ -0,0 +1,130 @@
+from array import array
+from collections.abc import Callable, Iterator, MutableSequence
+from enum import Enum
+
+# Creates an empty stack. The interpreter creates a new one each time a program is run.
+StackFactory = Callable[[], MutableSequence[int]]
+
+class OverflowPolicy(Enum):
+    """ Enum that represents what happens when a value
+    doesn't fit in a typed stack's 64 bit slots.
+    """
+    # The stack is turned into one of python ints, which can hold any value, and execution carries on.
+    PROMOTE = 1
+
+    # Execution stops with an error.
+    ERROR = 2
+
+class StackFullError(OverflowError):
+    """ Raised when a value is pushed onto a
+    bounded stack which is already full.
+    """
+
+def int64_stack() -> array:
+    """ Creates a stack which holds each value in 8 bytes, rather
+    than as a python int. Pushing a value which doesn't fit in
+    64 bits raises OverflowError, leaving the stack unchanged.
+
+    Returns:
+        array: the empty stack.
+    """
+    return array("q")
+
+class BoundedStack(MutableSequence[int]):
+    """ A stack with a fixed capacity, whose memory is allocated
+    up front. Values are held in 8 bytes each until one doesn't
+    fit, when the stack can be promoted to hold python ints.
+    Pushing onto a full stack raises StackFullError.
+    """
+    __slots__ = ("capacity", "_values", "_length")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+
+        self._values: MutableSequence[int] = array("q", bytes(8 * capacity))
+
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._values[:self._length][index]
+
+        if index < 0:
+            index += self._length
+
+        if not 0 <= index < self._length:
+            raise IndexError("stack index out of range")
+
+        return self._values[index]
+
+    def __setitem__(self, index, value):
+        if index < 0:
+            index += self._length
+
+        if not 0 <= index < self._length:
+            raise IndexError("stack index out of range")
+
+        self._values[index] = value
+
+    def __delitem__(self, index):
+        raise TypeError("only the top of a bounded stack can be removed, with pop")
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._values[:self._length])
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"BoundedStack({self.tolist()}, capacity={self.capacity})"
+
+    def insert(self, index: int, value: int):
+        if index != self._length:
+            raise TypeError("values can only be pushed onto the top of a bounded stack")
+
+        self.append(value)
+
+    def append(self, value: int):
+        if self._length == self.capacity:
+            raise StackFullError(f"the stack can't hold more than {self.capacity} values")
+
+        # Assigned before the length changes, so a value which doesn't fit leaves the stack as it was.
+        self._values[self._length] = value
+
+        self._length += 1
+
+    def pop(self, index: int = -1) -> int:
+        if index not in (-1, self._length - 1):
+            raise TypeError("only the top of a bounded stack can be popped")
+
+        if not self._length:
+            raise IndexError("pop from empty stack")
+
+        self._length -= 1
+
+        return self._values[self._length]
+
+    def is_full(self) -> bool:
+        """ Determines whether the stack is at its capacity.
+
+        Returns:
+            bool: true if another value can't be pushed, false otherwise.
+        """
+        return self._length == self.capacity
+
+    def promote(self):
+        """ Changes the stack to hold python ints, so any value fits.
+        """
+        if isinstance(self._values, array):
+            self._values = self._values.tolist()
+
+    def tolist(self) -> list[int]:
+        """ Copies the values on the stack into a list.
+
+        Returns:
+            list[int]: the values, bottom first.
+        """
+        return list(self._values[:self._length])
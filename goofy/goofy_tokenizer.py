@@ -1,5 +1,10 @@
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
 from enum import Enum
+import operator
+import re
+import sys
 
 class TokenType(Enum):
     """ Enum that represents the different
@@ -13,16 +18,135 @@ class TokenType(Enum):
     LABEL_START = 6
     UNKNOWN = 7
     
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Token:
         """ Represents an individual token that has 
-        been parsed by the tokenizer. 
+        been parsed by the tokenizer. Tokens are immutable,
+        so a token which repeats, such as an opcode, can be shared.
         """
         value: str
         type: TokenType
 
-# Stores the types of conditional operators supported in goofy lang        
-CONDITIONALS = ["==", ">", "<", ">=", "<=", "!="]
+# Stores the types of conditional operators supported in goofy lang, mapped to the function which performs the comparison
+CONDITIONALS = {
+    "==": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "!=": operator.ne,
+}
+
+# Matches a single token, naming the token type by the group which matched. A token is a run of characters which aren't
+# whitespace, unless they are within quotes. The alternatives are tried in order, so a token with a quote is a string literal.
+TOKEN_PATTERN = re.compile(r"""
+      (?P<STRING_LITERAL>(?:[^\s"]*"[^"\r\n]*(?:"|$))+[^\s"]*)
+    | (?P<LABEL_DEFINITION>[^\s"\#]*\#[^\s"]*)
+    | (?P<LABEL_START>[^\s":]*:[^\s"]*)
+    | (?P<INT_LITERAL>-?[0-9]+(?=\s|$))
+    | (?P<CONDITIONAL>(?:[=!<>]=|[<>])(?=\s|$))
+    | (?P<OPCODE>[^\sa-z"]*[A-Z][^\sa-z"]*(?=\s|$))
+    | (?P<UNKNOWN>[^\s"]+)
+""", re.VERBOSE)
+
+# Maps the names of the groups in TOKEN_PATTERN to their token type.
+TOKEN_TYPES = {type.name: type for type in TokenType}
+
+# The token types whose tokens are shared between every occurrence of the same value.
+SHARED_TOKEN_TYPES = {TokenType.OPCODE, TokenType.CONDITIONAL}
+
+# Set on a type code in a TokenTable when the value is in the string pool, even though the token is an int literal.
+POOLED_INT_LITERAL = 0x80
+
+class TokenTable(Sequence[Token]):
+    """ A compact, column based store of tokens. The type of each
+    token is kept as a byte, and its value as a machine integer which
+    is either the value of an int literal or the index of the value in
+    a pool of strings, so each distinct string is only stored once.
+    Tokens are recreated when they're accessed.
+    """
+    def __init__(self, tokens: Iterable[Token] = ()):
+        self.types = array("B")
+        
+        self.values = array("q")
+        
+        self.strings: list[str] = []
+        
+        # Maps each string in the pool to its index.
+        self._string_indexes: dict[str, int] = {}
+        
+        self.extend(tokens)
+        
+    def __len__(self) -> int:
+        return len(self.types)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        type_code = self.types[index]
+        
+        value = self.values[index]
+        
+        if type_code == TokenType.INT_LITERAL.value:
+            return Token(str(value), TokenType.INT_LITERAL)
+        
+        return Token(self.strings[value], TokenType(type_code & ~POOLED_INT_LITERAL))
+    
+    def append(self, token: Token):
+        """ Adds a token to the end of the table.
+
+        Args:
+            token (Token): the token to add.
+        """
+        type_code = token.type.value
+        
+        if type_code == TokenType.INT_LITERAL.value:
+            value = int(token.value)
+            
+            # Ints are only stored inline if they fit and recreate the same value, such as 7 but not 007.
+            if -2 ** 63 <= value < 2 ** 63 and str(value) == token.value:
+                self.types.append(type_code)
+                
+                self.values.append(value)
+                
+                return
+            
+            type_code |= POOLED_INT_LITERAL
+            
+        string_index = self._string_indexes.get(token.value)
+        
+        if string_index is None:
+            string_index = self._string_indexes[token.value] = len(self.strings)
+            
+            self.strings.append(token.value)
+            
+        self.types.append(type_code)
+        
+        self.values.append(string_index)
+        
+    def extend(self, tokens: Iterable[Token]):
+        """ Adds tokens to the end of the table.
+
+        Args:
+            tokens (Iterable[Token]): the tokens to add.
+        """
+        for token in tokens:
+            self.append(token)
+            
+    def get_tokens_by_type(self, type: TokenType) -> list[Token]:
+        """ Gets a list of tokens by their type, only
+        recreating the tokens which match.
+
+        Args:
+            type (TokenType): the type of token to search for.
+
+        Returns:
+            list[Token]: the list of tokens that matched the search.
+        """
+        type_codes = {type.value, type.value | POOLED_INT_LITERAL}
+        
+        return [self[index] for index, type_code in enumerate(self.types) if type_code in type_codes]
      
 class GoofyTokenizer:
     """ Responsible for tokenizing
@@ -30,10 +154,15 @@ class GoofyTokenizer:
     types and values associated with them.
     """
 
-    def __init__(self, file_lines: list[str]):
-        self.file_lines: list[str] = file_lines
+    def __init__(self, file_lines: Iterable[str], compact: bool = False):
+        # Any iterable of lines, including an open file, which is read lazily when tokenizing.
+        self.file_lines: Iterable[str] = file_lines
         
-        self.tokens: list[Token] = []
+        # A TokenTable takes a few bytes per token, for tokenizing large programs.
+        self.tokens: list[Token] | TokenTable = TokenTable() if compact else []
+        
+        # The token shared by every occurrence of each opcode and conditional.
+        self._shared_tokens: dict[str, Token] = {}
         
     def __str__(self):
         return "Tokens:\n" + "\n".join(f"{i + 1}: Value = {token.value} Type = {token.type.name}" for i, token in enumerate(self.tokens))
@@ -48,73 +177,50 @@ class GoofyTokenizer:
         Returns:
             TokenType: the token type derived from the provided statement.
         """
-        type = TokenType.UNKNOWN
-        
-        if str.__contains__(statement, "#") and not str.__contains__(statement, "\""):
-            type = TokenType.LABEL_DEFINITION
-            
-        elif str.__contains__(statement, ":") and not str.__contains__(statement, "\""):
-            type = TokenType.LABEL_START
-            
-        elif str.isupper(statement):
-            type = TokenType.OPCODE
-            
-        elif str.isnumeric(statement.lstrip('-')):
-            type = TokenType.INT_LITERAL
-            
-        elif str.__contains__(statement, "\""):
-            type = TokenType.STRING_LITERAL
-            
-        elif statement in CONDITIONALS:
-            type = TokenType.CONDITIONAL
+        match = TOKEN_PATTERN.fullmatch(statement)
         
-        return type
+        return TokenType[match.lastgroup] if match else TokenType.UNKNOWN
     
     def get_tokens_by_type(self, type: TokenType) -> list[Token]:
         """ Gets a list of tokens by their type from
         the tokenized list
 
         Args:
-            token_list (Token): the list of tokens to search on.
+            type (TokenType): the type of token to search for.
 
         Returns:
             list[Token]: the list of tokens that matched the search.
         """
-        return [token for token in self.tokens if token.type == type]
+        if isinstance(self.tokens, TokenTable):
+            return self.tokens.get_tokens_by_type(type)
         
-    def parse_statement_with_quotes(self, statement: str) -> list[str]:
-        """ For parsing a statement which contains quotes
-        to account for spaces.
-
-        Args:
-            statement (str): the statement to parse
+        return [token for token in self.tokens if token.type == type]
+    
+    def iter_tokens(self) -> Iterator[Token]:
+        """ Derives the tokens from the goofy lang file one
+        line at a time, yielding each token as soon as it's
+        scanned. Neither the lines nor the tokens are kept, so
+        large files can be tokenized without holding them in memory.
 
-        Returns:
-            list[str]: the list of statement parts that have been parsed accounting for quotes
+        Yields:
+            Token: the next token derived from the goofy lang file.
         """
-        parts = []
-        
-        quote = False
-    
-        current_part = ""
-        
-        for character in statement:
-            if character == "\"":
-                quote = not quote
-            
-            if not quote:
-                if str.isspace(character):
-                    parts.append(current_part)
-                    
-                    current_part = ""
+        for line in self.file_lines:
+            # Each token is classified by the alternative of the pattern which slices it out, so it's only scanned once.
+            for match in TOKEN_PATTERN.finditer(line):
+                type = TOKEN_TYPES[match.lastgroup]
+                
+                if type not in SHARED_TOKEN_TYPES:
+                    yield Token(match.group(), type)
                     
                     continue
-            
-            current_part += character
-            
-        parts.append(current_part)  
-        
-        return parts
+                
+                token = self._shared_tokens.get(match.group())
+                
+                if token is None:
+                    token = self._shared_tokens[match.group()] = Token(sys.intern(match.group()), type)
+                    
+                yield token
             
     def tokenize(self) -> list[Token]:
         """ Derives a list of tokens from the goofy lang file
@@ -123,26 +229,6 @@ class GoofyTokenizer:
         Returns:
             list[Token]: the list of derived tokens from the goofy lang file.
         """
-        parsed_statements = []
-        
-        for line in self.file_lines:
-            # NOTE: If more tokens require this kind of granular parsing, should switch the entire tokenizer to looking at characters.
-            if line.__contains__("\""):
-                statement_parts = self.parse_statement_with_quotes(line)
-            else:
-                statement_parts = line.split() 
-            
-            parsed_statements.extend(statement_parts)
-        
-        for statement in parsed_statements:
-            token_value = statement
-            
-            token_type = self.get_token_type(statement)
-           
-            current_token = Token(token_value, token_type)
-            
-            self.tokens.append(current_token)
+        self.tokens.extend(self.iter_tokens())
             
         return self.tokens
-    
-    
\ No newline at end of file
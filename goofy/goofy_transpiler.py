@@ -0,0 +1,347 @@
+from goofy.goofy_cache import GoofyCache
+from goofy.goofy_compiler import Instruction, Opcode
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_output import OutputSink
+from goofy.goofy_tokenizer import CONDITIONALS
+from types import CodeType
+import argparse
+import logging
+import marshal
+import os
+
+LOGGER = logging.getLogger(__name__)
+
+# The version of the generated python. Bump it whenever transpiling the same instructions could give different code.
+TRANSPILER_VERSION = 1
+
+# Transpiled programs are cached next to the compiled ones, see GoofyCache.
+CODE_EXTENSION_NAME = ".goofypy"
+
+# Starts every cached code object, so a compiled program is never mistaken for one.
+CODE_MAGIC = b"GOOFYPY\n"
+
+# Maps each comparison function back to the conditional it was bound from, to write it into the generated python.
+CONDITIONAL_SYMBOLS = {function: symbol for symbol, function in CONDITIONALS.items()}
+
+# The python operator each arithmetic opcode is transpiled to. SNIP is transpiled separately as it can divide by zero.
+ARITHMETIC_OPERATORS = {
+    Opcode.YEET: "-",
+    Opcode.GLUE: "+",
+    Opcode.MOOSH: "*",
+}
+
+# Names the opcodes in the comments of the generated python. Registered opcodes are named by their code.
+OPCODE_NAMES = {opcode.value: opcode.name for opcode in Opcode}
+
+def get_block_starts(instructions: list[Instruction]) -> list[int]:
+    """ Gets the index of the first instruction of each block, which
+    are the only places execution can jump to. Every BOUNCE target
+    starts a block, as does the instruction after every BOUNCE.
+
+    Args:
+        instructions (list[Instruction]): the compiled instructions.
+
+    Returns:
+        list[int]: the sorted indexes, always starting with 0.
+    """
+    starts = {0}
+
+    for index, instruction in enumerate(instructions):
+        if instruction.opcode == Opcode.BOUNCE:
+            starts.update((instruction.target, index + 1))
+
+    return sorted(start for start in starts if start < len(instructions))
+
+def transpile_instruction(index: int, instruction: Instruction) -> list[str]:
+    """ Transpiles a single instruction into the lines of python which
+    execute it, without indentation. Whenever the instruction would fail,
+    the generated python returns its index, so the interpreter runs it
+    and reports the error exactly as it always does.
+
+    Args:
+        index (int): the index of the instruction.
+        instruction (Instruction): the instruction.
+
+    Returns:
+        list[str]: the lines of python.
+    """
+    opcode = instruction.opcode
+
+    operand = instruction.operand
+
+    if opcode == Opcode.SHOVE:
+        return [f"append({operand!r})"]
+
+    if opcode == Opcode.YELL:
+        return [f"write({operand!r})"]
+
+    if opcode == Opcode.BOUNCE:
+        return [f"if not stack:", f"    return {index}",
+                f"if stack[-1] {CONDITIONAL_SYMBOLS[instruction.conditional]} {operand!r}:", f"    block = {instruction.target}", "    continue"]
+
+    if opcode in ARITHMETIC_OPERATORS or opcode == Opcode.SNIP:
+        if operand is not None:
+            # Dividing by an immediate zero always fails, once the stack is checked.
+            if opcode == Opcode.SNIP and operand == 0:
+                return [f"return {index}"]
+
+            lines = ["if not stack:", f"    return {index}"]
+
+            if opcode == Opcode.SNIP:
+                return lines + [f"append(int(pop() / {operand!r}))"]
+
+            return lines + [f"append(pop() {ARITHMETIC_OPERATORS[opcode]} {operand!r})"]
+
+        if opcode == Opcode.SNIP:
+            return ["if len(stack) < 2 or stack[-2] == 0:", f"    return {index}", "first = pop()", "append(int(first / pop()))"]
+
+        return ["if len(stack) < 2:", f"    return {index}", f"append(pop() {ARITHMETIC_OPERATORS[opcode]} pop())"]
+
+    # Anything else, such as SNOOP, FREEZE, a FAULT or a registered opcode, is dispatched to its handler.
+    # If the handler moves the index, the interpreter carries on from wherever it moved to.
+    return [f"interpreter.index = {index + 1}",
+            f"if not handlers[{int(opcode)}](interpreter, instructions[{index}]):", "    return -1",
+            f"if interpreter.index != {index + 1}:", "    return interpreter.index"]
+
+def transpile(instructions: list[Instruction]) -> str:
+    """ Transpiles compiled instructions into the source of a single
+    python function, called program. Each block of instructions runs
+    straight through, and BOUNCE sets the block to run next, so the
+    whole program is a while loop over a block counter.
+
+    The function is called with the interpreter, its stack, its
+    instructions, its dispatch table and its output's write. It
+    returns the index for the interpreter to carry on from, which is
+    the number of instructions when the program ran to the end, or -1
+    if a handler it dispatched to was unsuccessful.
+
+    Args:
+        instructions (list[Instruction]): the compiled instructions.
+
+    Returns:
+        str: the source of the function.
+    """
+    lines = ["def program(interpreter, stack, instructions, handlers, write):",
+             "    pop = stack.pop", "    append = stack.append", "    block = 0", "    while True:"]
+
+    starts = get_block_starts(instructions)
+
+    for position, start in enumerate(starts):
+        end = starts[position + 1] if position + 1 < len(starts) else len(instructions)
+
+        # Each block falls through into the next one, which is checked next.
+        lines.append(f"        if block == {start}:")
+
+        for index in range(start, end):
+            lines.append(f"            # {index}: {OPCODE_NAMES.get(instructions[index].opcode, instructions[index].opcode)}")
+
+            lines += [f"            {line}" for line in transpile_instruction(index, instructions[index])]
+
+        lines.append(f"            block = {end}")
+
+    lines.append(f"        return {len(instructions)}")
+
+    return "\n".join(lines) + "\n"
+
+def run_code(interpreter: GoofyInterpreter, code: CodeType) -> bool:
+    """ Runs a transpiled program with an interpreter, which must have
+    the instructions it was transpiled from loaded. Wherever the program
+    stops early, the interpreter carries on from there, so errors are
+    reported exactly as they would be by the interpreter alone.
+
+    Args:
+        interpreter (GoofyInterpreter): the interpreter, with the program loaded.
+        code (CodeType): the code object, see GoofyTranspiler.transpile.
+
+    Returns:
+        bool: whether running the program was successful or not.
+    """
+    instructions = interpreter.instructions
+
+    # Pushing onto a typed stack can overflow, which only the handlers deal with.
+    if type(interpreter._stack) is not list:
+        return interpreter.execute(instructions)
+
+    namespace = {}
+
+    exec(code, namespace)
+
+    # The output is only written once the program stops, after any error is reported, just as it is by execute.
+    try:
+        index = namespace["program"](interpreter, interpreter._stack, instructions, interpreter.handlers, interpreter.output.write)
+
+    except BaseException:
+        interpreter.output.flush()
+
+        raise
+
+    if index == -1:
+        interpreter.output.flush()
+
+        return False
+
+    interpreter.index = index
+
+    return interpreter.execute(instructions)
+
+class GoofyTranspiler:
+    """ Responsible for transpiling goofy lang files into python
+    and caching the compiled code object on disk, next to the
+    compiled program in the cache directory. The cached code is
+    keyed by the same hash of the source as the compiled program.
+    """
+    def __init__(self, cache: GoofyCache | None = None):
+        self.cache = cache if cache is not None else GoofyCache()
+
+    def get_code_path(self, file: str) -> str:
+        """ Gets the path a goofy lang file's transpiled code is cached at.
+
+        Args:
+            file (str): the path of the goofy lang file.
+
+        Returns:
+            str: the path of the cached code.
+        """
+        return os.path.splitext(self.cache.get_cache_path(file))[0] + CODE_EXTENSION_NAME
+
+    def get_key(self, file: str) -> bytes:
+        """ Derives the key a goofy lang file's transpiled code is cached under.
+
+        Args:
+            file (str): the path of the goofy lang file.
+
+        Returns:
+            bytes: the key, which changes whenever the key of the compiled program or the transpiler version does.
+        """
+        return self.cache.get_key(file) + TRANSPILER_VERSION.to_bytes(4, "little")
+
+    def load(self, file: str, key: bytes) -> CodeType | None:
+        """ Loads the code cached for a goofy lang file.
+
+        Args:
+            file (str): the path of the goofy lang file.
+            key (bytes): the key the code must be cached under, see get_key.
+
+        Returns:
+            CodeType | None: the code, or None if nothing is cached under the key.
+        """
+        code_path = self.get_code_path(file)
+
+        try:
+            with open(code_path, "rb") as code_file:
+                data = code_file.read()
+
+            header_length = len(CODE_MAGIC) + len(key)
+
+            if data[:header_length] != CODE_MAGIC + key:
+                return None
+
+            return marshal.loads(data[header_length:])
+
+        except (OSError, ValueError, EOFError, TypeError) as error:
+            LOGGER.debug("Could not load cached code %s: %s", code_path, error)
+
+            return None
+
+    def store(self, file: str, key: bytes, code: CodeType):
+        """ Caches the transpiled code for a goofy lang file. Failing
+        to write the cache isn't an error, the file is just transpiled
+        again next time.
+
+        Args:
+            file (str): the path of the goofy lang file.
+            key (bytes): the key to cache the code under, see get_key.
+            code (CodeType): the code.
+        """
+        code_path = self.get_code_path(file)
+
+        temporary_path = f"{code_path}.{os.getpid()}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(code_path), exist_ok=True)
+
+            with open(temporary_path, "wb") as code_file:
+                code_file.write(CODE_MAGIC + key + marshal.dumps(code))
+
+            os.replace(temporary_path, code_path)
+
+        except OSError as error:
+            LOGGER.warning("Could not cache the transpiled code at %s: %s", code_path, error)
+
+    def transpile(self, interpreter: GoofyInterpreter, file: str) -> CodeType | None:
+        """ Compiles a goofy lang file with the interpreter and transpiles
+        it into a code object, unless both are cached, in which case the
+        file is never tokenized or transpiled.
+
+        Args:
+            interpreter (GoofyInterpreter): the interpreter created with the goofy lang file's lines.
+            file (str): the path of the goofy lang file.
+
+        Returns:
+            CodeType | None: the code, or None if compiling was unsuccessful.
+        """
+        if not self.cache.compile(interpreter, file):
+            return None
+
+        key = self.get_key(file)
+
+        code = self.load(file, key)
+
+        if code is None:
+            code = compile(transpile(interpreter.instructions), file, "exec")
+
+            self.store(file, key, code)
+
+        return code
+
+def parse_arguments(arguments: list[str]) -> argparse.Namespace:
+    """ Parses the command line arguments for goofy compile.
+
+    Args:
+        arguments (list[str]): the command line arguments, without the program name or compile.
+
+    Returns:
+        argparse.Namespace: the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="goofy compile", description="transpile a goofy lang file into python, cache the compiled code and run it")
+
+    parser.add_argument("file", help="the goofy lang file to compile")
+
+    parser.add_argument("--emit", action="store_true", help="print the generated python instead of running it")
+
+    return parser.parse_args(arguments)
+
+def main(arguments: list[str]) -> bool:
+    """ Transpiles a goofy lang file and runs it, or prints the python.
+
+    Args:
+        arguments (list[str]): the command line arguments, without the program name or compile.
+
+    Returns:
+        bool: whether compiling and running the file was successful or not.
+    """
+    arguments = parse_arguments(arguments)
+
+    if not os.path.isfile(arguments.file):
+        LOGGER.info(f"The file you provided does not exist. Did you provide the right file? File at: {arguments.file}")
+
+        return False
+
+    with open(arguments.file, "r", encoding="UTF-8") as file_to_compile:
+        interpreter = GoofyInterpreter(file_to_compile, OutputSink())
+
+        if arguments.emit:
+            if not interpreter.compile():
+                return False
+
+            print(transpile(interpreter.instructions), end="")
+
+            return True
+
+        code = GoofyTranspiler().transpile(interpreter, arguments.file)
+
+    success = code is not None and run_code(interpreter, code)
+
+    LOGGER.info(interpreter.stack)
+
+    return success
@@ -1,7 +1,23 @@
+import argparse
+import os
 import sys
 import logging
 
+from goofy.goofy_batch import main as batch_main
+from goofy.goofy_budget import Budget
+from goofy.goofy_cache import GoofyCache, CACHE_DIRECTORY_NAME
+from goofy.goofy_cfg import BlockInterpreter, ControlFlowGraph
+from goofy.goofy_client import main as client_main
+from goofy.goofy_compiler import disassemble
+from goofy.goofy_daemon import serve_main
+from goofy.goofy_input import InputSource, MappedFileInput, StreamInput
 from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_jit import TracingInterpreter
+from goofy.goofy_optimizer import GoofyOptimizer
+from goofy.goofy_profiler import GoofyProfiler
+from goofy.goofy_transpiler import main as compile_main
+from goofy.goofy_stack import BoundedStack, OverflowPolicy, StackFactory, int64_stack
+from goofy.goofy_output import FlushPolicy, OutputSink
 
 FILE_EXTENSION_NAME = ".goofy"
 
@@ -20,38 +36,217 @@ def configure_logging():
        ]
     )
 
-def main():
+def parse_arguments(arguments: list[str]) -> argparse.Namespace:
+    """ Parses the command line arguments for goofy lang
+
+    Args:
+        arguments (list[str]): the command line arguments, without the program name.
+
+    Returns:
+        argparse.Namespace: the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="goofy", description="Interprets a goofy lang file.")
+    
+    parser.add_argument("file", nargs="?", help="the goofy lang file to interpret")
+    
+    parser.add_argument("--no-cache", action="store_true", help=f"always compile the file, without reading or writing {CACHE_DIRECTORY_NAME}")
+    
+    parser.add_argument("--clear-cache", action="store_true", help=f"remove the {CACHE_DIRECTORY_NAME} directory next to the file before interpreting it")
+    
+    parser.add_argument("-O", "--optimize", action="store_true", help="fold constant arithmetic, fuse SHOVE into the arithmetic after it and drop unreachable instructions")
+    
+    parser.add_argument("--dump-optimized", action="store_true", help="print the optimized instructions and what was changed, instead of interpreting the file")
+    
+    parser.add_argument("--unbuffered", action="store_true", help="write the output of every YELL straight away, instead of in batches")
+    
+    parser.add_argument("--input", metavar="FILE", help="read the numbers for SNOOP from a file of whitespace separated numbers instead of typing them, or - to read them from piped stdin")
+    
+    parser.add_argument("--profile", nargs="?", const="text", choices=["text", "json"], help="print how many times each opcode ran and how long it took, each label was entered and the hottest instructions to stderr, as text or json")
+    
+    parser.add_argument("--max-instructions", type=int, metavar="N", help="stop the program once it has executed more than N instructions")
+    
+    parser.add_argument("--max-seconds", type=float, metavar="SECONDS", help="stop the program once it has run for more than SECONDS")
+    
+    parser.add_argument("--max-stack", type=int, metavar="N", help="stop the program once its stack holds more than N values")
+    
+    parser.add_argument("--stack", choices=["list", "int64"], default="list", help="hold the stack as python ints, or as 64 bit integers which take 8 bytes each")
+    
+    parser.add_argument("--stack-capacity", type=int, metavar="N", help="allocate a 64 bit stack of N values up front, stopping the program if it would hold more")
+    
+    parser.add_argument("--overflow", choices=["promote", "error"], default="promote", help="when a value doesn't fit in 64 bits, carry on with python ints or stop with an error")
+    
+    parser.add_argument("--jit", action="store_true", help="compile loops into python functions once they've run enough times")
+    
+    parser.add_argument("--jit-stats", action="store_true", help="print how many times each loop jumped back, was compiled and was exited to stderr, implies --jit")
+    
+    parser.add_argument("--blocks", action="store_true", help="execute a whole basic block of instructions per dispatch")
+    
+    parser.add_argument("--dump-cfg", action="store_true", help="print the basic blocks of the file and the jumps between them as a graphviz DOT graph, instead of interpreting the file")
+    
+    parsed = parser.parse_args(arguments)
+    
+    # The profiler runs the instructions itself, so loops are never compiled while profiling.
+    if parsed.profile and (parsed.jit or parsed.jit_stats):
+        parser.error("--jit and --jit-stats can't be used with --profile")
+    
+    # The profiler runs the instructions itself, without tracking a budget.
+    if parsed.profile and any(limit is not None for limit in (parsed.max_instructions, parsed.max_seconds, parsed.max_stack)):
+        parser.error("--profile can't be used with --max-instructions, --max-seconds or --max-stack")
+    
+    if parsed.blocks and (parsed.jit or parsed.jit_stats):
+        parser.error("--blocks can't be used with --jit or --jit-stats")
+    
+    return parsed
+
+def create_stack_factory(arguments: argparse.Namespace) -> StackFactory:
+    """ Creates what the interpreter creates its stack with.
+
+    Args:
+        arguments (argparse.Namespace): the parsed arguments.
+
+    Returns:
+        StackFactory: creates the stack.
+    """
+    if arguments.stack_capacity is not None:
+        return lambda: BoundedStack(arguments.stack_capacity)
+    
+    return int64_stack if arguments.stack == "int64" else list
+
+def create_input_source(path: str | None) -> InputSource | None:
+    """ Creates the input source SNOOP reads from.
+
+    Args:
+        path (str | None): the file of numbers to read, - for stdin or None to read lines typed into stdin.
+
+    Returns:
+        InputSource | None: the input source, or None for the interpreter's default.
+    """
+    if path is None:
+        return None
+    
+    # Piped numbers are read in bulk rather than a line at a time.
+    if path == "-":
+        return StreamInput(sys.stdin.buffer)
+    
+    return MappedFileInput(path)
+
+def main(arguments: list[str] | None = None):
     configure_logging()
     
-    if len(sys.argv) < 2:
+    arguments = sys.argv[1:] if arguments is None else arguments
+    
+    # goofy batch <paths> runs many files at once, see goofy_batch.
+    if arguments[:1] == ["batch"]:
+        batch_main(arguments[1:])
+        
+        return
+    
+    # goofy compile <file> transpiles the file into python and runs it, see goofy_transpiler.
+    if arguments[:1] == ["compile"]:
+        compile_main(arguments[1:])
+        
+        return
+    
+    # goofy serve starts a daemon which goofy client <file> runs files with, see goofy_daemon.
+    if arguments[:1] == ["serve"]:
+        serve_main(arguments[1:])
+        
+        return
+    
+    if arguments[:1] == ["client"]:
+        sys.exit(client_main(arguments[1:]))
+    
+    arguments = parse_arguments(arguments)
+    
+    if arguments.file is None:
         LOGGER.info("Goofy lang file was not provided\nUsage: python3 goofy.py <goofy_file>")
         
         return
     
-    if not sys.argv[1].__contains__(FILE_EXTENSION_NAME):
+    if not arguments.file.__contains__(FILE_EXTENSION_NAME):
         LOGGER.info("The file you provided is not a valid goofy lang file. Please provide a file with the .goofy extension.")
         
         return
     
-    file = sys.argv[1]
+    file = arguments.file
+    
+    if os.path.getsize(file) == 0:
+        LOGGER.warning(f"The file you provided has no content. Did you provide the right file? File at: {file}")
+        
+        return
     
-    # Probably better to read and process at the same time for larger files. but for this language it's okay
-    file_lines = []
+    if arguments.input not in (None, "-") and not os.path.isfile(arguments.input):
+        LOGGER.info(f"The input file you provided does not exist. Did you provide the right file? File at: {arguments.input}")
+        
+        return
     
+    if arguments.clear_cache:
+        GoofyCache().clear(file)
+    
+    # The file is read as it's interpreted, so large files are never held in memory as a whole.
     with open(file, "r", encoding="UTF-8") as file_to_intrepret:
-        while current_line := file_to_intrepret.readline():
-            file_lines.append(current_line.strip())
+        output = OutputSink(flush_policy=FlushPolicy.EVERY_YELL if arguments.unbuffered else FlushPolicy.EVERY_N_BYTES)
         
-    if len(file_lines) == 0:
-        LOGGER.warning(f"The file you provided has no content. Did you provide the right file? File at: {file}")
+        interpreter_class = GoofyInterpreter
         
-        return
+        if arguments.jit or arguments.jit_stats:
+            interpreter_class = TracingInterpreter
+            
+        elif arguments.blocks:
+            interpreter_class = BlockInterpreter
+        
+        interpreter = interpreter_class(file_to_intrepret, output, create_input_source(arguments.input),
+                                        create_stack_factory(arguments), OverflowPolicy[arguments.overflow.upper()])
+        
+        # A cached program is loaded without the file ever being tokenized.
+        if arguments.no_cache:
+            compiled = interpreter.compile()
+        else:
+            compiled = GoofyCache(interpreter.opcodes).compile(interpreter, file)
     
-    interpreter = GoofyInterpreter(file_lines)
+        if compiled and (arguments.optimize or arguments.dump_optimized):
+            optimizer = GoofyOptimizer(interpreter.instructions)
+            
+            interpreter.instructions = optimizer.optimize()
+            
+            if arguments.dump_optimized:
+                print(disassemble(interpreter.instructions, interpreter.opcodes))
+                
+                print(f"\n{len(optimizer.changes)} changes:")
+                
+                print("\n".join(optimizer.changes))
+                
+                return
     
-    success = interpreter.interpret()
+        if compiled and arguments.dump_cfg:
+            # The optimized instructions no longer start where the labels were compiled to, so the blocks go unnamed.
+            graph = ControlFlowGraph(interpreter.instructions, interpreter.labels if not arguments.optimize else None)
+            
+            print(graph.to_dot(interpreter.opcodes))
+            
+            return
+        
+        if compiled and arguments.profile:
+            # The optimized instructions no longer start where the labels were compiled to, so they go unnamed.
+            profiler = GoofyProfiler(interpreter.labels if not arguments.optimize else None)
+            
+            success = profiler.execute(interpreter, interpreter.instructions)
+            
+            print(profiler.format_json() if arguments.profile == "json" else profiler.format_text(), file=sys.stderr)
+            
+        else:
+            limits = (arguments.max_instructions, arguments.max_seconds, arguments.max_stack)
+            
+            budget = Budget(*limits) if any(limit is not None for limit in limits) else None
+            
+            success = compiled and interpreter.execute(interpreter.instructions, budget)
+            
+            if arguments.jit_stats:
+                print(interpreter.format_loops(), file=sys.stderr)
+        
+        interpreter.input_source.close()
     
     LOGGER.info(interpreter.stack)
     
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
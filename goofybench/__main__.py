@@ -0,0 +1,5 @@
+import sys
+
+from goofybench.runner import main
+
+sys.exit(main())
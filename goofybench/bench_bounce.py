@@ -0,0 +1,52 @@
+import sys
+import timeit
+
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_compiler import Instruction
+from goofy.goofy_tokenizer import CONDITIONALS
+from goofybench.workloads import countdown
+
+DEFAULT_ITERATIONS = 100_000
+
+# Maps each comparison function back to the conditional it was bound from.
+CONDITIONAL_SYMBOLS = {function: symbol for symbol, function in CONDITIONALS.items()}
+
+class EvalBounceInterpreter(GoofyInterpreter):
+    """ Interprets BOUNCE the way it was done before comparisons
+    were bound at compile time, by formatting and evaluating the
+    comparison on every jump. Used as the baseline to compare against.
+    """
+    def interpret_bounce(self, instruction: Instruction) -> bool:
+        if eval(f"{self.get_stack_top()} {CONDITIONAL_SYMBOLS[instruction.conditional]} {instruction.operand}"):
+            self._index = instruction.target
+
+        return True
+
+def time_interpreter(interpreter_type: type[GoofyInterpreter], iterations: int) -> float:
+    """ Times how long an interpreter takes to run the countdown loop.
+
+    Args:
+        interpreter_type (type[GoofyInterpreter]): the interpreter class to time.
+        iterations (int): the number of times the loop body runs.
+
+    Returns:
+        float: the best time in seconds out of three runs.
+    """
+    lines = countdown(iterations).lines
+
+    return min(timeit.repeat(lambda: interpreter_type(lines).interpret(), number=1, repeat=3))
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS
+
+    eval_time = time_interpreter(EvalBounceInterpreter, iterations)
+
+    operator_time = time_interpreter(GoofyInterpreter, iterations)
+
+    print(f"BOUNCE countdown loop, {iterations} iterations")
+    print(f"eval comparison:     {eval_time:.4f}s")
+    print(f"operator comparison: {operator_time:.4f}s")
+    print(f"speedup:             {eval_time / operator_time:.1f}x")
+
+if __name__ == '__main__':
+    main()
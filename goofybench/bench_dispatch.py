@@ -0,0 +1,100 @@
+import sys
+import timeit
+
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_compiler import GoofyCompiler, Instruction, Opcode
+from goofybench.workloads import countdown, straight_line
+
+DEFAULT_INSTRUCTIONS = 100_000
+
+class MatchDispatchInterpreter(GoofyInterpreter):
+    """ Executes instructions by matching the opcode against
+    each case in turn, the way it was done before the dispatch
+    table. Used as the baseline to compare against.
+    """
+    def execute(self, instructions: list[Instruction]) -> bool:
+        self.instructions = instructions
+
+        instruction_count = len(instructions)
+
+        while self._index < instruction_count:
+            instruction = instructions[self._index]
+
+            self._index += 1
+
+            match instruction.opcode:
+                case Opcode.SHOVE:
+                    success = self.interpret_shove(instruction)
+
+                case Opcode.YELL:
+                    success = self.interpret_yell(instruction)
+
+                case Opcode.SNOOP:
+                    success = self.interpret_snoop(instruction)
+
+                case Opcode.YEET:
+                    success = self.interpret_yeet(instruction)
+
+                case Opcode.GLUE:
+                    success = self.interpret_glue(instruction)
+
+                case Opcode.MOOSH:
+                    success = self.interpret_moosh(instruction)
+
+                case Opcode.SNIP:
+                    success = self.interpret_snip(instruction)
+
+                case Opcode.BOUNCE:
+                    success = self.interpret_bounce(instruction)
+
+                case Opcode.FREEZE:
+                    return self.interpret_freeze(instruction)
+
+                case _:
+                    success = self.interpret_fault(instruction)
+
+            if not success:
+                return False
+
+        return True
+
+def time_execute(interpreter_type: type[GoofyInterpreter], lines: list[str]) -> float:
+    """ Times how long an interpreter takes to execute a program,
+    leaving out the time taken to tokenize and compile it.
+
+    Args:
+        interpreter_type (type[GoofyInterpreter]): the interpreter class to time.
+        lines (list[str]): the lines of the goofy program.
+
+    Returns:
+        float: the best time in seconds out of three runs.
+    """
+    timings = []
+
+    for _ in range(3):
+        interpreter = interpreter_type(lines)
+
+        compiler = GoofyCompiler(interpreter.tokenizer.iter_tokens())
+
+        instructions = compiler.compile()
+
+        compiler.resolve_labels()
+
+        timings.append(timeit.timeit(lambda: interpreter.execute(instructions), number=1))
+
+    return min(timings)
+
+def main():
+    instructions = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_INSTRUCTIONS
+
+    print(f"Opcode dispatch, {instructions} instructions")
+
+    for workload in [straight_line(instructions // 2), countdown(instructions // 2)]:
+        match_time = time_execute(MatchDispatchInterpreter, workload.lines)
+
+        table_time = time_execute(GoofyInterpreter, workload.lines)
+
+        print(f"{workload.name}: match chain {match_time:.4f}s, dispatch table {table_time:.4f}s, speedup {match_time / table_time:.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import sys
+import time
+
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_scheduler import GoofyScheduler
+from goofybench.workloads import countdown
+
+DEFAULT_PROGRAMS = 100
+
+DEFAULT_ITERATIONS = 10_000
+
+SLICE_LENGTHS = (10, 100, 1000, 10_000)
+
+# Each time is the best of this many runs, as the difference being measured is small.
+REPEAT = 5
+
+def time_sequential(program, count: int) -> float:
+    """ Times running the programs one after the other.
+
+    Args:
+        program (Program): the compiled program.
+        count (int): the number of times to run it.
+
+    Returns:
+        float: the time in seconds.
+    """
+    interpreters = [GoofyInterpreter.from_program(program) for _ in range(count)]
+
+    started = time.perf_counter()
+
+    for interpreter in interpreters:
+        interpreter.execute(interpreter.instructions)
+
+    return time.perf_counter() - started
+
+def time_scheduled(program, count: int, slice_length: int) -> GoofyScheduler:
+    """ Runs the programs interleaved by a scheduler.
+
+    Args:
+        program (Program): the compiled program.
+        count (int): the number of times to run it.
+        slice_length (int): the number of instructions in each turn.
+
+    Returns:
+        GoofyScheduler: the scheduler, which holds the time taken and the number of turns.
+    """
+    scheduler = GoofyScheduler(slice_length)
+
+    for _ in range(count):
+        scheduler.add(program)
+
+    scheduler.run()
+
+    return scheduler
+
+def main():
+    programs = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PROGRAMS
+
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ITERATIONS
+
+    interpreter = GoofyInterpreter(countdown(iterations).lines)
+
+    interpreter.compile()
+
+    sequential_time = min(time_sequential(interpreter.program, programs) for _ in range(REPEAT))
+
+    print(f"{programs} countdown loops of {iterations} iterations")
+    print(f"sequential: {sequential_time:.4f}s")
+
+    for slice_length in SLICE_LENGTHS:
+        scheduler = min((time_scheduled(interpreter.program, programs, slice_length) for _ in range(REPEAT)), key=lambda scheduler: scheduler.elapsed)
+
+        # Whatever the scheduled run took over the sequential run is the cost of taking turns.
+        overhead = (scheduler.elapsed - sequential_time) / scheduler.turns
+
+        mean_latency = sum(scheduled.latency for scheduled in scheduler.programs) / programs
+
+        print(f"slice {slice_length:>6}: {scheduler.elapsed:.4f}s, {scheduler.turns} turns, {overhead * 1e9:>8.0f} ns overhead per turn, "
+              f"{mean_latency:.4f}s mean latency")
+
+if __name__ == '__main__':
+    main()
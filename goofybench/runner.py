@@ -0,0 +1,210 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofybench.workloads import WORKLOADS, create_workload
+
+# Timings shorter than this aren't compared, as they're mostly noise.
+NOISE_FLOOR_SECONDS = 0.005
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where peak RSS isn't reported.
+    resource = None
+
+def get_peak_rss() -> int | None:
+    """ Gets the peak resident set size of the current process.
+
+    Returns:
+        int | None: the peak RSS in bytes, or None if it can't be measured on this platform.
+    """
+    if resource is None:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+def measure(name: str, scale: float, repeat: int) -> dict:
+    """ Measures a workload, taking the best of a number of runs.
+    Called in a fresh process for each workload, so the peak RSS
+    belongs to that workload alone.
+
+    Args:
+        name (str): the name of the workload.
+        scale (float): the multiplier for the workload's default size.
+        repeat (int): the number of runs to take the best timings from.
+
+    Returns:
+        dict: the measurements of the workload.
+    """
+    workload = create_workload(name, scale)
+
+    compile_times = []
+
+    execute_times = []
+
+    # YELL output would swamp the results, and writing it to a terminal isn't what's being measured.
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for _ in range(repeat):
+            interpreter = GoofyInterpreter(workload.lines)
+
+            start = time.perf_counter()
+
+            compiled = interpreter.compile()
+
+            compiled_at = time.perf_counter()
+
+            success = compiled and interpreter.execute(interpreter.instructions)
+
+            executed_at = time.perf_counter()
+
+            if not success:
+                raise RuntimeError(f"Workload {name} failed to interpret")
+
+            compile_times.append(compiled_at - start)
+
+            execute_times.append(executed_at - compiled_at)
+
+    compile_seconds = min(compile_times)
+
+    execute_seconds = min(execute_times)
+
+    return {
+        "instructions_executed": workload.instructions_executed,
+        "compile_seconds": compile_seconds,
+        "execute_seconds": execute_seconds,
+        "ops_per_second": workload.instructions_executed / execute_seconds,
+        "ns_per_instruction": execute_seconds * 1e9 / workload.instructions_executed,
+        "peak_rss_bytes": get_peak_rss(),
+    }
+
+def run(names: list[str], scale: float, repeat: int) -> dict:
+    """ Runs the workloads, each in its own process.
+
+    Args:
+        names (list[str]): the names of the workloads to run.
+        scale (float): the multiplier for each workload's default size.
+        repeat (int): the number of runs of each workload to take the best timings from.
+
+    Returns:
+        dict: the results, ready to be saved as JSON.
+    """
+    results = {}
+
+    # Spawned rather than forked, so no memory from this process counts towards a workload's peak RSS.
+    context = multiprocessing.get_context("spawn")
+
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[name] = executor.submit(measure, name, scale, repeat).result()
+
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "repeat": repeat,
+        "results": results,
+    }
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """ Compares results against a baseline, finding the workloads
+    whose cost per instruction or compile time got worse.
+
+    Args:
+        baseline (dict): the baseline results.
+        current (dict): the results to compare.
+        threshold (float): how much worse a measurement can get before it's a regression. Ex: 0.1 for 10%
+
+    Returns:
+        list[str]: a description of each regression.
+    """
+    regressions = []
+
+    for name, result in current["results"].items():
+        baseline_result = baseline["results"].get(name)
+
+        if baseline_result is None:
+            continue
+
+        for metric, seconds in (("ns_per_instruction", "execute_seconds"), ("compile_seconds", "compile_seconds")):
+            # Anything quicker than the noise floor varies too much between runs to compare.
+            if baseline_result[seconds] < NOISE_FLOOR_SECONDS:
+                continue
+
+            change = result[metric] / baseline_result[metric] - 1
+
+            if change > threshold:
+                regressions.append(f"{name} {metric} regressed by {change:.1%}: {baseline_result[metric]:.6g} -> {result[metric]:.6g}")
+
+    return regressions
+
+def format_results(results: dict) -> str:
+    """ Formats results as a table.
+
+    Args:
+        results (dict): the results to format.
+
+    Returns:
+        str: the formatted results.
+    """
+    lines = [f"{'workload':<16}{'ops/sec':>14}{'ns/instr':>12}{'compile s':>12}{'execute s':>12}{'peak RSS MiB':>14}"]
+
+    for name, result in results["results"].items():
+        peak_rss = "n/a" if result["peak_rss_bytes"] is None else f"{result['peak_rss_bytes'] / 2 ** 20:.1f}"
+
+        lines.append(f"{name:<16}{result['ops_per_second']:>14,.0f}{result['ns_per_instruction']:>12.1f}"
+                     f"{result['compile_seconds']:>12.4f}{result['execute_seconds']:>12.4f}{peak_rss:>14}")
+
+    return "\n".join(lines)
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="goofybench", description="Benchmarks the goofy lang tokenizer and interpreter.")
+
+    parser.add_argument("workloads", nargs="*", help=f"the workloads to run, all of them by default. One of: {', '.join(WORKLOADS)}")
+
+    parser.add_argument("--scale", type=float, default=1.0, help="the multiplier for the size of each workload")
+
+    parser.add_argument("--repeat", type=int, default=3, help="the number of runs of each workload to take the best timings from")
+
+    parser.add_argument("--output", help="the JSON file to save the results to")
+
+    parser.add_argument("--compare", help="a JSON file of earlier results to check for regressions against")
+
+    parser.add_argument("--threshold", type=float, default=0.1, help="how much worse a measurement can get before it's a regression")
+
+    arguments = parser.parse_args(arguments)
+
+    unknown_workloads = set(arguments.workloads) - set(WORKLOADS)
+
+    if unknown_workloads:
+        parser.error(f"unknown workloads: {', '.join(sorted(unknown_workloads))}")
+
+    results = run(arguments.workloads or list(WORKLOADS), arguments.scale, arguments.repeat)
+
+    print(format_results(results))
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="UTF-8") as output:
+            json.dump(results, output, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare, "r", encoding="UTF-8") as baseline:
+            regressions = compare(json.load(baseline), results, arguments.threshold)
+
+        print("\n".join(regressions) if regressions else "No regressions")
+
+        return 1 if regressions else 0
+
+    return 0
@@ -0,0 +1,93 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class Workload:
+    """ Represents a generated goofy program to benchmark,
+    along with how many instructions it executes so timings
+    can be turned into a cost per instruction.
+    """
+    name: str
+    lines: list[str]
+    instructions_executed: int
+
+def countdown(size: int) -> Workload:
+    """ A deep BOUNCE loop which counts down from size to zero.
+
+    Args:
+        size (int): the number of times the loop body runs.
+
+    Returns:
+        Workload: the workload.
+    """
+    lines = [f"SHOVE {size}", "LOOP:", "YEET 1", "BOUNCE > 0 #LOOP"]
+
+    return Workload("countdown", lines, 1 + 2 * size)
+
+def straight_line(size: int) -> Workload:
+    """ A long straight line chain of SHOVE and GLUE.
+
+    Args:
+        size (int): the number of SHOVE and GLUE pairs.
+
+    Returns:
+        Workload: the workload.
+    """
+    lines = ["SHOVE 0"] + ["SHOVE 1 GLUE" for _ in range(size)]
+
+    return Workload("straight_line", lines, 1 + 2 * size)
+
+def long_strings(size: int) -> Workload:
+    """ YELLs of huge string literals, which is mostly tokenizer work.
+
+    Args:
+        size (int): the number of words in each of the hundred literals.
+
+    Returns:
+        Workload: the workload.
+    """
+    literal = " ".join(f"word{i}" for i in range(size))
+
+    lines = [f"YELL \"{literal}\"" for _ in range(100)]
+
+    return Workload("long_strings", lines, 100)
+
+def many_labels(size: int) -> Workload:
+    """ Thousands of labels, each BOUNCE jumping to the next one.
+
+    Args:
+        size (int): the number of labels jumped through.
+
+    Returns:
+        Workload: the workload.
+    """
+    lines = []
+
+    for i in range(size):
+        lines.extend([f"L{i}:", "SHOVE 1", f"BOUNCE > 0 #L{i + 1}"])
+
+    lines.append(f"L{size}:")
+
+    return Workload("many_labels", lines, 2 * size)
+
+# Maps each workload name to the function which generates it and its default size.
+WORKLOADS: dict[str, tuple[Callable[[int], Workload], int]] = {
+    "countdown": (countdown, 200_000),
+    "straight_line": (straight_line, 100_000),
+    "long_strings": (long_strings, 20_000),
+    "many_labels": (many_labels, 20_000),
+}
+
+def create_workload(name: str, scale: float = 1.0) -> Workload:
+    """ Generates a workload at its default size multiplied by the scale.
+
+    Args:
+        name (str): the name of the workload, see WORKLOADS.
+        scale (float): the multiplier for the default size.
+
+    Returns:
+        Workload: the workload.
+    """
+    generate, size = WORKLOADS[name]
+
+    return generate(max(1, int(size * scale)))
@@ -0,0 +1,9 @@
+from goofy.goofy_compiler import Program
+from goofy.goofy_interpreter import GoofyInterpreter
+
+def compile_program(lines: list[str]) -> Program:
+    interpreter = GoofyInterpreter(lines)
+    
+    assert interpreter.compile()
+    
+    return interpreter.program
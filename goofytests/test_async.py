@@ -0,0 +1,82 @@
+import asyncio
+import io
+
+from goofy.goofy_async import AsyncOutputSink, AsyncStreamInput
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_output import OutputSink
+from goofytests.helpers import compile_program
+
+PROGRAM_LINES = ["YELL \"number?\" SNOOP MOOSH 2 YELL \"doubled\""]
+
+def test_interpreter_run_async_reads_stream():
+    async def run():
+        reader = asyncio.StreamReader()
+        
+        reader.feed_data(b"21\n")
+        
+        reader.feed_eof()
+        
+        stream = io.BytesIO()
+        
+        interpreter = GoofyInterpreter.from_program(compile_program(PROGRAM_LINES))
+        
+        success = await interpreter.run_async(input_source=AsyncStreamInput(reader), output=OutputSink(stream))
+        
+        return success, interpreter.stack, stream.getvalue()
+        
+    assert asyncio.run(run()) == (True, [42], b"number?\ndoubled\n")
+    
+def test_interpreter_run_async_no_input():
+    interpreter = GoofyInterpreter(["SNOOP"])
+    
+    interpreter.compile()
+    
+    assert asyncio.run(interpreter.run_async(output=OutputSink(io.BytesIO()))) == False
+    
+def test_interpreter_run_async_sessions_over_socket(tmp_path):
+    program = compile_program(PROGRAM_LINES)
+    
+    path = str(tmp_path / "goofy.sock")
+    
+    async def session(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        interpreter = GoofyInterpreter.from_program(program)
+        
+        await interpreter.run_async(input_source=AsyncStreamInput(reader), output=AsyncOutputSink(writer))
+        
+        writer.close()
+        
+        await writer.wait_closed()
+        
+    async def client(number: int) -> bytes:
+        reader, writer = await asyncio.open_unix_connection(path)
+        
+        # The prompt arrives before SNOOP waits for the number.
+        assert await reader.readline() == b"number?\n"
+        
+        writer.write(f"{number}\n".encode())
+        
+        output = await reader.read()
+        
+        writer.close()
+        
+        return output
+    
+    async def run():
+        server = await asyncio.start_unix_server(session, path)
+        
+        async with server:
+            return await asyncio.gather(*(client(number) for number in range(50)))
+            
+    assert asyncio.run(run()) == [b"doubled\n"] * 50
+    
+def test_interpreter_run_async_gives_other_sessions_a_turn():
+    program = compile_program(["SHOVE 5000 L1: YEET 1 BOUNCE > 0 #L1"])
+    
+    async def run():
+        first = GoofyInterpreter.from_program(program)
+        
+        second = GoofyInterpreter.from_program(program)
+        
+        return await asyncio.gather(first.run_async(), second.run_async())
+    
+    assert asyncio.run(run()) == [True, True]
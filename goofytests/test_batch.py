@@ -0,0 +1,41 @@
+from goofy.goofy_batch import find_files, run_batch
+from goofy.goofy_budget import Budget
+
+def write_files(directory, sources: dict[str, str]):
+    for name, source in sources.items():
+        path = directory / name
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        path.write_text(source)
+
+def test_find_files(tmp_path):
+    write_files(tmp_path, {"a.goofy": "SHOVE 1", "sub/b.goofy": "SHOVE 2", "c.txt": "SHOVE 3"})
+    
+    manifest = tmp_path / "manifest.txt"
+    
+    manifest.write_text(f"# comment\n{tmp_path / 'a.goofy'}\n\n")
+    
+    assert find_files([str(tmp_path)]) == [str(tmp_path / "a.goofy"), str(tmp_path / "sub" / "b.goofy")]
+    
+    assert find_files([str(tmp_path / "*.goofy")], str(manifest)) == [str(tmp_path / "a.goofy")] * 2
+    
+def test_run_batch(tmp_path):
+    write_files(tmp_path, {
+        "a.goofy": "SHOVE 3 L1: YELL \"hi\" YEET 1 BOUNCE > 0 #L1",
+        "b.goofy": "SHOVE 3 L1: YELL \"hi\" YEET 1 BOUNCE > 0 #L1",
+        "c.goofy": "BOUNCE > 0 #L2",
+        "d.goofy": "SHOVE 1 L1: GLUE 1 BOUNCE > 0 #L1",
+    })
+    
+    results = list(run_batch(find_files([str(tmp_path)]), workers=1, chunksize=2, budget=Budget(max_instructions=100)))
+    
+    assert [result["success"] for result in results] == [True, True, False, False]
+    
+    assert results[0]["stack"] == [0]
+    
+    assert results[0]["output"] == "hi\n" * 3
+    
+    assert "no label start" in results[2]["errors"][0]
+    
+    assert "100" in results[3]["errors"][0]
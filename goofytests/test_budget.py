@@ -0,0 +1,46 @@
+from goofy.goofy_budget import Budget, BudgetKind
+from goofy.goofy_interpreter import GoofyInterpreter
+
+def execute(lines: list[str], budget: Budget) -> tuple[GoofyInterpreter, bool]:
+    interpreter = GoofyInterpreter(lines)
+    
+    assert interpreter.compile()
+    
+    return interpreter, interpreter.execute(interpreter.instructions, budget)
+
+def test_budget_counts_instructions():
+    interpreter, success = execute(["SHOVE 3 L1: YEET 1 BOUNCE > 0 #L1 SHOVE 1 FREEZE SHOVE 2"], Budget(max_instructions=100))
+    
+    assert success == True
+    
+    assert interpreter.budget_tracker.instructions == 9
+    
+    assert interpreter.budget_tracker.exceeded is None
+    
+def test_budget_stops_infinite_loop():
+    interpreter, success = execute(["SHOVE 1 L1: GLUE 1 BOUNCE > 0 #L1"], Budget(max_instructions=1000))
+    
+    assert success == False
+    
+    assert interpreter.budget_tracker.exceeded == BudgetKind.INSTRUCTIONS
+    
+    # The partial state is kept, stopped at the top of the loop.
+    assert interpreter.stack == [501]
+    
+    assert interpreter.index == 1
+    
+def test_budget_stops_growing_stack():
+    interpreter, success = execute(["L1: SHOVE 1 BOUNCE > 0 #L1"], Budget(max_stack_length=10))
+    
+    assert success == False
+    
+    assert interpreter.budget_tracker.exceeded == BudgetKind.STACK_LENGTH
+    
+    assert len(interpreter.stack) == 11
+    
+def test_budget_stops_on_wall_time():
+    interpreter, success = execute(["SHOVE 1 L1: BOUNCE > 0 #L1"], Budget(max_seconds=0.01))
+    
+    assert success == False
+    
+    assert interpreter.budget_tracker.exceeded == BudgetKind.WALL_TIME
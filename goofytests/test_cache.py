@@ -0,0 +1,91 @@
+import os
+
+from goofy.goofy_cache import GoofyCache
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_tokenizer import GoofyTokenizer
+
+def write_goofy_file(tmp_path, source: str) -> str:
+    test_file = tmp_path / "test.goofy"
+    
+    test_file.write_text(source)
+    
+    return str(test_file)
+
+def compile_with_cache(file: str) -> GoofyInterpreter:
+    with open(file, "r", encoding="UTF-8") as lines:
+        interpreter = GoofyInterpreter(lines)
+        
+        assert GoofyCache().compile(interpreter, file)
+        
+    return interpreter
+
+def test_cache_stores_compiled_program(tmp_path):
+    file = write_goofy_file(tmp_path, "SHOVE 5 L1: YEET 1 BOUNCE > 0 #L1")
+    
+    interpreter = compile_with_cache(file)
+    
+    cache = GoofyCache()
+    
+    assert os.path.exists(cache.get_cache_path(file))
+    
+    assert cache.load(file, cache.get_key(file)) == interpreter.instructions
+    
+def test_cache_skips_tokenizer_when_warm(tmp_path, monkeypatch):
+    file = write_goofy_file(tmp_path, "SHOVE 5 L1: YEET 1 BOUNCE > 0 #L1")
+    
+    compile_with_cache(file)
+    
+    def fail_to_tokenize(self):
+        raise AssertionError("A cached program should not be tokenized")
+    
+    monkeypatch.setattr(GoofyTokenizer, "iter_tokens", fail_to_tokenize)
+    
+    interpreter = compile_with_cache(file)
+    
+    success = interpreter.execute(interpreter.instructions)
+    
+    assert interpreter.stack == [0]
+    
+    assert success
+    
+def test_cache_misses_when_source_changes(tmp_path):
+    file = write_goofy_file(tmp_path, "SHOVE 5")
+    
+    compile_with_cache(file)
+    
+    write_goofy_file(tmp_path, "SHOVE 6")
+    
+    cache = GoofyCache()
+    
+    assert cache.load(file, cache.get_key(file)) is None
+    
+    interpreter = compile_with_cache(file)
+    
+    interpreter.execute(interpreter.instructions)
+    
+    assert interpreter.stack == [6]
+    
+def test_cache_misses_when_file_is_corrupt(tmp_path):
+    file = write_goofy_file(tmp_path, "SHOVE 5")
+    
+    compile_with_cache(file)
+    
+    cache = GoofyCache()
+    
+    cache_path = cache.get_cache_path(file)
+    
+    with open(cache_path, "r+b") as cache_file:
+        cache_file.truncate(os.path.getsize(cache_path) - 4)
+        
+    assert cache.load(file, cache.get_key(file)) is None
+    
+def test_cache_clear(tmp_path):
+    file = write_goofy_file(tmp_path, "SHOVE 5")
+    
+    compile_with_cache(file)
+    
+    cache = GoofyCache()
+    
+    cache.clear(file)
+    
+    assert not os.path.exists(os.path.dirname(cache.get_cache_path(file)))
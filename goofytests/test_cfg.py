@@ -0,0 +1,80 @@
+import io
+
+from goofy.goofy_cfg import BlockInterpreter, ControlFlowGraph, EdgeKind
+from goofy.goofy_input import IterableInput
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_output import OutputSink
+
+def build_graph(source: str) -> ControlFlowGraph:
+    interpreter = GoofyInterpreter([source])
+    
+    assert interpreter.compile()
+    
+    return ControlFlowGraph.from_program(interpreter.program)
+
+def run(interpreter_class: type[GoofyInterpreter], source: str) -> tuple[list[int], bool, int, bytes]:
+    stream = io.BytesIO()
+    
+    interpreter = interpreter_class([source], OutputSink(stream), IterableInput([4]))
+    
+    success = interpreter.interpret()
+    
+    return interpreter.stack, success, interpreter.index, stream.getvalue()
+
+def test_cfg_splits_blocks_at_labels_and_jumps():
+    graph = build_graph("SHOVE 3 L1: YEET 1 BOUNCE > 0 #L1 YELL \"done\" FREEZE L2: SHOVE 1")
+    
+    assert [(block.start, block.end, block.labels) for block in graph.blocks] == [(0, 1, []), (1, 3, ["L1"]), (3, 5, []), (5, 6, ["L2"])]
+    
+    assert [[(edge.destination, edge.kind) for edge in block.edges] for block in graph.blocks] == [
+        [(1, EdgeKind.FALL_THROUGH)],
+        [(1, EdgeKind.TAKEN), (2, EdgeKind.FALL_THROUGH)],
+        [],
+        [(graph.exit, EdgeKind.FALL_THROUGH)],
+    ]
+    
+    assert graph.get_predecessors(1) == [0, 1]
+    
+    assert graph.get_reachable_blocks() == {0, 1, 2}
+    
+def test_cfg_dumps_dot():
+    dot = build_graph("SHOVE 3 L1: YEET 1 BOUNCE > 0 #L1").to_dot()
+    
+    assert dot.startswith("digraph goofy {")
+    
+    assert "b1 -> b1 [label=\"taken\", style=solid];" in dot
+    
+    assert "b1 -> exit [label=\"fall through\", style=dashed];" in dot
+    
+    assert "L1:\\l1: YEET 1" in dot
+    
+def test_block_interpreter_matches_interpreter():
+    sources = [
+        "SHOVE 100 L1: YEET 1 YELL \"tick\" BOUNCE > 0 #L1",
+        "SNOOP SHOVE 3 MOOSH L1: SNIP 2 BOUNCE > 1 #L1 FREEZE SHOVE 9",
+        "SHOVE 3 GLUE SHOVE 4",
+        "SHOVE 0 SHOVE 5 SHOVE 1 SNIP SNIP YELL \"never\"",
+        "SHOVE 1 wat SHOVE 2",
+        "L1: BOUNCE > 0 #L1",
+        "SHOVE 2 L1: YEET 1 BOUNCE > 0 #L2 FREEZE L2: YELL \"jump\" BOUNCE >= 0 #L1",
+    ]
+    
+    for source in sources:
+        assert run(BlockInterpreter, source) == run(GoofyInterpreter, source), source
+        
+def test_block_interpreter_follows_registered_opcodes():
+    class SkipInterpreter(BlockInterpreter):
+        pass
+    
+    def interpret_skip(interpreter, instruction):
+        interpreter.index += instruction.operand
+        
+        return True
+    
+    SkipInterpreter.register_opcode("SKIP", interpret_skip)
+    
+    interpreter = SkipInterpreter(["SHOVE 1 SKIP 2 SHOVE 2 SHOVE 3 SHOVE 4 SHOVE 5"])
+    
+    assert interpreter.interpret()
+    
+    assert interpreter.stack == [1, 4, 5]
@@ -0,0 +1,56 @@
+import operator
+
+from goofy.goofy_tokenizer import GoofyTokenizer
+from goofy.goofy_compiler import GoofyCompiler, Opcode
+
+def compile_lines(test_lines: list[str]):
+    compiler = GoofyCompiler(GoofyTokenizer(test_lines).iter_tokens())
+    
+    instructions = compiler.compile()
+    
+    compiler.resolve_labels()
+    
+    return instructions
+
+def test_compiler_only_opcodes_produce_instructions():
+    instructions = compile_lines(["SHOVE 3 YELL \"a b\" GLUE 1 GLUE FREEZE"])
+    
+    expected_opcodes = [Opcode.SHOVE, Opcode.YELL, Opcode.GLUE, Opcode.GLUE, Opcode.FREEZE]
+    
+    assert [instruction.opcode for instruction in instructions] == expected_opcodes
+    
+def test_compiler_parses_operands():
+    instructions = compile_lines(["SHOVE -3 YELL \"a b\" GLUE 1 GLUE"])
+    
+    assert instructions[0].operand == -3
+    
+    assert instructions[1].operand == b"a b\n"
+    
+    assert instructions[2].operand == 1
+    
+    assert instructions[3].operand is None
+    
+def test_compiler_resolves_bounce_target_to_instruction_after_label():
+    instructions = compile_lines(["SHOVE 5", "L1:", "YEET 1", "BOUNCE >= 1 #L1"])
+    
+    bounce = instructions[2]
+    
+    assert bounce.opcode == Opcode.BOUNCE
+    
+    assert bounce.target == 1
+    
+    assert bounce.operand == 1
+    
+    assert bounce.conditional is operator.ge
+    
+def test_compiler_faults_on_shove_without_integer():
+    instructions = compile_lines(["SHOVE \"a\""])
+    
+    assert len(instructions) == 1
+    
+    assert instructions[0].opcode == Opcode.FAULT
+    
+def test_compiler_faults_on_unsupported_opcode():
+    instructions = compile_lines(["HOP"])
+    
+    assert instructions[0].opcode == Opcode.FAULT
@@ -0,0 +1,72 @@
+import asyncio
+
+from goofy.goofy_budget import Budget
+from goofy.goofy_client import send_request
+from goofy.goofy_daemon import GoofyDaemon
+
+def serve(tmp_path, requests: list[dict], budget: Budget | None = None) -> tuple[GoofyDaemon, list[dict]]:
+    daemon = GoofyDaemon(str(tmp_path / "goofy.sock"), budget)
+    
+    async def run():
+        await daemon.start()
+        
+        try:
+            # The client blocks, so it's run in threads while the daemon handles the requests.
+            return await asyncio.gather(*(asyncio.to_thread(send_request, request, daemon.path) for request in requests))
+        
+        finally:
+            await daemon.stop()
+            
+    return daemon, asyncio.run(run())
+
+def test_daemon_runs_source_and_path(tmp_path):
+    file = tmp_path / "double.goofy"
+    
+    file.write_text("SNOOP MOOSH 2 YELL \"doubled\"")
+    
+    daemon, responses = serve(tmp_path, [
+        {"path": str(file), "input": [4]},
+        {"source": "SNOOP MOOSH 2 YELL \"doubled\"", "input": [5]},
+    ])
+    
+    assert responses == [
+        {"success": True, "stack": [8], "output": "doubled\n", "errors": []},
+        {"success": True, "stack": [10], "output": "doubled\n", "errors": []},
+    ]
+    
+    # The file and the source are the same, so the program was only compiled once.
+    assert len(daemon.programs) == 1
+    
+def test_daemon_reports_errors(tmp_path):
+    daemon, responses = serve(tmp_path, [
+        {"source": "BOUNCE > 0 #L1"},
+        {"source": "SNOOP"},
+        {"path": str(tmp_path / "missing.goofy")},
+        {"source": "SHOVE 1 L1: GLUE 1 BOUNCE > 0 #L1"},
+    ], Budget(max_instructions=100))
+    
+    assert [response["success"] for response in responses] == [False] * 4
+    
+    assert "no label start" in responses[0]["errors"][0]
+    
+    assert "no input left" in responses[1]["errors"][0]
+    
+    assert "could not be handled" in responses[2]["errors"][0]
+    
+    assert "100" in responses[3]["errors"][0]
+    
+def test_daemon_rejects_bad_input(tmp_path):
+    daemon, responses = serve(tmp_path, [
+        {"source": "SNOOP SHOVE 2 GLUE", "input": ["abc"]},
+        {"source": "SNOOP SHOVE 2 GLUE", "input": 5},
+        {"source": "SNOOP SHOVE 2 GLUE", "input": [1.5]},
+        {"source": "SNOOP SHOVE 2 GLUE", "input": [True]},
+        {"source": 5},
+        {"source": "SNOOP SHOVE 2 GLUE", "input": [3]},
+    ])
+    
+    assert [response["success"] for response in responses] == [False] * 5 + [True]
+    
+    assert all("could not be handled" in response["errors"][0] for response in responses[:5])
+    
+    assert responses[5]["stack"] == [5]
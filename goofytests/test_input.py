@@ -0,0 +1,67 @@
+import io
+
+from goofy.goofy_input import IterableInput, MappedFileInput, StreamInput
+from goofy.goofy_interpreter import GoofyInterpreter
+
+def read_all(source) -> list:
+    numbers = []
+    
+    try:
+        while True:
+            numbers.append(source.read())
+            
+    except EOFError:
+        return numbers
+
+def test_stream_input_reads_numbers_cut_by_chunks():
+    source = StreamInput(io.BytesIO(b"12 -345\n6\n\n7890"), chunk_size=3)
+    
+    assert read_all(source) == [12, -345, 6, 7890]
+    
+def test_stream_input_reads_non_numbers_as_none():
+    source = StreamInput(io.BytesIO(b"1\nabc\n--2\n3\n"))
+    
+    assert read_all(source) == [1, None, None, 3]
+    
+def test_mapped_file_input(tmp_path):
+    path = tmp_path / "numbers.txt"
+    
+    path.write_bytes(b"\n".join(str(number).encode() for number in range(1000)) + b"\n")
+    
+    source = MappedFileInput(str(path), chunk_size=64)
+    
+    assert read_all(source) == list(range(1000))
+    
+    source.close()
+    
+def test_mapped_file_input_empty_file(tmp_path):
+    path = tmp_path / "numbers.txt"
+    
+    path.write_bytes(b"")
+    
+    assert read_all(MappedFileInput(str(path))) == []
+    
+def test_interpreter_snoop_reads_input_source():
+    interpreter = GoofyInterpreter(["SNOOP SNOOP GLUE"], input_source=IterableInput([3, 4]))
+    
+    success = interpreter.interpret()
+    
+    assert success == True
+    
+    assert interpreter.stack == [7]
+    
+def test_interpreter_snoop_no_input_left():
+    interpreter = GoofyInterpreter(["SNOOP SNOOP"], input_source=IterableInput([3]))
+    
+    success = interpreter.interpret()
+    
+    assert success == False
+    
+    assert interpreter.stack == [3]
+    
+def test_interpreter_snoop_not_a_number():
+    interpreter = GoofyInterpreter(["SNOOP"], input_source=StreamInput(io.BytesIO(b"three\n")))
+    
+    success = interpreter.interpret()
+    
+    assert success == False
@@ -1,3 +1,5 @@
+import pytest
+
 from goofy.goofy_interpreter import GoofyInterpreter
 
 def test_interpreter_unknown_opcode():
@@ -700,4 +702,113 @@ def test_interpreter_operation_snoop():
     assert len(stack) == 1
 
     assert success
-    
\ No newline at end of file
+        
+def test_interpreter_operation_bounce_loop():
+    test_lines = ["SHOVE 5 L1: YEET 1 BOUNCE > 0 #L1 SHOVE 10"]
+    
+    interpreter = GoofyInterpreter(test_lines)
+    
+    success = interpreter.interpret()
+    
+    stack = interpreter.stack
+    
+    assert len(stack) == 2
+    
+    assert stack[0] == 0
+    
+    assert stack[1] == 10
+    
+    assert success
+    
+def test_interpreter_operation_bounce_missing_label_reported_before_running():
+    test_lines = ["SHOVE 5 BOUNCE < 0 #L1"]
+    
+    interpreter = GoofyInterpreter(test_lines)
+    
+    success = interpreter.interpret()
+    
+    stack = interpreter.stack
+    
+    assert len(stack) == 0
+    
+    assert not success
+    
+def test_interpreter_stack_operation_glue_with_supplied_int_stack_empty():
+    test_lines = ["GLUE 1"]
+    
+    interpreter = GoofyInterpreter(test_lines)
+    
+    success = interpreter.interpret()
+    
+    stack = interpreter.stack
+    
+    assert len(stack) == 0
+    
+    assert not success
+    
+def test_interpreter_register_opcode():
+    class SwapInterpreter(GoofyInterpreter):
+        pass
+    
+    def interpret_swap(interpreter, instruction):
+        interpreter.stack[-1], interpreter.stack[-2] = interpreter.stack[-2], interpreter.stack[-1]
+        
+        return True
+    
+    SwapInterpreter.register_opcode("SWAP", interpret_swap)
+    
+    interpreter = SwapInterpreter(["SHOVE 3 SHOVE 4 SWAP"])
+    
+    success = interpreter.interpret()
+    
+    stack = interpreter.stack
+    
+    assert stack == [4, 3]
+    
+    assert success
+    
+    assert "SWAP" not in GoofyInterpreter.opcodes
+    
+def test_interpreter_register_opcode_with_supplied_int():
+    class PickInterpreter(GoofyInterpreter):
+        pass
+    
+    def interpret_pick(interpreter, instruction):
+        interpreter.stack.append(interpreter.stack[-1 - instruction.operand])
+        
+        return True
+    
+    PickInterpreter.register_opcode("PICK", interpret_pick)
+    
+    interpreter = PickInterpreter(["SHOVE 3 SHOVE 4 PICK 1"])
+    
+    success = interpreter.interpret()
+    
+    stack = interpreter.stack
+    
+    assert stack == [3, 4, 3]
+    
+    assert success
+    
+def test_interpreter_register_opcode_already_registered():
+    class GlueInterpreter(GoofyInterpreter):
+        pass
+    
+    with pytest.raises(ValueError):
+        GlueInterpreter.register_opcode("GLUE", lambda interpreter, instruction: True)
+    
+def test_interpreter_interprets_file(tmp_path):
+    test_file = tmp_path / "test.goofy"
+    
+    test_file.write_text("SHOVE 5\nL1:\nYEET 1\nBOUNCE > 2 #L1\n")
+    
+    with open(test_file, "r", encoding="UTF-8") as file:
+        interpreter = GoofyInterpreter(file)
+        
+        success = interpreter.interpret()
+    
+    stack = interpreter.stack
+    
+    assert stack == [2]
+    
+    assert success
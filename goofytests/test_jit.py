@@ -0,0 +1,94 @@
+import io
+
+from goofy.goofy_budget import Budget
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_jit import TracingInterpreter, generate_loop_source
+from goofy.goofy_output import OutputSink
+
+# Bounds the reference runs, so a program which never stops fails the test rather than hanging it.
+REFERENCE_BUDGET = Budget(max_instructions=1_000_000)
+
+def run(interpreter_class: type[GoofyInterpreter], source: str, budget: Budget | None = None, **kwargs) -> tuple[GoofyInterpreter, bool, bytes]:
+    stream = io.BytesIO()
+    
+    interpreter = interpreter_class([source], OutputSink(stream), **kwargs)
+    
+    assert interpreter.compile()
+    
+    success = interpreter.execute(interpreter.instructions, budget)
+    
+    if budget is not None:
+        assert interpreter.budget_tracker.exceeded is None, source
+    
+    return interpreter, success, stream.getvalue()
+
+def test_jit_matches_interpreter():
+    sources = [
+        "SHOVE 1000 L1: YEET 1 BOUNCE > 0 #L1",
+        "SHOVE 0 L1: SHOVE 2 GLUE YELL \"x\" BOUNCE < 40 #L1",
+        "SHOVE 1 SHOVE 1 L1: MOOSH 3 BOUNCE < 100000 #L1 FREEZE",
+        "SHOVE 0 L1: GLUE 1 SHOVE 5 SNIP 1 YEET 4 GLUE BOUNCE < 200 #L1",
+        "SHOVE -50 L1: SHOVE 7 SHOVE 3 MOOSH GLUE BOUNCE <= 100 #L1 SNIP -3",
+        "SHOVE 0 L1: GLUE 1 SHOVE 1 GLUE BOUNCE < 100 #L1",
+        "SHOVE 1 SHOVE 2 SHOVE 3 SHOVE 4 SHOVE 5 SHOVE 6 SHOVE 7 SHOVE 8 L1: GLUE BOUNCE != 36 #L1",
+    ]
+    
+    for source in sources:
+        expected, expected_success, expected_output = run(GoofyInterpreter, source, REFERENCE_BUDGET)
+        
+        actual, success, output = run(TracingInterpreter, source, threshold=1)
+        
+        assert (actual.stack, success, output) == (expected.stack, expected_success, expected_output), source
+        
+        assert all(counters.compiled for counters in actual.loops.values()), source
+        
+def test_jit_exits_to_the_interpreter_when_a_guard_fails(caplog):
+    source = "SHOVE 5 SHOVE 0 SHOVE 3 SHOVE 4 SHOVE 100 L1: SNIP BOUNCE > 0 #L1"
+    
+    expected, expected_success, _ = run(GoofyInterpreter, source, REFERENCE_BUDGET)
+    
+    actual, success, _ = run(TracingInterpreter, source, threshold=1)
+    
+    assert (actual.stack, success) == (expected.stack, expected_success)
+    
+    assert not success and "divide by zero" in caplog.text
+    
+    counters = actual.loops[actual.labels["L1"] + 1]
+    
+    assert (counters.entries, counters.guard_exits) == (1, 1)
+    
+def test_jit_exits_when_the_stack_runs_out():
+    source = "SHOVE 1 SHOVE 2 SHOVE 3 SHOVE 4 L1: GLUE BOUNCE > 0 #L1"
+    
+    expected, expected_success, _ = run(GoofyInterpreter, source, REFERENCE_BUDGET)
+    
+    actual, success, _ = run(TracingInterpreter, source, threshold=1)
+    
+    assert (actual.stack, success) == (expected.stack, expected_success) == ([10], False)
+    
+def test_jit_counts_jumps_before_compiling():
+    interpreter, _, _ = run(TracingInterpreter, "SHOVE 100 L1: YEET 1 BOUNCE > 0 #L1", threshold=10)
+    
+    counters = interpreter.loops[2]
+    
+    assert (counters.jumps, counters.compiled, counters.entries, counters.counted) == (10, True, 0, 1)
+    
+    assert interpreter.format_loops() == "L1 (1-2): 10 jumps, compiled, 0 entries, 0 exits, 0 guard exits, 1 counted"
+    
+def test_jit_leaves_loops_with_other_opcodes_to_the_interpreter():
+    interpreter = TracingInterpreter(["SHOVE 0 L1: SHOVE 1 GLUE BOUNCE < 3 #L2 FREEZE L2: BOUNCE < 10 #L1"])
+    
+    interpreter.compile()
+    
+    assert generate_loop_source(interpreter.instructions, 1, 5) is None
+    
+    assert generate_loop_source(interpreter.instructions, 5, 5) is not None
+    
+def test_jit_is_off_with_a_budget():
+    interpreter = TracingInterpreter(["SHOVE 0 L1: GLUE 1 BOUNCE > -1 #L1"], threshold=1)
+    
+    interpreter.compile()
+    
+    assert not interpreter.execute(interpreter.instructions, Budget(max_instructions=1000))
+    
+    assert not any(counters.compiled for counters in interpreter.loops.values())
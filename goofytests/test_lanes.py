@@ -0,0 +1,94 @@
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from goofy.goofy_input import IterableInput
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_lanes import GoofyLanes
+from goofytests.helpers import compile_program
+
+def test_lanes_diverge_and_reconverge():
+    program = compile_program(["SNOOP BOUNCE < 0 #NEG YELL \"pos\" BOUNCE > -1 #END NEG: YELL \"neg\" MOOSH -1 END: GLUE 1"])
+    
+    lanes = GoofyLanes(program, [[3], [-4], [0]])
+    
+    assert lanes.run().tolist() == [True, True, True]
+    
+    assert lanes.get_stacks() == [[4], [5], [1]]
+    
+    assert [lanes.output(lane) for lane in range(3)] == [b"pos\n", b"neg\n", b"pos\n"]
+    
+def test_lanes_loop_a_different_number_of_times():
+    program = compile_program(["SNOOP SHOVE 0 L1: GLUE 3 YEET 1 BOUNCE < 10 #L1"])
+    
+    lanes = GoofyLanes(program, [[0], [1], [2]])
+    
+    lanes.run()
+    
+    assert lanes.get_stacks() == [[0, 10], [1, 10], [2, 10]]
+    
+def test_lanes_fail_independently():
+    program = compile_program(["SNOOP SNOOP SNIP"])
+    
+    lanes = GoofyLanes(program, [[0, 4], [8, 2], [1]])
+    
+    assert lanes.run().tolist() == [False, True, False]
+    
+    assert lanes.get_stacks() == [[], [0], [1]]
+    
+    assert "divide by zero" in lanes.errors[0]
+    
+    assert "no input left" in lanes.errors[2]
+    
+def test_lanes_fall_back_when_values_overflow():
+    program = compile_program(["SNOOP MOOSH 4611686018427387904 SHOVE 7 SNIP"])
+    
+    rows = [[1], [4], [-3]]
+    
+    lanes = GoofyLanes(program, rows)
+    
+    lanes.run()
+    
+    for lane, row in enumerate(rows):
+        interpreter = GoofyInterpreter.from_program(program)
+        
+        interpreter.run(input_source=IterableInput(row))
+        
+        assert lanes.stack(lane) == interpreter.stack
+        
+def test_lanes_fall_back_when_a_product_wraps_around():
+    program = compile_program(["SNOOP SHOVE 103 MOOSH"])
+    
+    rows = [[89547301328687144], [-89547301328687144], [2], [-1]]
+    
+    lanes = GoofyLanes(program, rows)
+    
+    assert lanes.run().tolist() == [True] * 4
+    
+    assert lanes.get_stacks() == [[89547301328687144 * 103], [-89547301328687144 * 103], [206], [-103]]
+    
+    assert set(lanes._fallbacks) == {0, 1}
+    
+def test_lanes_fall_back_when_an_input_is_too_big():
+    program = compile_program(["SNOOP YEET 1 YELL \"done\""])
+    
+    lanes = GoofyLanes(program, [[2 ** 70], [5]])
+    
+    assert lanes.run().tolist() == [True, True]
+    
+    assert lanes.get_stacks() == [[2 ** 70 - 1], [4]]
+    
+    assert [lanes.output(0), lanes.output(1)] == [b"done\n", b"done\n"]
+    
+def test_lanes_reject_registered_opcodes():
+    class SwapInterpreter(GoofyInterpreter):
+        pass
+    
+    SwapInterpreter.register_opcode("SWAP", lambda interpreter, instruction: True)
+    
+    interpreter = SwapInterpreter(["SHOVE 1 SWAP"])
+    
+    interpreter.compile()
+    
+    with pytest.raises(ValueError):
+        GoofyLanes(interpreter.program, 1)
@@ -0,0 +1,72 @@
+import operator
+
+from goofy.goofy_budget import Budget
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_jit import TracingInterpreter
+from goofy.goofy_loops import find_counted_loop
+
+def find_loop(source: str):
+    interpreter = GoofyInterpreter([source])
+    
+    assert interpreter.compile()
+    
+    return find_counted_loop(interpreter.instructions, interpreter.labels["L1"], len(interpreter.instructions) - 1)
+
+def test_counted_loops_match_interpreter():
+    bodies = ["YEET 1", "GLUE 3", "SHOVE 2 YEET", "SHOVE 2 GLUE YEET 7", "MOOSH 1 GLUE -4", "SHOVE 5 SHOVE 3 MOOSH GLUE"]
+    
+    for start in (-20, -1, 0, 1, 17, 100):
+        for body in bodies:
+            for conditional in ("==", ">", "<", ">=", "<=", "!="):
+                for limit in (-9, 0, 5, 60):
+                    source = f"SHOVE 42 SHOVE {start} L1: {body} BOUNCE {conditional} {limit} #L1"
+                    
+                    expected = GoofyInterpreter([source])
+                    
+                    assert expected.compile()
+                    
+                    expected_success = expected.execute(expected.instructions, Budget(max_instructions=10_000))
+                    
+                    # Loops which never end are left running, so only those which end are compared.
+                    if expected.budget_tracker.exceeded is not None:
+                        continue
+                    
+                    actual = TracingInterpreter([source], threshold=1)
+                    
+                    assert (actual.interpret(), actual.stack) == (expected_success, expected.stack), source
+                    
+def test_counted_loop_is_found():
+    loop = find_loop("SHOVE 100 L1: GLUE 3 YEET 5 BOUNCE > 0 #L1")
+    
+    assert (loop.step, loop.conditional, loop.limit) == (-2, operator.gt, 0)
+    
+    assert loop.get_trip_count(100) == 50
+    
+    stack = [7, 100]
+    
+    assert loop.run(stack) == loop.bounce_index + 1
+    
+    assert stack == [7, 0]
+    
+def test_counted_loop_never_ending_is_left_alone():
+    loop = find_loop("SHOVE 1 L1: GLUE 2 BOUNCE != 10 #L1")
+    
+    assert loop.get_trip_count(1) is None
+    
+    assert loop.get_trip_count(2) == 4
+    
+    assert find_loop("SHOVE 1 L1: GLUE 1 BOUNCE > 0 #L1").run([1]) is None
+    
+def test_loops_with_side_effects_are_not_counted():
+    sources = [
+        "SHOVE 9 L1: YELL \"hi\" YEET 1 BOUNCE > 0 #L1",
+        "SHOVE 9 L1: SNOOP GLUE BOUNCE > 0 #L1",
+        "SHOVE 9 L1: SNIP 2 BOUNCE > 0 #L1",
+        "SHOVE 9 L1: MOOSH 2 BOUNCE > 0 #L1",
+        "SHOVE 9 L1: GLUE BOUNCE > 0 #L1",
+        "SHOVE 9 L1: SHOVE 1 BOUNCE > 0 #L1",
+        "SHOVE 9 L1: GLUE 0 BOUNCE > 0 #L1",
+    ]
+    
+    for source in sources:
+        assert find_loop(source) is None, source
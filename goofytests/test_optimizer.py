@@ -0,0 +1,55 @@
+from goofy.goofy_compiler import Opcode
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_optimizer import GoofyOptimizer
+
+def optimize_lines(test_lines: list[str]) -> GoofyInterpreter:
+    interpreter = GoofyInterpreter(test_lines)
+    
+    assert interpreter.compile()
+    
+    interpreter.instructions = GoofyOptimizer(interpreter.instructions).optimize()
+    
+    return interpreter
+
+def test_optimizer_folds_constant_arithmetic():
+    interpreter = optimize_lines(["SHOVE 3 SHOVE 4 YEET SHOVE 2 MOOSH GLUE 1"])
+    
+    assert [(instruction.opcode, instruction.operand) for instruction in interpreter.instructions] == [(Opcode.SHOVE, 3)]
+    
+def test_optimizer_does_not_fold_divide_by_zero():
+    interpreter = optimize_lines(["SHOVE 0 SHOVE 10 SNIP"])
+    
+    assert len(interpreter.instructions) == 3
+    
+    assert not interpreter.execute(interpreter.instructions)
+    
+def test_optimizer_fuses_shove_into_commutative_arithmetic():
+    interpreter = optimize_lines(["SNOOP SHOVE 2 MOOSH SHOVE 2 YEET"])
+    
+    assert [(instruction.opcode, instruction.operand) for instruction in interpreter.instructions] == [
+        (Opcode.SNOOP, None), (Opcode.MOOSH, 2), (Opcode.SHOVE, 2), (Opcode.YEET, None)]
+    
+def test_optimizer_drops_instructions_after_freeze():
+    interpreter = optimize_lines(["SHOVE 1 FREEZE YELL \"dead\" SHOVE 2 L1: SHOVE 3"])
+    
+    assert [instruction.opcode for instruction in interpreter.instructions] == [Opcode.SHOVE, Opcode.FREEZE]
+    
+def test_optimizer_keeps_instructions_after_freeze_which_are_jumped_to():
+    interpreter = optimize_lines(["SHOVE 1 BOUNCE > 0 #L1 FREEZE SHOVE 2 L1: SHOVE 3 GLUE"])
+    
+    success = interpreter.execute(interpreter.instructions)
+    
+    assert interpreter.stack == [4]
+    
+    assert success
+    
+def test_optimizer_does_not_merge_across_bounce_target():
+    interpreter = optimize_lines(["SHOVE 3 L1: SHOVE 1 GLUE BOUNCE < 10 #L1"])
+    
+    success = interpreter.execute(interpreter.instructions)
+    
+    assert interpreter.stack == [10]
+    
+    assert success
+    
+    assert interpreter.instructions[-1].target == 1
@@ -0,0 +1,79 @@
+import io
+
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_output import FlushPolicy, OutputSink
+
+def test_output_sink_flushes_every_n_bytes():
+    stream = io.BytesIO()
+    
+    sink = OutputSink(stream, buffer_size=4)
+    
+    sink.write(b"ab\n")
+    
+    assert stream.getvalue() == b""
+    
+    sink.write(b"cd\n")
+    
+    assert stream.getvalue() == b"ab\ncd\n"
+    
+def test_output_sink_flushes_every_yell():
+    stream = io.BytesIO()
+    
+    sink = OutputSink(stream, flush_policy=FlushPolicy.EVERY_YELL)
+    
+    sink.write(b"ab\n")
+    
+    assert stream.getvalue() == b"ab\n"
+    
+def test_output_sink_flushes_on_freeze():
+    stream = io.BytesIO()
+    
+    sink = OutputSink(stream, buffer_size=1, flush_policy=FlushPolicy.ON_FREEZE)
+    
+    sink.write(b"ab\n")
+    
+    assert stream.getvalue() == b""
+    
+    sink.freeze()
+    
+    assert stream.getvalue() == b"ab\n"
+    
+def test_output_sink_writes_to_text_stream():
+    stream = io.StringIO()
+    
+    sink = OutputSink(stream)
+    
+    sink.write("héllo\n".encode())
+    
+    sink.flush()
+    
+    assert stream.getvalue() == "héllo\n"
+    
+def test_interpreter_yell_flushes_on_exit():
+    stream = io.BytesIO()
+    
+    interpreter = GoofyInterpreter(["SHOVE 2 L1: YELL \"hi there\" YEET 1 BOUNCE > 0 #L1"], OutputSink(stream, flush_policy=FlushPolicy.ON_EXIT))
+    
+    success = interpreter.interpret()
+    
+    assert stream.getvalue() == b"hi there\nhi there\n"
+    
+    assert success
+    
+def test_interpreter_yell_flushes_on_error():
+    stream = io.BytesIO()
+    
+    interpreter = GoofyInterpreter(["YELL \"before\" GLUE"], OutputSink(stream, flush_policy=FlushPolicy.ON_EXIT))
+    
+    success = interpreter.interpret()
+    
+    assert stream.getvalue() == b"before\n"
+    
+    assert not success
+    
+def test_interpreter_yell_defaults_to_stdout(capsys):
+    interpreter = GoofyInterpreter(["YELL \"hi\" YELL 3"])
+    
+    interpreter.interpret()
+    
+    assert capsys.readouterr().out == "hi\n3\n"
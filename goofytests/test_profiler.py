@@ -0,0 +1,66 @@
+import json
+
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_profiler import GoofyProfiler
+
+def profile(lines: list[str]) -> tuple[GoofyInterpreter, GoofyProfiler, bool]:
+    interpreter = GoofyInterpreter(lines)
+    
+    assert interpreter.compile()
+    
+    profiler = GoofyProfiler(interpreter.labels)
+    
+    success = profiler.execute(interpreter, interpreter.instructions)
+    
+    return interpreter, profiler, success
+
+def test_profiler_counts_opcodes_and_label_entries():
+    interpreter, profiler, success = profile(["SHOVE 3 L1: YEET 1 BOUNCE > 0 #L1"])
+    
+    report = profiler.report()
+    
+    assert success == True
+    
+    assert interpreter.stack == [0]
+    
+    assert report["instructions"] == 7
+    
+    assert report["opcodes"]["YEET"]["count"] == 3
+    
+    assert report["opcodes"]["BOUNCE"]["count"] == 3
+    
+    assert report["labels"] == {"L1": 2}
+    
+    assert {instruction["index"] for instruction in report["hottest"]} == {0, 1, 2}
+    
+def test_profiler_counts_bounce_to_next_instruction():
+    interpreter, profiler, success = profile(["SHOVE 1 BOUNCE > 0 #L1 L1: BOUNCE < 0 #L2 L2: YEET 1"])
+    
+    assert success
+    
+    assert profiler.report()["labels"] == {"L1": 1}
+    
+def test_profiler_stops_on_failure():
+    interpreter, profiler, success = profile(["SHOVE 3 GLUE SHOVE 4"])
+    
+    assert success == False
+    
+    assert profiler.report()["instructions"] == 2
+    
+def test_profiler_formats_report():
+    interpreter, profiler, success = profile(["SHOVE 3 L1: YEET 1 BOUNCE > 0 #L1"])
+    
+    assert json.loads(profiler.format_json())["labels"] == {"L1": 2}
+    
+    assert "YEET" in profiler.format_text()
+    
+def test_profiler_names_unknown_labels_by_index():
+    interpreter = GoofyInterpreter(["SHOVE 3 L1: YEET 1 BOUNCE > 0 #L1"])
+    
+    interpreter.compile()
+    
+    profiler = GoofyProfiler()
+    
+    profiler.execute(interpreter, interpreter.instructions)
+    
+    assert profiler.report()["labels"] == {"@1": 2}
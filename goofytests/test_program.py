@@ -0,0 +1,66 @@
+import io
+import pickle
+
+import pytest
+
+from goofy.goofy_input import IterableInput
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_output import OutputSink
+
+def test_interpreter_interpret_twice():
+    file = io.StringIO("SHOVE 3 SHOVE 4 GLUE")
+    
+    interpreter = GoofyInterpreter(file)
+    
+    assert interpreter.interpret()
+    
+    # The file has been read, so the second run has to use the compiled program rather than the tokens.
+    assert interpreter.interpret()
+    
+    assert interpreter.stack == [7]
+    
+def test_program_is_immutable():
+    interpreter = GoofyInterpreter(["L1: SHOVE 3"])
+    
+    interpreter.compile()
+    
+    program = interpreter.program
+    
+    assert program.labels == {"L1": 0}
+    
+    assert program.token_count == 3
+    
+    with pytest.raises(TypeError):
+        program.labels["L2"] = 1
+        
+    with pytest.raises(AttributeError):
+        program.instructions = ()
+        
+def test_program_pickles():
+    interpreter = GoofyInterpreter(["SHOVE 3 L1: YEET 1 BOUNCE > 0 #L1"])
+    
+    interpreter.compile()
+    
+    program = pickle.loads(pickle.dumps(interpreter.program))
+    
+    assert program == interpreter.program
+    
+def test_program_runs_many_times_with_different_input():
+    interpreter = GoofyInterpreter(["SNOOP MOOSH 2 YELL \"doubled\""])
+    
+    interpreter.compile()
+    
+    stream = io.BytesIO()
+    
+    vm = GoofyInterpreter.from_program(interpreter.program, OutputSink(stream))
+    
+    results = []
+    
+    for number in range(3):
+        assert vm.run(input_source=IterableInput([number]))
+        
+        results.append(vm.stack)
+        
+    assert results == [[0], [2], [4]]
+    
+    assert stream.getvalue() == b"doubled\n" * 3
@@ -0,0 +1,62 @@
+import pytest
+
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_scheduler import GoofyScheduler
+from goofytests.helpers import compile_program
+
+def test_interpreter_run_steps_resumes():
+    interpreter = GoofyInterpreter.from_program(compile_program(["SHOVE 3 L1: YEET 1 BOUNCE > 0 #L1"]))
+    
+    assert interpreter.run_steps(4) is None
+    
+    assert interpreter.stack == [1]
+    
+    assert interpreter.run_steps(4) == True
+    
+    assert interpreter.stack == [0]
+    
+def test_interpreter_run_steps_fails():
+    interpreter = GoofyInterpreter.from_program(compile_program(["SHOVE 3 GLUE"]))
+    
+    assert interpreter.run_steps(10) == False
+    
+def test_scheduler_interleaves_programs():
+    long_loop = compile_program(["SHOVE 1000 L1: YEET 1 BOUNCE > 0 #L1"])
+    
+    short_loop = compile_program(["SHOVE 10 L1: YEET 1 BOUNCE > 0 #L1"])
+    
+    scheduler = GoofyScheduler(slice_length=10)
+    
+    long = scheduler.add(long_loop, name="long")
+    
+    short = scheduler.add(short_loop, name="short")
+    
+    failing = scheduler.add(compile_program(["GLUE"]))
+    
+    assert scheduler.run() == True
+    
+    assert (long.result, short.result, failing.result) == (True, True, False)
+    
+    assert long.interpreter.stack == [0]
+    
+    # The short loop isn't held up until the long loop finishes.
+    assert short.turns == 3
+    
+    assert short.latency < long.latency
+    
+def test_scheduler_weights_turns():
+    loop = compile_program(["SHOVE 100 L1: YEET 1 BOUNCE > 0 #L1"])
+    
+    scheduler = GoofyScheduler(slice_length=10)
+    
+    light = scheduler.add(loop)
+    
+    heavy = scheduler.add(loop, weight=2)
+    
+    assert scheduler.run(max_turns=6) == False
+    
+    # The heavy loop has counted down twice as far.
+    assert 100 - heavy.interpreter.stack[0] == 2 * (100 - light.interpreter.stack[0])
+    
+    with pytest.raises(ValueError):
+        scheduler.add(loop, weight=0)
@@ -0,0 +1,104 @@
+import pytest
+
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_stack import BoundedStack, OverflowPolicy, StackFullError, int64_stack
+
+def test_bounded_stack():
+    stack = BoundedStack(2)
+    
+    stack.append(1)
+    
+    stack.append(2)
+    
+    assert stack == [1, 2]
+    
+    assert stack[-1] == 2
+    
+    with pytest.raises(StackFullError):
+        stack.append(3)
+        
+    stack.pop()
+    
+    with pytest.raises(OverflowError):
+        stack.append(2 ** 63)
+        
+    assert stack.tolist() == [1]
+    
+    assert stack.pop() == 1
+    
+    with pytest.raises(IndexError):
+        stack.pop()
+        
+def test_interpreter_int64_stack():
+    interpreter = GoofyInterpreter(["SHOVE 3 SHOVE 4 GLUE SHOVE 8 SNIP 3"], stack_factory=int64_stack)
+    
+    success = interpreter.interpret()
+    
+    assert success
+    
+    assert interpreter.stack == [7, 2]
+    
+def test_interpreter_snip_with_supplied_int_pushes_int():
+    interpreter = GoofyInterpreter(["SHOVE -7 SNIP 2"])
+    
+    interpreter.interpret()
+    
+    assert interpreter.stack == [-3]
+    
+    assert type(interpreter.stack[0]) is int
+    
+def test_interpreter_int64_stack_promotes_on_overflow():
+    interpreter = GoofyInterpreter(["SHOVE 9223372036854775807 GLUE 1 SHOVE 1"], stack_factory=int64_stack)
+    
+    success = interpreter.interpret()
+    
+    assert success
+    
+    assert interpreter.stack == [2 ** 63, 1]
+    
+    assert type(interpreter._stack) is list
+    
+def test_interpreter_int64_stack_overflow_error():
+    interpreter = GoofyInterpreter(["SHOVE 9223372036854775807 GLUE 1"], stack_factory=int64_stack, overflow_policy=OverflowPolicy.ERROR)
+    
+    success = interpreter.interpret()
+    
+    assert not success
+    
+def test_interpreter_bounded_stack_full():
+    interpreter = GoofyInterpreter(["L1: SHOVE 1 BOUNCE > 0 #L1"], stack_factory=lambda: BoundedStack(100))
+    
+    success = interpreter.interpret()
+    
+    assert not success
+    
+    assert len(interpreter.stack) == 100
+    
+def test_interpreter_bounded_stack_promotes_on_overflow():
+    interpreter = GoofyInterpreter(["SHOVE 99999999999999999999 SHOVE 1 GLUE"], stack_factory=lambda: BoundedStack(4))
+    
+    success = interpreter.interpret()
+    
+    assert success
+    
+    assert interpreter.stack == [10 ** 20]
+    
+def test_registered_opcode_changes_typed_stack():
+    class SwapInterpreter(GoofyInterpreter):
+        pass
+    
+    def interpret_swap(interpreter, instruction):
+        stack = interpreter.live_stack
+        
+        stack[-1], stack[-2] = stack[-2], stack[-1]
+        
+        return True
+    
+    SwapInterpreter.register_opcode("SWAP", interpret_swap)
+    
+    for stack_factory in (list, int64_stack, lambda: BoundedStack(4)):
+        interpreter = SwapInterpreter(["SHOVE 3 SHOVE 4 SWAP"], stack_factory=stack_factory)
+        
+        assert interpreter.interpret()
+        
+        assert interpreter.stack == [4, 3]
@@ -1,5 +1,6 @@
+import io
 
-from goofy.goofy_tokenizer import GoofyTokenizer, TokenType
+from goofy.goofy_tokenizer import GoofyTokenizer, TokenTable, TokenType
 
 def test_tokenizer_returns_correct_length():
     test_lines = ["SHOVE", "3", "FREEZE"]
@@ -132,4 +133,94 @@ def test_tokenizer_assigns_correct_type_when_string_has_no_space():
         if expected_types[i].name != tokens[i].type.name:
             passed = False
             
-    assert passed        
\ No newline at end of file
+    assert passed
+    
+def test_tokenizer_iter_tokens_from_file():
+    test_file = io.StringIO("SHOVE 3\nYELL \"two words\"\n\nFREEZE\n")
+    
+    tokenizer = GoofyTokenizer(test_file)
+    
+    tokens = list(tokenizer.iter_tokens())
+    
+    assert [token.value for token in tokens] == ["SHOVE", "3", "YELL", "\"two words\"", "FREEZE"]
+    
+    assert len(tokenizer.tokens) == 0
+    
+def test_tokenizer_iter_tokens_is_lazy():
+    def test_lines():
+        yield "SHOVE 3"
+        
+        raise AssertionError("The second line should not be read")
+    
+    tokens = GoofyTokenizer(test_lines()).iter_tokens()
+    
+    assert next(tokens).value == "SHOVE"
+    
+    assert next(tokens).value == "3"
+    
+def test_tokenizer_assigns_string_type_to_upper_case_string():
+    test_lines = ["YELL \"SHOUTING\""]
+    
+    expected_types = [TokenType.OPCODE, TokenType.STRING_LITERAL]
+    
+    tokens = GoofyTokenizer(test_lines).tokenize()
+    
+    assert [token.type for token in tokens] == expected_types
+    
+def test_tokenizer_keeps_spaces_in_long_string():
+    payload = "word " * 10000
+    
+    test_lines = [f"YELL \"{payload}\" FREEZE"]
+    
+    tokens = GoofyTokenizer(test_lines).tokenize()
+    
+    assert len(tokens) == 3
+    
+    assert tokens[1].value == f"\"{payload}\""
+    
+    assert tokens[1].type == TokenType.STRING_LITERAL
+    
+def test_tokenizer_assigns_unknown_type_to_malformed_integer():
+    tokenizer = GoofyTokenizer([])
+    
+    assert tokenizer.get_token_type("--3") == TokenType.UNKNOWN
+    
+    assert tokenizer.get_token_type("-3") == TokenType.INT_LITERAL
+    
+def test_tokenizer_shares_repeated_opcode_tokens():
+    tokens = GoofyTokenizer(["SHOVE 3 SHOVE 4"]).tokenize()
+    
+    assert tokens[0] is tokens[2]
+    
+    assert tokens[1] is not tokens[3]
+    
+def test_token_table_recreates_tokens():
+    test_lines = ["SHOVE 3 SHOVE 007 SHOVE 99999999999999999999 L1: YELL \"a b\" BOUNCE > -1 #L1"]
+    
+    tokens = GoofyTokenizer(test_lines).tokenize()
+    
+    table = TokenTable(tokens)
+    
+    assert len(table) == len(tokens)
+    
+    assert list(table) == tokens
+    
+    assert table[-1] == tokens[-1]
+    
+def test_token_table_pools_repeated_strings():
+    table = TokenTable(GoofyTokenizer(["SHOVE 3 SHOVE 4 SHOVE 5"]).tokenize())
+    
+    assert table.strings == ["SHOVE"]
+    
+def test_tokenizer_compact_tokens():
+    test_lines = ["L1: SHOVE 3", "BOUNCE > 0 #L1", "L2:"]
+    
+    tokenizer = GoofyTokenizer(test_lines, compact=True)
+    
+    tokens = tokenizer.tokenize()
+    
+    assert isinstance(tokens, TokenTable)
+    
+    assert [token.value for token in tokenizer.get_tokens_by_type(TokenType.LABEL_START)] == ["L1:", "L2:"]
+    
+    assert "2: Value = SHOVE Type = OPCODE" in str(tokenizer)
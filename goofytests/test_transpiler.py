@@ -0,0 +1,92 @@
+import io
+
+import goofy.goofy_transpiler
+from goofy.goofy_input import IterableInput
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofy.goofy_output import OutputSink
+from goofy.goofy_transpiler import GoofyTranspiler, run_code, transpile
+
+def run(source: str, transpiled: bool, caplog) -> tuple[list[int], bool, bytes, list[str]]:
+    caplog.clear()
+    
+    stream = io.BytesIO()
+    
+    interpreter = GoofyInterpreter([source], OutputSink(stream), IterableInput([7, -2]))
+    
+    if not interpreter.compile():
+        success = False
+    elif transpiled:
+        success = run_code(interpreter, compile(transpile(interpreter.instructions), "<test>", "exec"))
+    else:
+        success = interpreter.execute(interpreter.instructions)
+    
+    return interpreter.stack, success, stream.getvalue(), caplog.messages
+
+def test_transpiled_program_matches_interpreter(caplog):
+    sources = [
+        "SHOVE 1000 L1: YEET 1 BOUNCE > 0 #L1 YELL \"done\"",
+        "SHOVE 1 L1: MOOSH 3 SHOVE 1 GLUE BOUNCE < 1000 #L1 SNIP -7 FREEZE SHOVE 9",
+        "SNOOP SNOOP MOOSH SNOOP GLUE",
+        "SHOVE 3 GLUE",
+        "GLUE 1",
+        "SHOVE 0 SHOVE 4 SNIP",
+        "SHOVE 4 SNIP 0",
+        "BOUNCE > 0 #L1 L1:",
+        "SHOVE 1 BOUNCE > 0 #MISSING",
+        "SHOVE 1 wat SHOVE 2",
+        "SHOVE 5 L1: YELL \"tick\" YEET 1 BOUNCE > 0 #L2 FREEZE L2: BOUNCE >= 0 #L1 END:",
+    ]
+    
+    for source in sources:
+        assert run(source, True, caplog) == run(source, False, caplog), source
+        
+def test_transpiled_program_dispatches_registered_opcodes(caplog):
+    class SwapInterpreter(GoofyInterpreter):
+        pass
+    
+    def interpret_swap(interpreter, instruction):
+        interpreter._stack[-2:] = interpreter._stack[:-3:-1]
+        
+        return True
+    
+    SwapInterpreter.register_opcode("SWAP", interpret_swap)
+    
+    interpreter = SwapInterpreter(["SHOVE 3 SHOVE 4 SWAP YEET"])
+    
+    assert interpreter.compile()
+    
+    assert run_code(interpreter, compile(transpile(interpreter.instructions), "<test>", "exec"))
+    
+    assert interpreter.stack == [-1]
+    
+def test_transpiler_caches_code(tmp_path, monkeypatch):
+    file = tmp_path / "test.goofy"
+    
+    file.write_text("SHOVE 5 L1: YEET 1 BOUNCE > 0 #L1")
+    
+    transpiler = GoofyTranspiler()
+    
+    code = transpiler.transpile(GoofyInterpreter(file.read_text().splitlines()), str(file))
+    
+    def fail_to_transpile(instructions):
+        raise AssertionError("Cached code should not be transpiled again")
+    
+    monkeypatch.setattr(goofy.goofy_transpiler, "transpile", fail_to_transpile)
+    
+    interpreter = GoofyInterpreter(file.read_text().splitlines())
+    
+    assert transpiler.transpile(interpreter, str(file)) == code
+    
+    assert run_code(interpreter, code)
+    
+    assert interpreter.stack == [0]
+    
+    file.write_text("SHOVE 6")
+    
+    monkeypatch.undo()
+    
+    interpreter = GoofyInterpreter(file.read_text().splitlines())
+    
+    assert run_code(interpreter, transpiler.transpile(interpreter, str(file)))
+    
+    assert interpreter.stack == [6]
@@ -0,0 +1,36 @@
+import pytest
+
+from goofy.goofy_interpreter import GoofyInterpreter
+from goofybench.workloads import WORKLOADS
+
+class CountingInterpreter(GoofyInterpreter):
+    """ Counts the instructions it executes. """
+    executed = 0
+    
+    @classmethod
+    def build_dispatch_table(cls):
+        super().build_dispatch_table()
+        
+        def counting(handler):
+            def counted(interpreter, instruction):
+                CountingInterpreter.executed += 1
+                
+                return handler(interpreter, instruction)
+            
+            return counted
+        
+        cls.handlers = [counting(handler) for handler in cls.handlers]
+
+@pytest.mark.parametrize("name", WORKLOADS)
+def test_workload_executes_expected_instructions(name, capsys):
+    generate, _ = WORKLOADS[name]
+    
+    workload = generate(50)
+    
+    CountingInterpreter.executed = 0
+    
+    success = CountingInterpreter(workload.lines).interpret()
+    
+    assert success
+    
+    assert CountingInterpreter.executed == workload.instructions_executed